@@ -0,0 +1,109 @@
+"""
+특징주 선정 엔진
+유니버스 전체 일괄 시세를 배열로 모아 유동성/시가총액으로 거른 뒤 상승·하락·거래량 급증 상위 k개를 부분 선택(argpartition)
+(유니버스: MOVERS_<시장>_UNIVERSE 설정, 결과는 compose_movers_summary 입력 형식)
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..config import config
+from .sectors import get_universe
+
+# 시장별 기본 최소 거래대금 (US: 달러, KR: 원)
+DEFAULT_MIN_VALUE = {"us": 5_000_000, "kr": 5_000_000_000}
+
+QUOTE_FIELDS = ("price", "prev_close", "volume", "prev_volume", "mcap")
+
+def load_universe(market: str) -> Optional[List[str]]:
+    """MOVERS_<시장>_UNIVERSE 설정의 종목 목록 - sectors(기본, 섹터 구성 종목) 또는 파일 경로(한 줄에 한 종목)
+
+    그 밖의 값(예: US의 alpaca)은 None - 데이터 소스 클라이언트가 직접 목록을 구성
+    """
+    setting = config.get(f"MOVERS_{market.upper()}_UNIVERSE", "sectors") or "sectors"
+    if setting == "sectors":
+        universe = get_universe(market)
+        return universe.unique_symbols() if universe else []
+    
+    path = Path(setting)
+    if path.exists():
+        lines = path.read_text(encoding="utf-8").splitlines()
+        return list(dict.fromkeys(s.split("#")[0].strip() for s in lines if s.split("#")[0].strip()))
+    return None
+
+def _filters(market: str) -> Dict[str, float]:
+    """시장별 최소 거래대금/시가총액 설정"""
+    return {
+        "min_value": float(config.get(f"MOVERS_MIN_VALUE_{market.upper()}", DEFAULT_MIN_VALUE[market])),
+        "min_mcap": float(config.get(f"MOVERS_MIN_MCAP_{market.upper()}", "0")),
+    }
+
+def _top_k(score, mask, k: int):
+    """mask가 참인 위치 중 score 상위 k개 인덱스 (내림차순) - 전체 정렬 없이 부분 선택"""
+    import numpy as np
+    
+    candidates = np.flatnonzero(mask)
+    if len(candidates) > k:
+        candidates = candidates[np.argpartition(-score[candidates], k - 1)[:k]]
+    return candidates[np.argsort(-score[candidates], kind="stable")]
+
+def rank_movers(quotes: Dict[str, Dict[str, Any]], market: str, k: int = 5) -> Dict[str, Any]:
+    """일괄 시세로 상승/하락/거래량 급증 상위 k개 선정
+
+    quotes: {심볼: {"price", "prev_close", "volume", 선택: "prev_volume", "mcap"}}
+    반환: {"gainers", "losers", "volume": [{"symbol", "sector", "ret1d", "mcap", "volume", "value", "volume_ratio", "kind"}],
+          "scanned", "eligible"}
+    """
+    import numpy as np
+    
+    symbols = list(quotes)
+    n = len(symbols)
+    # 종목별 필드를 한 번에 평탄화해서 (n, 5) 배열로 변환 (원소 단위 대입보다 빠름)
+    table = np.fromiter((quote.get(field) or 0.0 for quote in quotes.values() for field in QUOTE_FIELDS),
+                        dtype=np.float64, count=n * len(QUOTE_FIELDS)).reshape(n, len(QUOTE_FIELDS))
+    price, prev, volume, prev_volume, mcap = table.T
+    
+    # 시가총액이 없으면 섹터 구성 설정의 주식수로 계산 (모르면 시가총액 필터 통과)
+    universe = get_universe(market)
+    sectors = universe.sector_map() if universe else {}
+    shares = config.constituents.get(market, {}).get("shares") or {}
+    if shares:
+        known = np.asarray([float(shares.get(s) or 0.0) for s in symbols])
+        mcap = np.where(mcap > 0, mcap, prev * known)
+    
+    filters = _filters(market)
+    valid = (price > 0) & (prev > 0)
+    ret = np.where(valid, price / np.where(valid, prev, 1.0) - 1.0, 0.0) * 100
+    value = price * volume
+    eligible = valid & (value >= filters["min_value"]) & ((mcap <= 0) | (mcap >= filters["min_mcap"]))
+    
+    has_prev_volume = prev_volume > 0
+    volume_ratio = np.where(has_prev_volume, volume / np.where(has_prev_volume, prev_volume, 1.0), 0.0)
+    
+    def entries(indices, kind: str) -> List[Dict[str, Any]]:
+        return [{
+            "symbol": symbols[i],
+            "sector": sectors.get(symbols[i], "Unknown"),
+            "ret1d": round(float(ret[i]), 2),
+            "mcap": float(mcap[i]) if mcap[i] > 0 else "N/A",
+            "volume": float(volume[i]),
+            "value": float(value[i]),
+            "volume_ratio": round(float(volume_ratio[i]), 2) if has_prev_volume[i] else None,
+            "kind": kind,
+        } for i in indices]
+    
+    return {
+        "gainers": entries(_top_k(ret, eligible & (ret > 0), k), "gainer"),
+        "losers": entries(_top_k(-ret, eligible & (ret < 0), k), "loser"),
+        "volume": entries(_top_k(volume_ratio, eligible & has_prev_volume, k), "volume"),
+        "scanned": n,
+        "eligible": int(eligible.sum()),
+    }
+
+def merge_movers(ranked: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+    """상승/하락/거래량 급증 결과를 변동률 절댓값 순 한 목록으로 합침 (종목 중복 제거)"""
+    merged = {}
+    for kind in ("gainers", "losers", "volume"):
+        for entry in ranked.get(kind, []):
+            merged.setdefault(entry["symbol"], entry)
+    return sorted(merged.values(), key=lambda x: abs(x["ret1d"]), reverse=True)[:limit]
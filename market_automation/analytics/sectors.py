@@ -0,0 +1,127 @@
+"""
+섹터 분석 엔진
+섹터별 구성 종목 시세를 한 번에 배열로 모아 수익률(동일/시가총액 가중)과 상승/하락 비율을 NumPy로 계산
+(구성 종목: assets/sector_constituents.yml, 결과는 compose_sector_summary 입력 형식)
+"""
+
+from typing import Any, Dict, List, Optional
+
+from ..config import config
+
+class SectorUniverse:
+    """시장별 섹터 구성 종목 - 종목 순서/섹터 인덱스/주식수 배열을 한 번만 구성"""
+    
+    def __init__(self, sectors: Dict[str, List[str]], shares: Optional[Dict[str, float]] = None):
+        # NumPy는 import 비용이 커서 섹터 분석을 실제로 할 때만 로드
+        import numpy as np
+        
+        shares = shares or {}
+        self.names = list(sectors)
+        
+        symbols, sector_index = [], []
+        for index, name in enumerate(self.names):
+            for symbol in sectors[name] or []:
+                symbols.append(str(symbol))
+                sector_index.append(index)
+        
+        # 여러 섹터에 속한 종목도 섹터별로 따로 집계
+        self.symbols = symbols
+        self.sector_index = np.asarray(sector_index, dtype=np.intp)
+        self.shares = np.asarray([float(shares.get(s) or 0.0) for s in symbols], dtype=np.float64)
+    
+    @classmethod
+    def from_config(cls, market: str) -> Optional["SectorUniverse"]:
+        """sector_constituents.yml의 시장(us/kr) 설정으로 생성 (설정이 없으면 None)"""
+        entry = config.constituents.get(market) or {}
+        if not entry.get("sectors"):
+            return None
+        return cls(entry["sectors"], entry.get("shares"))
+    
+    def unique_symbols(self) -> List[str]:
+        """시세를 조회할 종목 목록 (중복 제거)"""
+        return list(dict.fromkeys(self.symbols))
+    
+    def sector_map(self) -> Dict[str, str]:
+        """종목 → 섹터명 (여러 섹터에 속하면 처음 나온 섹터)"""
+        mapping = {}
+        for symbol, index in zip(self.symbols, self.sector_index):
+            mapping.setdefault(symbol, self.names[index])
+        return mapping
+    
+    def compute(self, quotes: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """종목 시세(price/prev_close, 선택: mcap)로 섹터별 지표 계산
+
+        반환: 섹터별 {"name", "ret1d"(가중 수익률 %), "ret1d_eq", "breadth", "advancers", "decliners", "count", "cap_weighted"}
+        시세가 하나도 없는 섹터는 제외
+        """
+        import numpy as np
+        
+        n = len(self.symbols)
+        price = np.full(n, np.nan)
+        prev = np.full(n, np.nan)
+        mcap = np.zeros(n)
+        for i, symbol in enumerate(self.symbols):
+            quote = quotes.get(symbol)
+            if quote:
+                price[i] = quote.get("price") or np.nan
+                prev[i] = quote.get("prev_close") or np.nan
+                mcap[i] = quote.get("mcap") or 0.0
+        
+        valid = np.isfinite(price) & np.isfinite(prev) & (prev > 0)
+        ret = np.where(valid, price / np.where(valid, prev, 1.0) - 1.0, 0.0)
+        
+        # 시세의 시가총액 → 전일 종가 × 주식수 순으로 가중치 결정
+        weight = np.where(mcap > 0, mcap, np.where(valid, prev, 0.0) * self.shares)
+        weight = np.where(valid, weight, 0.0)
+        
+        size = len(self.names)
+        idx = self.sector_index
+        count = np.bincount(idx, weights=valid.astype(np.float64), minlength=size)
+        advancers = np.bincount(idx, weights=(valid & (ret > 0)).astype(np.float64), minlength=size)
+        decliners = np.bincount(idx, weights=(valid & (ret < 0)).astype(np.float64), minlength=size)
+        ret_sum = np.bincount(idx, weights=ret, minlength=size)
+        weight_sum = np.bincount(idx, weights=weight, minlength=size)
+        weighted_sum = np.bincount(idx, weights=ret * weight, minlength=size)
+        
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ret_eq = ret_sum / count
+            ret_cap = weighted_sum / weight_sum
+            breadth = advancers / (advancers + decliners)
+        
+        result = []
+        for i, name in enumerate(self.names):
+            if count[i] == 0:
+                continue
+            cap_weighted = bool(weight_sum[i] > 0)
+            result.append({
+                "name": name,
+                "ret1d": round(float((ret_cap[i] if cap_weighted else ret_eq[i]) * 100), 2),
+                "ret1d_eq": round(float(ret_eq[i] * 100), 2),
+                "breadth": round(float(breadth[i]), 2) if advancers[i] + decliners[i] > 0 else 0.5,
+                "advancers": int(advancers[i]),
+                "decliners": int(decliners[i]),
+                "count": int(count[i]),
+                "cap_weighted": cap_weighted,
+            })
+        return result
+
+def split_top_bottom(sectors: List[Dict[str, Any]], top_n: Optional[int] = None,
+                     bottom_n: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """섹터 지표를 상승 상위/하락 하위로 분리 (개수 기본값: sectors.yml rules의 top_n/bottom_n)"""
+    rules = config.sectors.get("rules", {})
+    # 0은 "표시 안 함" - None일 때만 기본값
+    top_n = int(rules.get("top_n", 3)) if top_n is None else top_n
+    bottom_n = int(rules.get("bottom_n", 2)) if bottom_n is None else bottom_n
+    
+    ranked = sorted(sectors, key=lambda s: s["ret1d"], reverse=True)
+    top = [s for s in ranked if s["ret1d"] > 0][:top_n]
+    bottom = [s for s in reversed(ranked) if s["ret1d"] <= 0][:bottom_n]
+    return {"top": top, "bottom": bottom}
+
+_universes: Dict[str, Optional[SectorUniverse]] = {}
+
+def get_universe(market: str) -> Optional[SectorUniverse]:
+    """시장별 섹터 구성 (프로세스 내 재사용)"""
+    if market not in _universes:
+        _universes[market] = SectorUniverse.from_config(market)
+    return _universes[market]
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Alpaca 실시간 스트림 재생/메모리 벤치마크
+하루치 분봉(기본 1,000종목 × 390분)을 Alpaca 메시지 형식으로 재생해서 해석·링 버퍼 기록 속도와 버퍼 메모리를 측정 (네트워크 없음)
+--ws: 로컬 WebSocket 대역 서버(접속/인증/구독 응답)를 거쳐 수신까지 측정, --frames: ALPACA_STREAM_RECORD 기록 파일 재생
+메모리 예산(--max-mb) 초과, 분봉 누락 시 실패
+사용법: python -m market_automation.bench.alpaca_stream [--symbols 1000] [--minutes 390] [--ws] [--frames FILE] [--json]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from market_automation.datasource.alpaca_stream import AlpacaStream, epoch
+from market_automation.net.stream import available, websockets
+from market_automation.storage.ticks import TickStore
+
+SESSION_OPEN = "2026-10-16T13:30"  # 정규장 시작 (UTC)
+BATCH = 100  # 메시지당 항목 수
+
+def synthetic_frames(symbols: int, minutes: int, trade_symbols: int = 50, seed: int = 5) -> List[str]:
+    """분 단위로 전 종목 분봉 + 일부 종목 체결 1건씩 담은 JSON 배열 메시지"""
+    rng = random.Random(seed)
+    names = [f"S{i:04d}" for i in range(symbols)]
+    prices = {name: rng.uniform(5, 500) for name in names}
+    base = int(epoch(SESSION_OPEN + ":00Z"))
+    frames = []
+    for minute in range(minutes):
+        t = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(base + minute * 60))
+        trade_t = time.strftime("%Y-%m-%dT%H:%M:30.123456789Z", time.gmtime(base + minute * 60))
+        items: List[Dict[str, Any]] = []
+        for i, name in enumerate(names):
+            open_price = prices[name]
+            close = open_price * (1 + rng.gauss(0, 0.001))
+            prices[name] = close
+            items.append({"T": "b", "S": name, "o": round(open_price, 4), "h": round(max(open_price, close) * 1.0005, 4),
+                          "l": round(min(open_price, close) * 0.9995, 4), "c": round(close, 4),
+                          "v": rng.randint(100, 50000), "t": t, "n": 10, "vw": round(close, 4)})
+            if i < trade_symbols:
+                items.append({"T": "t", "S": name, "p": round(close, 4), "s": 100, "t": trade_t, "x": "V"})
+        frames.extend(json.dumps(items[j:j + BATCH]) for j in range(0, len(items), BATCH))
+    return frames
+
+def load_frames(path: str) -> List[str]:
+    """기록 파일의 메시지 (JSON 배열 줄, 접속/구독 응답은 handle()이 무시)"""
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    return [line for line in lines if line.startswith("[")]
+
+def replay_direct(frames: List[str], capacity: int) -> Dict[str, Any]:
+    """소켓 없이 handle()로 재생 (해석 + 링 버퍼 기록)"""
+    store = TickStore(capacity=capacity)
+    stream = AlpacaStream(url="ws://127.0.0.1:0", key="bench", secret="bench", store=store)
+    stream.record_path = ""
+    
+    start = time.perf_counter()
+    for frame in frames:
+        stream.handle(frame)
+    elapsed = time.perf_counter() - start
+    
+    stats = stream.stats()
+    return {"frames": stats["frames"], "ticks": stats["ticks"], "errors": stats["errors"],
+            "sec": round(elapsed, 3), "ticks_per_sec": round(stats["ticks"] / elapsed) if elapsed else None,
+            "store": store}
+
+async def _serve(frames: List[str], port_box: List[int], ready: asyncio.Event):
+    """Alpaca 대역 서버 - 접속/인증/구독 응답 후 메시지 전체를 보내고 종료"""
+    async def handler(ws):
+        await ws.send(json.dumps([{"T": "success", "msg": "connected"}]))
+        await ws.recv()
+        await ws.send(json.dumps([{"T": "success", "msg": "authenticated"}]))
+        request = json.loads(await ws.recv())
+        await ws.send(json.dumps([{"T": "subscription", "trades": request.get("trades", []),
+                                   "bars": request.get("bars", [])}]))
+        for frame in frames:
+            await ws.send(frame)
+        await ws.close()
+    
+    async with websockets.serve(handler, "127.0.0.1", 0, max_size=None) as server:
+        port_box.append(server.sockets[0].getsockname()[1])
+        ready.set()
+        await server.wait_closed()
+
+def replay_ws(frames: List[str], capacity: int, symbols: List[str], expected_ticks: int,
+              timeout: float = 300.0) -> Dict[str, Any]:
+    """대역 서버 → AlpacaStream 수신/해석/기록까지"""
+    loop = asyncio.new_event_loop()
+    port_box: List[int] = []
+    ready = asyncio.Event()
+    server_task = loop.create_task(_serve(frames, port_box, ready))
+    loop.run_until_complete(ready.wait())
+    threading.Thread(target=loop.run_until_complete, args=(server_task,), daemon=True).start()
+    
+    store = TickStore(capacity=capacity)
+    stream = AlpacaStream(url=f"ws://127.0.0.1:{port_box[0]}", key="bench", secret="bench", store=store)
+    stream.record_path = ""
+    stream.subscribe(symbols)
+    
+    start = time.perf_counter()
+    stream.start()
+    deadline = start + timeout
+    while stream.stats()["ticks"] < expected_ticks and time.perf_counter() < deadline:
+        time.sleep(0.005)
+    elapsed = time.perf_counter() - start
+    stream.stop()
+    
+    stats = stream.stats()
+    return {"frames": stats["frames"], "ticks": stats["ticks"], "errors": stats["errors"],
+            "sec": round(elapsed, 3), "ticks_per_sec": round(stats["ticks"] / elapsed) if elapsed else None}
+
+def dict_baseline_mb(frames: List[str], sample_frames: int = 200) -> float:
+    """비교용: 같은 메시지를 체결마다 dict로 보관할 때의 메모리 (앞부분 표본으로 추정, MB)"""
+    sample = frames[:sample_frames]
+    tracemalloc.start()
+    kept = [item for frame in sample for item in json.loads(frame)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return round(size / len(kept) * sum(frame.count('"T"') for frame in frames) / 2**20, 1) if kept else 0.0
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="Alpaca 실시간 스트림 재생/메모리 벤치마크")
+    parser.add_argument("--symbols", type=int, default=1000, help="합성 종목 수")
+    parser.add_argument("--minutes", type=int, default=390, help="합성 분봉 수 (정규장 390분)")
+    parser.add_argument("--frames", help="재생할 메시지 기록 파일 (기본: 합성)")
+    parser.add_argument("--ws", action="store_true", help="로컬 WebSocket 대역 서버를 거쳐 재생")
+    parser.add_argument("--max-mb", type=float, default=32.0, help="링 버퍼 메모리 예산 (MB)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+    
+    frames = load_frames(args.frames) if args.frames else synthetic_frames(args.symbols, args.minutes)
+    capacity = max(1, args.minutes)
+    
+    # 링 버퍼 첫 할당의 NumPy 로드 시간은 측정에서 제외
+    TickStore(capacity=1).track(["WARMUP"])
+    direct = replay_direct(frames, capacity)
+    store = direct.pop("store")
+    symbols = store.symbols()
+    counts = [int(store.count[store.index[s]]) for s in symbols]
+    memory = {
+        "symbols": len(symbols),
+        "capacity": store.capacity,
+        "min_bars": min(counts) if counts else 0,
+        "store_mb": round(store.nbytes / 2**20, 2),
+        "per_symbol_kb": round(store.nbytes / max(1, len(symbols)) / 1024, 1),
+        "dict_baseline_mb": dict_baseline_mb(frames),
+    }
+    results = {"direct": direct, "memory": memory}
+    
+    if args.ws:
+        if not available():
+            print("❌ websockets 미설치 - pip install websockets")
+            sys.exit(1)
+        results["ws"] = replay_ws(frames, capacity, symbols, direct["ticks"])
+    
+    failures = []
+    if memory["store_mb"] > args.max_mb:
+        failures.append(f"링 버퍼 {memory['store_mb']}MB > 예산 {args.max_mb}MB")
+    if not args.frames and memory["min_bars"] < min(capacity, args.minutes):
+        failures.append(f"분봉 누락: 최소 {memory['min_bars']}개 < {args.minutes}개")
+    if "ws" in results and results["ws"]["ticks"] < direct["ticks"]:
+        failures.append(f"수신 누락: {direct['ticks'] - results['ws']['ticks']:,}건")
+    
+    if args.json:
+        print(json.dumps(dict(results, failures=failures), ensure_ascii=False, indent=2))
+    else:
+        print(f"{'구간':<10}{'메시지':>10}{'체결/분봉':>12}{'초':>10}{'건/초':>12}")
+        for name in ("direct", "ws"):
+            if name in results:
+                m = results[name]
+                print(f"{name:<10}{m['frames']:>10,}{m['ticks']:>12,}{m['sec']:>10,.2f}{m['ticks_per_sec'] or 0:>12,}")
+        print(f"💾 링 버퍼 {memory['store_mb']}MB ({memory['symbols']:,}종목 × {memory['capacity']}분, "
+              f"종목당 {memory['per_symbol_kb']}KB) / dict 보관 시 약 {memory['dict_baseline_mb']}MB")
+        for failure in failures:
+            print(f"❌ {failure}")
+    
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+import 시간 벤치마크
+python -X importtime으로 슬롯/CLI 모듈의 import 비용을 측정하고 예산 초과나 금지 모듈 로드 시 실패
+(tests/test_import_budget.py가 같은 측정으로 pytest에서 검사)
+사용법: python -m market_automation.bench.importtime [--budget-ms 500] [모듈 ...]
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+# 측정 대상 기본 모듈 (CLI 프리뷰 + 슬롯 진입점)
+DEFAULT_MODULES = [
+    "market_automation.cli_preview",
+    "market_automation.slots.run_0700_us_close",
+    "market_automation.slots.run_0830_kr_preopen",
+    "market_automation.slots.run_1200_kr_midday",
+    "market_automation.slots.run_1600_kr_close",
+    "market_automation.slots.run_2000_us_preview",
+    "market_automation.slots.run_2300_us_premkt",
+]
+
+DEFAULT_BUDGET_MS = 500
+
+# 슬롯 진입점 import 시 로드되면 안 되는 무거운 패키지 (사용하는 경로에서만 지연 import)
+FORBIDDEN_MODULES = ["openai", "httpx", "numpy", "pandas", "bs4", "lxml", "yaml", "websockets"]
+
+project_root = Path(__file__).parent.parent.parent
+
+def measure(module: str) -> Tuple[float, List[Tuple[float, str]], Set[str]]:
+    """모듈 import 누적 시간(ms), 가장 무거운 import 목록, import된 최상위 패키지 이름 반환"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(project_root), capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{module} import 실패: {proc.stderr.strip().splitlines()[-1:]}")
+    
+    total_ms = 0.0
+    entries = []
+    for line in proc.stderr.splitlines():
+        # 형식: "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        cumulative_ms = int(cumulative) / 1000
+        stripped = name.strip()
+        entries.append((cumulative_ms, stripped))
+        if stripped == module:
+            total_ms = cumulative_ms
+    
+    # 대상 모듈 자신을 제외한 누적 시간 상위 5개
+    heaviest = sorted((e for e in entries if e[1] != module), reverse=True)[:5]
+    packages = {name.split(".")[0] for _, name in entries}
+    return total_ms, heaviest, packages
+
+def forbidden(packages: Set[str]) -> List[str]:
+    """import된 패키지 중 금지 모듈"""
+    return [name for name in FORBIDDEN_MODULES if name in packages]
+
+def run(modules: List[str], budget_ms: float) -> Dict[str, Tuple[float, List[str]]]:
+    """모든 모듈 측정 후 결과 출력 - 모듈별 (누적 시간 ms, 로드된 금지 모듈)"""
+    results = {}
+    for module in modules:
+        total_ms, heaviest, packages = measure(module)
+        loaded = forbidden(packages)
+        results[module] = (total_ms, loaded)
+        mark = "✅" if total_ms <= budget_ms and not loaded else "❌"
+        print(f"{mark} {module}: {total_ms:,.1f}ms (예산 {budget_ms:,.0f}ms)")
+        if loaded:
+            print(f"     금지 모듈 로드: {', '.join(loaded)}")
+        for ms, name in heaviest:
+            print(f"     {ms:>9,.1f}ms  {name}")
+    return results
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="import 시간 벤치마크")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    args = parser.parse_args()
+    
+    results = run(args.modules, args.budget_ms)
+    over = [m for m, (ms, loaded) in results.items() if ms > args.budget_ms or loaded]
+    if over:
+        print(f"❌ import 예산 초과 또는 금지 모듈 로드: {', '.join(over)}")
+        sys.exit(1)
+    print("✅ 모든 모듈이 import 예산 이내")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+KIS 실시간 스트림 벤치마크
+로컬 WebSocket 서버가 KIS 대신 등록 응답/PINGPONG/체결 프레임을 재생하고 초당 해석 체결 수를 측정 (네트워크 없음)
+프레임: --frames 파일(KIS_STREAM_RECORD로 기록한 한 줄 한 프레임) 또는 합성 프레임
+사용법: python -m market_automation.bench.kis_stream [--frames FILE] [--count 20000] [--json]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from market_automation.datasource.kis_stream import KISStream, decode_frame, INDEX_TR, STOCK_TR, STREAM_INDEX_CODES
+from market_automation.net.stream import available, websockets
+
+STOCK_CODES = ["005930", "000660", "373220", "005380", "035420", "051910"]
+
+def synthetic_frames(count: int, seed: int = 7) -> List[str]:
+    """합성 체결 프레임 (주식 46필드, 지수 30필드, 프레임당 1~3건)"""
+    rng = random.Random(seed)
+    frames = []
+    for i in range(count):
+        if i % 5 == 0:
+            tr_id, code, width = INDEX_TR, rng.choice(list(STREAM_INDEX_CODES.values())), 30
+        else:
+            tr_id, code, width = STOCK_TR, rng.choice(STOCK_CODES), 46
+        records = rng.randint(1, 3)
+        fields = []
+        for _ in range(records):
+            price = rng.uniform(1000, 100000)
+            sign = rng.choice("25")
+            record = [code, f"{90000 + i % 60000:06d}", f"{price:.2f}", sign, f"{price * 0.01:.2f}"] + ["0"] * (width - 5)
+            if tr_id == STOCK_TR:
+                record[5], record[13] = "1.00", str(rng.randint(1, 10**7))
+            else:
+                record[5], record[9] = str(rng.randint(1, 10**6)), "1.00"
+            fields.extend(record)
+        frames.append(f"0|{tr_id}|{records:03d}|" + "^".join(fields))
+    return frames
+
+def load_frames(path: str) -> List[str]:
+    """기록 파일에서 데이터 프레임만 읽기"""
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    return [line for line in lines if line[:1] in ("0", "1")]
+
+def measure_decode(frames: List[str]) -> Dict[str, Any]:
+    """해석만 (소켓 없음)"""
+    start = time.perf_counter()
+    ticks = sum(len(decode_frame(frame)) for frame in frames)
+    elapsed = time.perf_counter() - start
+    return {"frames": len(frames), "ticks": ticks, "sec": round(elapsed, 4),
+            "ticks_per_sec": round(ticks / elapsed) if elapsed else None}
+
+async def _serve(frames: List[str], port_box: List[int], ready: asyncio.Event):
+    """KIS 대역 서버 - 등록 요청마다 응답 후 PINGPONG 1회와 프레임 전체를 보내고 종료"""
+    async def handler(ws):
+        subscribed = 0
+        expected = len(STREAM_INDEX_CODES) + len(STOCK_CODES)
+        async for message in ws:
+            request = json.loads(message)
+            if request.get("header", {}).get("tr_id") == "PINGPONG":
+                continue
+            body = request["body"]["input"]
+            await ws.send(json.dumps({"header": {"tr_id": body["tr_id"], "tr_key": body["tr_key"]},
+                                      "body": {"rt_cd": "0", "msg1": "SUBSCRIBE SUCCESS"}}))
+            subscribed += 1
+            if subscribed == expected:
+                break
+        await ws.send(json.dumps({"header": {"tr_id": "PINGPONG", "datetime": "20260101090000"}}))
+        for frame in frames:
+            await ws.send(frame)
+        await ws.close()
+    
+    async with websockets.serve(handler, "127.0.0.1", 0, max_size=None) as server:
+        port_box.append(server.sockets[0].getsockname()[1])
+        ready.set()
+        await server.wait_closed()
+
+def measure_stream(frames: List[str], expected_ticks: int, timeout: float = 60.0) -> Dict[str, Any]:
+    """대역 서버 → KISStream 수신/해석/테이블 반영까지"""
+    loop = asyncio.new_event_loop()
+    port_box: List[int] = []
+    ready = asyncio.Event()
+    server_task = loop.create_task(_serve(frames, port_box, ready))
+    loop.run_until_complete(ready.wait())
+    
+    server_thread = threading.Thread(target=loop.run_until_complete, args=(server_task,), daemon=True)
+    server_thread.start()
+    
+    stream = KISStream(url=f"ws://127.0.0.1:{port_box[0]}", approval_key="bench")
+    stream.record_path = ""
+    for code in STREAM_INDEX_CODES.values():
+        stream.subscribe(INDEX_TR, code)
+    for code in STOCK_CODES:
+        stream.subscribe(STOCK_TR, code)
+    
+    start = time.perf_counter()
+    stream.start()
+    deadline = start + timeout
+    while stream.stats()["ticks"] < expected_ticks and time.perf_counter() < deadline:
+        time.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    stream.stop()
+    
+    stats = stream.stats()
+    return {"frames": stats["frames"], "ticks": stats["ticks"], "symbols": stats["symbols"],
+            "errors": stats["errors"], "sec": round(elapsed, 4),
+            "ticks_per_sec": round(stats["ticks"] / elapsed) if elapsed else None}
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="KIS 실시간 스트림 벤치마크")
+    parser.add_argument("--frames", help="재생할 프레임 기록 파일 (기본: 합성)")
+    parser.add_argument("--count", type=int, default=20000, help="합성 프레임 수")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+    
+    if not available():
+        print("❌ websockets 미설치 - pip install websockets")
+        sys.exit(1)
+    
+    frames = load_frames(args.frames) if args.frames else synthetic_frames(max(1, args.count))
+    decode = measure_decode(frames)
+    results = {"decode": decode, "stream": measure_stream(frames, decode["ticks"])}
+    
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+    
+    print(f"{'구간':<10}{'프레임':>10}{'체결':>10}{'초':>10}{'체결/초':>12}")
+    for name, m in results.items():
+        print(f"{name:<10}{m['frames']:>10,}{m['ticks']:>10,}{m['sec']:>10,.3f}{m['ticks_per_sec'] or 0:>12,}")
+    if results["stream"]["ticks"] < decode["ticks"]:
+        print(f"⚠️ 수신 누락: {decode['ticks'] - results['stream']['ticks']:,}건")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+특징주 선정 벤치마크
+합성 일괄 시세(기본 5,000종목)로 필터링 + 상승/하락/거래량 급증 상위 k개 선정 시간을 전체 정렬 방식과 비교 (네트워크 없음)
+사용법: python -m market_automation.bench.movers [--symbols 5000] [--k 5] [--repeat 30] [--json]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any, List
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from market_automation.analytics.movers import rank_movers, merge_movers
+
+def synthetic(size: int, seed: int = 11) -> Dict[str, Dict[str, Any]]:
+    """합성 스냅샷 (가격/전일 종가/거래량/전일 거래량)"""
+    rng = random.Random(seed)
+    quotes = {}
+    for i in range(size):
+        prev = rng.uniform(1, 800)
+        prev_volume = rng.lognormvariate(13, 1.5)
+        quotes[f"S{i:05d}"] = {
+            "price": prev * (1 + rng.gauss(0, 0.03)),
+            "prev_close": prev,
+            "volume": prev_volume * rng.lognormvariate(0, 0.5),
+            "prev_volume": prev_volume,
+        }
+    return quotes
+
+def full_sort(quotes: Dict[str, Dict[str, Any]], k: int, min_value: float) -> List[str]:
+    """비교용: 종목별 계산 후 전체 정렬"""
+    rows = []
+    for symbol, q in quotes.items():
+        if q["prev_close"] > 0 and q["price"] * q["volume"] >= min_value:
+            rows.append((symbol, (q["price"] / q["prev_close"] - 1) * 100))
+    rows.sort(key=lambda x: abs(x[1]), reverse=True)
+    return [symbol for symbol, _ in rows[:k]]
+
+def timed(func, repeat: int) -> Dict[str, float]:
+    # 첫 호출(NumPy 로드 등)은 측정에서 제외
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "mean_ms": round(statistics.mean(timings), 3),
+        "p95_ms": round(timings[max(0, round(len(timings) * 0.95) - 1)], 3),
+    }
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="특징주 선정 벤치마크")
+    parser.add_argument("--symbols", type=int, default=5000, help="유니버스 종목 수")
+    parser.add_argument("--k", type=int, default=5, help="분류별 선정 개수")
+    parser.add_argument("--repeat", type=int, default=30, help="반복 횟수")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+    
+    quotes = synthetic(args.symbols)
+    repeat = max(1, args.repeat)
+    ranked = rank_movers(quotes, "us", args.k)
+    results = {
+        "symbols": args.symbols,
+        "eligible": ranked["eligible"],
+        "engine": timed(lambda: merge_movers(rank_movers(quotes, "us", args.k), args.k * 2), repeat),
+        "full_sort": timed(lambda: full_sort(quotes, args.k * 2, 5_000_000), repeat),
+    }
+    
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+    
+    print(f"📊 {results['symbols']:,}종목 중 필터 통과 {results['eligible']:,}종목")
+    print(f"{'방식':<12}{'평균(ms)':>10}{'p95(ms)':>10}")
+    for name in ("engine", "full_sort"):
+        m = results[name]
+        print(f"{name:<12}{m['mean_ms']:>10,.2f}{m['p95_ms']:>10,.2f}")
+
+if __name__ == "__main__":
+    main()
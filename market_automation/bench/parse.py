@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+네이버 금융 HTML 파싱 벤치마크
+저장된 HTML 픽스처로 BeautifulSoup 전체 파싱과 lxml 빠른 추출의 페이지별 시간/최대 메모리 비교
+사용법: python -m market_automation.bench.parse [--dir samples/html] [--repeat 20] [--save]
+픽스처 파일명은 페이지 종류로 시작 (main.html, world.html, sectors.html, movers_quant.html 등)
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, Any
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from naver_finance_scraper import NaverFinanceScraper
+from market_automation.datasource.html_fast import available as fast_html_available
+from market_automation.net.session import sessions
+
+PAGE_TYPES = ("main", "world", "sectors", "movers")
+
+# --save 시 저장할 페이지 (파일명: URL)
+FIXTURE_URLS = {
+    "main": "https://finance.naver.com/sise/",
+    "world": "https://finance.naver.com/world/",
+    "sectors": "https://finance.naver.com/sise/sise_group.naver",
+    "movers_quant": "https://finance.naver.com/sise/sise_quant.naver",
+    "movers_rise": "https://finance.naver.com/sise/sise_rise.naver",
+}
+
+def save_fixtures(directory: Path, headers: Dict[str, str]):
+    """현재 네이버 금융 페이지를 픽스처로 저장"""
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, url in FIXTURE_URLS.items():
+        response = sessions.get(url).get(url, headers=headers)
+        response.raise_for_status()
+        (directory / f"{name}.html").write_bytes(response.content)
+        print(f"💾 {name}.html 저장 ({len(response.content):,}B)")
+
+def measure(scraper: NaverFinanceScraper, page_type: str, html: str, fast: bool, repeat: int) -> Dict[str, Any]:
+    """추출 시간(ms)과 1회 추출 최대 메모리(KB) 측정"""
+    # 추출기 진단 출력은 측정에서 제외
+    with contextlib.redirect_stdout(io.StringIO()):
+        tracemalloc.start()
+        result = scraper._extract(page_type, html, fast=fast)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            scraper._extract(page_type, html, fast=fast)
+            timings.append((time.perf_counter() - start) * 1000)
+    
+    timings.sort()
+    return {
+        "mean_ms": round(statistics.mean(timings), 3),
+        "p95_ms": round(timings[max(0, round(len(timings) * 0.95) - 1)], 3),
+        "peak_kb": round(peak / 1024, 1),
+        "ok": bool(result) and not (isinstance(result, dict) and "error" in result),
+    }
+
+def run(directory: Path, repeat: int) -> Dict[str, Any]:
+    """픽스처별 BeautifulSoup / lxml 측정"""
+    scraper = NaverFinanceScraper()
+    results = {}
+    
+    for path in sorted(directory.glob("*.html")):
+        page_type = next((p for p in PAGE_TYPES if path.name.startswith(p)), None)
+        if not page_type:
+            print(f"⚠️ 페이지 종류를 알 수 없는 픽스처 무시: {path.name}")
+            continue
+        
+        html = path.read_bytes().decode("euc-kr", errors="replace")
+        entry = {"page_type": page_type, "bytes": path.stat().st_size,
+                 "bs4": measure(scraper, page_type, html, False, repeat)}
+        if fast_html_available():
+            entry["fast"] = measure(scraper, page_type, html, True, repeat)
+        results[path.name] = entry
+    
+    return results
+
+def print_results(results: Dict[str, Any]):
+    """결과 표 출력"""
+    print(f"{'픽스처':<22}{'엔진':<6}{'평균(ms)':>10}{'p95(ms)':>10}{'최대(KB)':>10}  추출")
+    for name, entry in results.items():
+        for engine in ("bs4", "fast"):
+            if engine not in entry:
+                continue
+            m = entry[engine]
+            print(f"{name:<22}{engine:<6}{m['mean_ms']:>10,.2f}{m['p95_ms']:>10,.2f}{m['peak_kb']:>10,.1f}  {'✅' if m['ok'] else '❌'}")
+        if "fast" in entry and entry["fast"]["mean_ms"] > 0:
+            print(f"{'':<22}→ {entry['bs4']['mean_ms'] / entry['fast']['mean_ms']:.1f}배 빠름")
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="네이버 금융 HTML 파싱 벤치마크")
+    parser.add_argument("--dir", default=str(project_root / "samples" / "html"), help="HTML 픽스처 디렉토리")
+    parser.add_argument("--repeat", type=int, default=20, help="페이지별 반복 횟수")
+    parser.add_argument("--save", action="store_true", help="현재 페이지를 픽스처로 저장 후 측정")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+    
+    directory = Path(args.dir)
+    if args.save:
+        save_fixtures(directory, NaverFinanceScraper().headers)
+    
+    if not list(directory.glob("*.html")):
+        print(f"❌ HTML 픽스처 없음: {directory} (--save로 현재 페이지 저장)")
+        sys.exit(1)
+    
+    if not fast_html_available():
+        print("⚠️ lxml 미설치 - BeautifulSoup 결과만 측정")
+    
+    results = run(directory, args.repeat)
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print_results(results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+섹터 분석 벤치마크
+S&P 500 / KOSPI 200 규모의 합성 유니버스로 섹터 수익률·상승 비율 계산 시간 측정 (네트워크 없음)
+사용법: python -m market_automation.bench.sectors [--repeat 50] [--json]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from market_automation.analytics.sectors import SectorUniverse, split_top_bottom
+
+# 유니버스 이름: (종목 수, 섹터 수)
+UNIVERSES = {
+    "sp500": (500, 11),
+    "kospi200": (200, 10),
+    "us_all": (5000, 11),
+}
+
+def synthetic(size: int, sector_count: int, seed: int = 7):
+    """합성 구성 종목/주식수/시세 생성"""
+    rng = random.Random(seed)
+    symbols = [f"S{i:05d}" for i in range(size)]
+    sectors = {f"Sector {j}": symbols[j::sector_count] for j in range(sector_count)}
+    shares = {s: rng.uniform(1e7, 5e9) for s in symbols}
+    quotes = {}
+    for s in symbols:
+        prev = rng.uniform(5, 500)
+        quotes[s] = {"price": prev * (1 + rng.gauss(0, 0.02)), "prev_close": prev}
+    return sectors, shares, quotes
+
+def measure(size: int, sector_count: int, repeat: int) -> Dict[str, Any]:
+    """유니버스 구성 1회 + 계산 반복 시간(ms)"""
+    sectors, shares, quotes = synthetic(size, sector_count)
+    
+    start = time.perf_counter()
+    universe = SectorUniverse(sectors, shares)
+    build_ms = (time.perf_counter() - start) * 1000
+    
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        split_top_bottom(universe.compute(quotes))
+        timings.append((time.perf_counter() - start) * 1000)
+    
+    timings.sort()
+    return {
+        "symbols": size,
+        "sectors": sector_count,
+        "build_ms": round(build_ms, 3),
+        "mean_ms": round(statistics.mean(timings), 3),
+        "p95_ms": round(timings[max(0, round(len(timings) * 0.95) - 1)], 3),
+    }
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="섹터 분석 벤치마크")
+    parser.add_argument("--repeat", type=int, default=50, help="유니버스별 반복 횟수")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+    
+    # 첫 호출의 NumPy 로드 시간은 측정에서 제외
+    measure(10, 2, 1)
+    results = {name: measure(size, count, max(1, args.repeat)) for name, (size, count) in UNIVERSES.items()}
+    
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+    
+    print(f"{'유니버스':<12}{'종목':>8}{'구성(ms)':>10}{'평균(ms)':>10}{'p95(ms)':>10}")
+    for name, m in results.items():
+        print(f"{name:<12}{m['symbols']:>8,}{m['build_ms']:>10,.2f}{m['mean_ms']:>10,.2f}{m['p95_ms']:>10,.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+슬롯 파이프라인 종단 간 벤치마크
+6개 슬롯을 HTTP 카세트 재생(네트워크 없음)으로 수집 → 변환 → 합성 → 렌더링 → 게시(드라이 런)까지 반복 실행해
+단계별 p50/p95, 최대 RSS, 실행당 HTTP 호출 수를 측정 (슬롯마다 별도 프로세스, 캐시 디렉토리는 임시 HOME)
+단계 시간은 자기 시간(하위 단계 제외) - render는 post_* 중 다른 단계를 뺀 나머지(검증 + 템플릿)
+카세트가 없거나 요청이 누락되면 수집은 naver_market_data.json 픽스처로 대체 (결과의 fetch_source)
+단계 p95가 예산(--budget, BENCH_STAGE_BUDGETS_MS) 또는 RSS가 --max-rss-mb를 넘으면 실패
+사용법: python -m market_automation.bench.slots [--repeat 20] [--slot us_close ...] [--cassette slots] [--record]
+        [--latency 0|recorded] [--budget compose=50] [--output results.json] [--json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+SLOTS = ["us_close", "kr_preopen", "kr_midday", "kr_close", "us_preview", "us_premkt"]
+STAGES = ["fetch", "convert", "compose", "render", "post"]
+
+# 단계별 p95 기본 예산 (ms, 카세트 재생 + 지연 0 기준)
+DEFAULT_BUDGETS_MS = {"fetch": 500.0, "convert": 20.0, "compose": 50.0, "render": 20.0, "post": 20.0}
+
+FIXTURE = project_root / "naver_market_data.json"
+
+class StageTimer:
+    """메서드를 감싸 단계별 자기 시간(하위 단계 제외)을 누적"""
+    
+    def __init__(self):
+        self.totals: Dict[str, float] = defaultdict(float)
+        self._stack: List[float] = []
+    
+    @contextlib.contextmanager
+    def stage(self, stage: str):
+        """블록 실행 시간을 stage에 누적 (안쪽 단계 시간은 바깥 단계에서 뺌)"""
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._stack.pop()
+            self.totals[stage] += elapsed - children
+            if self._stack:
+                self._stack[-1] += elapsed
+    
+    def wrap(self, obj: Any, name: str, stage: str):
+        """인스턴스 메서드를 stage 측정 래퍼로 교체"""
+        func = getattr(obj, name)
+        
+        def timed(*args, **kwargs):
+            with self.stage(stage):
+                return func(*args, **kwargs)
+        
+        setattr(obj, name, timed)
+    
+    def reset(self) -> Dict[str, float]:
+        """이번 실행의 단계별 시간(ms)을 돌려주고 초기화"""
+        totals = {stage: self.totals.get(stage, 0.0) * 1000 for stage in STAGES}
+        self.totals.clear()
+        return totals
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, round(len(ordered) * q) - 1)]
+
+def run_slot(slot: str, repeat: int, warmup: int, cassette_name: str, latency: str, record: bool) -> Dict[str, Any]:
+    """슬롯 하나를 현재 프로세스에서 warmup + repeat회 실행 (자식 프로세스에서 호출, 첫 실행은 cold로 따로 보고)"""
+    from market_automation.config import config
+    from market_automation.net.cassette import cassette
+    from market_automation.net.ratelimit import limiter
+    
+    # 세션이 만들어지기 전에 카세트 모드 설정, 게시는 항상 드라이 런, 재생 중 호출 제한 대기는 측정에서 제외
+    cassette.mode, cassette.name, cassette.latency = ("record" if record else "replay"), cassette_name, latency
+    config.env["DRY_RUN"] = "1"
+    limiter.enabled = record
+    
+    from market_automation.posting.poster import MarketPoster, SLOT_CONVERTERS
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        poster = MarketPoster()
+        scraper = poster._get_scraper()
+    
+    data_file = Path(tempfile.mkdtemp(prefix="bench_slots_")) / "naver_market_data.json"
+    poster.naver_adapter.data_file = data_file
+    
+    timer = StageTimer()
+    timer.wrap(poster, "_sector_analytics", "fetch")
+    timer.wrap(poster.naver_adapter, "load_naver_data", "fetch")
+    for method in set(SLOT_CONVERTERS.values()):
+        timer.wrap(poster.naver_adapter, method, "convert")
+    timer.wrap(poster, "_compose_sections", "compose")
+    timer.wrap(poster.composer, "compose_sections", "compose")
+    timer.wrap(poster, f"post_{slot}", "render")
+    timer.wrap(poster, "_publish", "post")
+    
+    def fetch() -> str:
+        """네이버 수집 (카세트 재생) 후 슬롯이 읽는 데이터 파일에 저장 - 실패하면 픽스처 사용"""
+        with timer.stage("fetch"):
+            naver_data = scraper.get_market_data() if scraper else {"error": "스크래퍼 없음"}
+            source = "cassette"
+            if not naver_data or "error" in naver_data:
+                naver_data, source = json.loads(FIXTURE.read_text(encoding="utf-8")), "fixture"
+            data_file.write_text(json.dumps(naver_data, ensure_ascii=False), encoding="utf-8")
+        return source
+    
+    runs, http_calls, sources, failures = [], [], set(), []
+    cold: Dict[str, float] = {}
+    for i in range(warmup + repeat):
+        before = cassette.stats()
+        with contextlib.redirect_stdout(io.StringIO()):
+            sources.add(fetch())
+            data = getattr(poster.naver_adapter, SLOT_CONVERTERS[slot])(poster.naver_adapter.load_naver_data() or {})
+            result = getattr(poster, f"post_{slot}")(data, publish=True)
+        after = cassette.stats()
+        http_calls.append(sum(after[k] - before[k] for k in ("recorded", "replayed", "misses")))
+        timings = timer.reset()
+        if i == 0:
+            cold = timings
+        if i < warmup:
+            http_calls.pop()
+            continue
+        runs.append(timings)
+        if not result.get("success"):
+            failures.append(result.get("error", "unknown"))
+    
+    shutil.rmtree(data_file.parent, ignore_errors=True)
+    stats = cassette.stats()
+    return {
+        "slot": slot,
+        "runs": repeat,
+        "stages": {stage: {"p50_ms": round(statistics.median(r[stage] for r in runs), 3),
+                           "p95_ms": round(_percentile([r[stage] for r in runs], 0.95), 3)} for stage in STAGES},
+        "total_p95_ms": round(_percentile([sum(r.values()) for r in runs], 0.95), 3),
+        "cold_ms": {stage: round(value, 3) for stage, value in cold.items()},
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "http_calls_per_run": round(statistics.mean(http_calls), 2),
+        "cassette_misses": stats["misses"],
+        "fetch_source": "+".join(sorted(sources)),
+        "failures": failures[:3],
+    }
+
+def run(slots: List[str], repeat: int, warmup: int, cassette_name: str, latency: str, record: bool) -> List[Dict[str, Any]]:
+    """슬롯마다 자식 프로세스 실행 (RSS/모듈 상태 분리, 캐시는 임시 HOME에 격리 - 기록 시에는 KIS 토큰 캐시를 쓰도록 실제 HOME)"""
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench_home_") as home:
+        env = dict(os.environ) if record else dict(os.environ, HOME=home)
+        for slot in slots:
+            command = [sys.executable, "-m", "market_automation.bench.slots", "--child", slot, "--repeat", str(repeat),
+                       "--warmup", str(warmup), "--cassette", cassette_name, "--latency", latency]
+            command += ["--record"] if record else []
+            proc = subprocess.run(command, cwd=str(project_root), env=env, capture_output=True, text=True)
+            lines = proc.stdout.strip().splitlines()
+            if proc.returncode != 0 or not lines:
+                raise RuntimeError(f"{slot} 실행 실패: {proc.stderr.strip().splitlines()[-1:]}")
+            results.append(json.loads(lines[-1]))
+    return results
+
+def check_budgets(results: List[Dict[str, Any]], budgets: Dict[str, float], max_rss_mb: float) -> List[str]:
+    failures = []
+    for result in results:
+        for stage, budget in budgets.items():
+            p95 = result["stages"][stage]["p95_ms"]
+            if p95 > budget:
+                failures.append(f"{result['slot']} {stage} p95 {p95:.1f}ms > 예산 {budget:.0f}ms")
+        if result["peak_rss_mb"] > max_rss_mb:
+            failures.append(f"{result['slot']} RSS {result['peak_rss_mb']}MB > 예산 {max_rss_mb:.0f}MB")
+        for error in result["failures"]:
+            failures.append(f"{result['slot']} 실행 실패: {error}")
+    return failures
+
+def parse_budgets(values: List[str]) -> Dict[str, float]:
+    """기본 예산 ← BENCH_STAGE_BUDGETS_MS ← --budget 순으로 덮어씀 ('stage=ms')"""
+    from market_automation.config import config
+    
+    budgets = dict(DEFAULT_BUDGETS_MS)
+    for item in config.get("BENCH_STAGE_BUDGETS_MS", "").split(",") + values:
+        if "=" in item:
+            stage, value = item.split("=", 1)
+            if stage.strip() not in STAGES:
+                raise SystemExit(f"❌ 알 수 없는 단계: {stage} (가능: {', '.join(STAGES)})")
+            budgets[stage.strip()] = float(value)
+    return budgets
+
+def print_results(results: List[Dict[str, Any]], budgets: Dict[str, float]):
+    """결과 표 출력"""
+    print(f"{'슬롯':<12}" + "".join(f"{stage + ' p50/p95':>22}" for stage in STAGES) + f"{'RSS(MB)':>10}{'HTTP/회':>9}  수집")
+    for result in results:
+        cells = "".join(f"{result['stages'][s]['p50_ms']:>11,.2f}/{result['stages'][s]['p95_ms']:<10,.2f}" for s in STAGES)
+        print(f"{result['slot']:<12}{cells}{result['peak_rss_mb']:>10}{result['http_calls_per_run']:>9}  {result['fetch_source']}")
+    print("예산(p95 ms): " + ", ".join(f"{stage}={budget:.0f}" for stage, budget in budgets.items()))
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="슬롯 파이프라인 종단 간 벤치마크")
+    parser.add_argument("--slot", action="append", choices=SLOTS, help="측정할 슬롯 (기본: 전체, 여러 번 지정 가능)")
+    parser.add_argument("--repeat", type=int, default=20, help="슬롯별 반복 횟수")
+    parser.add_argument("--warmup", type=int, default=1, help="통계에서 뺄 초기 실행 횟수 (첫 실행은 cold_ms로 보고)")
+    parser.add_argument("--cassette", default="slots", help="재생할 HTTP 카세트 이름 (samples/cassettes/<이름>.jsonl.gz)")
+    parser.add_argument("--latency", default="0", help="재생 지연: 0 | 고정 ms | recorded")
+    parser.add_argument("--record", action="store_true", help="실제 네트워크로 실행하면서 카세트 기록")
+    parser.add_argument("--budget", action="append", default=[], help="단계 p95 예산 덮어쓰기 (예: compose=80)")
+    parser.add_argument("--max-rss-mb", type=float, default=256.0, help="슬롯 프로세스 최대 RSS 예산 (MB)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (추세 비교용)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    parser.add_argument("--child", choices=SLOTS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        print(json.dumps(run_slot(args.child, args.repeat, args.warmup, args.cassette, args.latency, args.record), ensure_ascii=False))
+        return
+    
+    budgets = parse_budgets(args.budget)
+    results = run(args.slot or SLOTS, args.repeat, args.warmup, args.cassette, args.latency, args.record)
+    failures = check_budgets(results, budgets, args.max_rss_mb)
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "cassette": args.cassette,
+        "latency": args.latency,
+        "repeat": args.repeat,
+        "warmup": args.warmup,
+        "budgets_ms": budgets,
+        "slots": results,
+        "failures": failures,
+    }
+    
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_results(results, budgets)
+        if args.output:
+            print(f"💾 결과 저장: {args.output}")
+        for failure in failures:
+            print(f"❌ {failure}")
+        if not failures:
+            print("✅ 모든 단계가 예산 이내")
+    
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+전일 미국장 종가 조회 벤치마크
+08:30/20:00/23:00 슬롯의 전일 미국장 단계를 세션 종가 캐시 없이(cold: 세계지수 수집) / 캐시로(warm) 실행해 지연과 HTTP 요청 수 비교
+사용법: python -m market_automation.bench.us_wrap [--repeat 5] [--offline] [--json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Any, List
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from market_automation.net.session import sessions
+from market_automation.storage.timeseries import TimeSeriesStore, NAVER_WORLD_SYMBOLS, naver_daily_rows
+from market_automation.trading_calendar import last_us_session
+
+# --offline 시 cold 수집 대신 쓰는 세계지수 (네트워크 없는 환경에서 warm 측정용)
+OFFLINE_WORLD = {
+    "sp500": {"price": 5000.0, "change_rate": 0.5},
+    "nasdaq": {"price": 16000.0, "change_rate": 0.8},
+    "dow": {"price": 38000.0, "change_rate": -0.2},
+}
+
+def _http_requests() -> int:
+    """지금까지 보낸 HTTP 요청 수 (전 호스트 합계)"""
+    return sum(item["requests"] for item in sessions.stats().values())
+
+def _prior_closes(store: TimeSeriesStore, scraper, offline: bool) -> Dict[str, Any]:
+    """슬롯의 전일 미국장 단계 - 캐시에 없으면 세계지수를 수집해 기록 후 조회"""
+    symbols = list(NAVER_WORLD_SYMBOLS.values())
+    session = last_us_session()
+    closes = store.daily_closes(symbols, session)
+    if len(closes) < len(symbols):
+        world = OFFLINE_WORLD if offline else scraper.get_world_market_data()
+        if not world or "error" in world:
+            raise RuntimeError(f"세계지수 수집 실패: {(world or {}).get('error')}")
+        store.put_daily_closes(naver_daily_rows(world, session))
+        closes = store.daily_closes(symbols, session)
+    return closes
+
+def _summary(timings: List[float], requests: int, runs: int) -> Dict[str, Any]:
+    timings = sorted(timings)
+    return {
+        "mean_ms": round(statistics.mean(timings), 3),
+        "p95_ms": round(timings[max(0, round(len(timings) * 0.95) - 1)], 3),
+        "http_requests_per_run": round(requests / runs, 2),
+    }
+
+def run(repeat: int, offline: bool) -> Dict[str, Any]:
+    """cold(빈 저장소) / warm(같은 거래일 캐시) 측정"""
+    scraper = None
+    if not offline:
+        from naver_finance_scraper import NaverFinanceScraper
+        scraper = NaverFinanceScraper()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        cold_timings, cold_requests = [], 0
+        store = None
+        # 진단 출력은 측정에서 제외
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(repeat):
+                store = TimeSeriesStore(str(Path(tmp) / f"cold_{i}.sqlite3"))
+                before = _http_requests()
+                start = time.perf_counter()
+                _prior_closes(store, scraper, offline)
+                cold_timings.append((time.perf_counter() - start) * 1000)
+                cold_requests += _http_requests() - before
+                if i < repeat - 1:
+                    store.close()
+            
+            warm_timings, warm_requests = [], 0
+            for _ in range(repeat):
+                before = _http_requests()
+                start = time.perf_counter()
+                closes = _prior_closes(store, scraper, offline)
+                warm_timings.append((time.perf_counter() - start) * 1000)
+                warm_requests += _http_requests() - before
+            store.close()
+    
+    return {
+        "trading_date": last_us_session().isoformat(),
+        "offline": offline,
+        "cold": _summary(cold_timings, cold_requests, repeat),
+        "warm": _summary(warm_timings, warm_requests, repeat),
+        "closes": {symbol: row["close"] for symbol, row in closes.items()},
+    }
+
+def print_results(results: Dict[str, Any]):
+    """결과 표 출력"""
+    print(f"📅 전일 미국장: {results['trading_date']}{' (오프라인)' if results['offline'] else ''}")
+    print(f"{'구분':<8}{'평균(ms)':>10}{'p95(ms)':>10}{'HTTP/회':>10}")
+    for name in ("cold", "warm"):
+        m = results[name]
+        print(f"{name:<8}{m['mean_ms']:>10,.2f}{m['p95_ms']:>10,.2f}{m['http_requests_per_run']:>10}")
+    if results["warm"]["mean_ms"] > 0:
+        print(f"→ warm이 {results['cold']['mean_ms'] / results['warm']['mean_ms']:.1f}배 빠름")
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="전일 미국장 종가 조회 cold/warm 벤치마크")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수")
+    parser.add_argument("--offline", action="store_true", help="세계지수 수집 대신 고정값 사용")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+    
+    try:
+        results = run(max(1, args.repeat), args.offline)
+    except Exception as e:
+        print(f"❌ 벤치마크 실패: {e} (네트워크가 없으면 --offline)")
+        sys.exit(1)
+    
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print_results(results)
+
+if __name__ == "__main__":
+    main()
@@ -21,16 +21,14 @@ def render_us_close(doc):
     composer = ContentComposer()
     idx = doc["indices"]
     
-    # 섹터 요약 생성
+    # 섹터 요약 + 특징주 요약 생성 (LLM 한 번)
     sectors = doc.get("sectors", {})
-    sector_line = composer.compose_sector_summary(
-        sectors.get("top", []),
-        sectors.get("bottom", [])
-    )
-    
-    # 특징주 요약 생성
-    movers = doc.get("movers", [])
-    movers_block = composer.compose_movers_summary(movers)
+    sections = composer.compose_sections({
+        "sector_line": {"top_sectors": sectors.get("top", []), "bottom_sectors": sectors.get("bottom", [])},
+        "movers_block": {"movers": doc.get("movers", [])}
+    }, slot="preview")
+    sector_line = sections["sector_line"]
+    movers_block = sections["movers_block"]
     
     return US_CLOSE.format(
         date=doc["date"],
@@ -4,14 +4,37 @@
 """
 
 import os
-import yaml
+import marshal
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 class Config:
     def __init__(self):
-        self.env = self._load_env()
-        self.sectors = self._load_sectors()
+        # .env와 YAML 설정은 처음 접근할 때 로드 (import 시점 비용 제거)
+        self._env: Optional[Dict[str, str]] = None
+        self._sectors: Optional[Dict[str, Any]] = None
+        self._constituents: Optional[Dict[str, Any]] = None
+    
+    @property
+    def env(self) -> Dict[str, str]:
+        """환경 변수 (최초 접근 시 로드)"""
+        if self._env is None:
+            self._env = self._load_env()
+        return self._env
+    
+    @property
+    def sectors(self) -> Dict[str, Any]:
+        """섹터 설정 (최초 접근 시 로드)"""
+        if self._sectors is None:
+            self._sectors = self._load_yaml("sectors.yml")
+        return self._sectors
+    
+    @property
+    def constituents(self) -> Dict[str, Any]:
+        """시장별 섹터 구성 종목 (최초 접근 시 로드)"""
+        if self._constituents is None:
+            self._constituents = self._load_yaml("sector_constituents.yml")
+        return self._constituents
     
     def _load_env(self) -> Dict[str, str]:
         """환경 변수 로드"""
@@ -19,14 +42,14 @@ class Config:
         env_vars = {}
         
         if env_file.exists():
-            print(f"🔧 .env 파일 로드: {env_file}")
             with open(env_file, "r", encoding="utf-8") as f:
                 for line in f:
                     line = line.strip()
                     if line and not line.startswith("#") and "=" in line:
                         key, value = line.split("=", 1)
                         env_vars[key] = value
-                        print(f"  {key}={value}")
+            # 값에 키/토큰이 포함되므로 키 개수만 출력
+            print(f"🔧 .env 파일 로드: {env_file} ({len(env_vars)}개 항목)")
         else:
             print(f"⚠️ .env 파일을 찾을 수 없음: {env_file}")
         
@@ -34,19 +57,49 @@ class Config:
         for key in env_vars:
             if os.getenv(key):
                 env_vars[key] = os.getenv(key)
-                print(f"  {key} (환경변수로 오버라이드): {os.getenv(key)}")
+                print(f"  {key} (환경변수로 오버라이드)")
         
         return env_vars
     
-    def _load_sectors(self) -> Dict[str, Any]:
-        """섹터 설정 YAML 로드"""
-        sectors_file = Path(__file__).parent.parent / "assets" / "sectors.yml"
+    def _load_yaml(self, name: str) -> Dict[str, Any]:
+        """assets/ 아래 YAML 설정 로드 (mtime 기준 바이너리 캐시 사용)"""
+        yaml_file = Path(__file__).parent.parent / "assets" / name
         
-        if sectors_file.exists():
-            with open(sectors_file, "r", encoding="utf-8") as f:
-                return yaml.safe_load(f)
-        else:
+        if not yaml_file.exists():
             return {}
+        
+        stat = yaml_file.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        
+        # 캐시가 원본과 같은 mtime/크기로 만들어졌으면 PyYAML 없이 로드
+        try:
+            cache_file = self._yaml_cache_path(yaml_file)
+            with open(cache_file, "rb") as f:
+                cached_stamp, data = marshal.load(f)
+            if tuple(cached_stamp) == stamp:
+                return data
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+        
+        import yaml
+        with open(yaml_file, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f) or {}
+        
+        try:
+            cache_file = self._yaml_cache_path(yaml_file)
+            tmp_file = cache_file.with_suffix(".tmp")
+            with open(tmp_file, "wb") as f:
+                marshal.dump((stamp, data), f)
+            os.replace(tmp_file, cache_file)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ {name} 캐시 저장 실패: {e}")
+        
+        return data
+    
+    def _yaml_cache_path(self, source: Path) -> Path:
+        """YAML 바이너리 캐시 경로"""
+        from .storage.files import cache_dir
+        return cache_dir() / f"{source.stem}.yml.marshal"
     
     def get(self, key: str, default: Any = None) -> Any:
         """환경 변수 값 조회"""
@@ -88,5 +141,5 @@ class Config:
         """OpenAI API 키 반환"""
         return self.get("OPENAI_API_KEY", "")
 
-# 전역 설정 인스턴스
+# 전역 설정 인스턴스 (파일은 최초 접근 시 로드)
 config = Config()
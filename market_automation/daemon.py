@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+상주 스케줄러 데몬
+크론 대신 하나의 프로세스에서 슬롯 작업을 KST 일정에 맞춰 실행
+(모듈, 세션, 토큰, 설정을 메모리에 유지)
+사용법: python -m market_automation.daemon [--list | --run <slot>]
+"""
+
+import argparse
+import hashlib
+import signal
+import sys
+import threading
+import traceback
+from datetime import datetime, timedelta, date
+from pathlib import Path
+from typing import List, Optional
+
+import pytz
+
+from .config import config
+from .net.resilience import deadline
+from .scheduler import SLOT_JOBS, SlotJob, get_jobs, run_day
+from .storage.files import cache_dir, file_lock, read_json, atomic_write_json
+
+KST = pytz.timezone("Asia/Seoul")
+
+class SlotDaemon:
+    def __init__(self, jobs: Optional[List[SlotJob]] = None, state_path: Optional[str] = None):
+        self.jobs = jobs or SLOT_JOBS
+        self.state_path = Path(state_path or config.get("DAEMON_STATE_FILE", "") or cache_dir() / "daemon_state.json")
+        self.state_lock = self.state_path.with_name(self.state_path.name + ".lock")
+        self.instance_lock = self.state_path.with_name(self.state_path.name + ".pid.lock")
+        
+        # 슬롯별 지터 상한(초), 놓친 슬롯 캐치업 허용 시간(분), 폴링 주기(초)
+        self.jitter_sec = int(config.get("DAEMON_JITTER_SEC", "0"))
+        self.catchup_min = int(config.get("DAEMON_CATCHUP_MIN", "30"))
+        self.tick_sec = int(config.get("DAEMON_TICK_SEC", "30"))
+        # 발행 몇 분 전에 사전 수집을 시작할지 (0이면 사전 수집 안 함)
+        self.prefetch_lead_min = int(config.get("PREFETCH_LEAD_MIN", "5"))
+        # 슬롯 발행 예산(초) - 이 안에 모든 HTTP 호출을 끝냄 (사전 수집은 발행 시각 전까지)
+        self.slot_budget_sec = float(config.get("SLOT_BUDGET_SEC", "120"))
+        
+        self._stop = threading.Event()
+    
+    def _jitter(self, job: SlotJob, day: date) -> int:
+        """슬롯/날짜별 고정 지터 (재시작해도 같은 값)"""
+        if self.jitter_sec <= 0:
+            return 0
+        digest = hashlib.sha256(f"{job.name}|{day.isoformat()}".encode("utf-8")).digest()
+        return int.from_bytes(digest[:4], "big") % (self.jitter_sec + 1)
+    
+    def scheduled_at(self, job: SlotJob, day: date) -> datetime:
+        """해당 날짜의 슬롯 실행 시각 (KST)"""
+        naive = datetime(day.year, day.month, day.day, job.hour, job.minute)
+        return KST.localize(naive) + timedelta(seconds=self._jitter(job, day))
+    
+    def is_scheduled_day(self, job: SlotJob, day: date) -> bool:
+        """슬롯 실행 요일이면서 대응 세션이 열리는 날인지"""
+        return day.weekday() in job.weekdays and job.is_session_day(day)
+    
+    def _claim(self, key: str, day: date) -> bool:
+        """상태 파일에 실행을 선점 기록 (같은 날짜 작업은 한 번만 실행)"""
+        with file_lock(self.state_lock):
+            state = read_json(self.state_path)
+            if state.get(key, {}).get("date") == day.isoformat():
+                return False
+            state[key] = {"date": day.isoformat(), "status": "running",
+                               "started": datetime.now(KST).isoformat()}
+            atomic_write_json(self.state_path, state)
+            return True
+    
+    def _finish(self, key: str, day: date, status: str):
+        """작업 실행 결과 기록"""
+        with file_lock(self.state_lock):
+            state = read_json(self.state_path)
+            entry = state.get(key, {})
+            entry.update({"date": day.isoformat(), "status": status,
+                          "finished": datetime.now(KST).isoformat()})
+            state[key] = entry
+            atomic_write_json(self.state_path, state)
+    
+    def due_jobs(self, now: datetime) -> List[tuple]:
+        """실행할 (슬롯, 날짜) 목록 - 캐치업 허용 시간 내 놓친 슬롯 포함"""
+        state = read_json(self.state_path)
+        due = []
+        
+        # 자정을 넘긴 캐치업(23:00 슬롯 등)을 위해 전날도 확인
+        for day in (now.date() - timedelta(days=1), now.date()):
+            for job in self.jobs:
+                if not self.is_scheduled_day(job, day):
+                    continue
+                if state.get(job.name, {}).get("date", "") >= day.isoformat():
+                    continue
+                
+                at = self.scheduled_at(job, day)
+                if now < at:
+                    continue
+                
+                if now - at > timedelta(minutes=self.catchup_min):
+                    if day == now.date() and self._claim(job.name, day):
+                        print(f"⏭️ {job.name} ({day}) 캐치업 허용 시간 초과, 건너뜀")
+                        self._finish(job.name, day, "skipped")
+                    continue
+                
+                due.append((job, day))
+        
+        return due
+    
+    def prefetch_at(self, job: SlotJob, day: date) -> datetime:
+        """해당 날짜의 사전 수집 시각 (KST)"""
+        return self.scheduled_at(job, day) - timedelta(minutes=self.prefetch_lead_min)
+    
+    def due_prefetches(self, now: datetime) -> List[SlotJob]:
+        """사전 수집 구간(발행 N분 전 ~ 발행 시각)에 들어온 슬롯 목록"""
+        if self.prefetch_lead_min <= 0:
+            return []
+        
+        state = read_json(self.state_path)
+        day = now.date()
+        return [
+            job for job in self.jobs
+            if self.is_scheduled_day(job, day)
+            and state.get(f"{job.name}.prefetch", {}).get("date") != day.isoformat()
+            and self.prefetch_at(job, day) <= now < self.scheduled_at(job, day)
+        ]
+    
+    def run_prefetch(self, job: SlotJob, day: date) -> str:
+        """슬롯 사전 수집 실행 (실패해도 발행은 기존 경로로 진행)"""
+        key = f"{job.name}.prefetch"
+        if not self._claim(key, day):
+            return "duplicate"
+        
+        status = "done"
+        try:
+            from .posting.poster import get_poster
+            with deadline(self.prefetch_lead_min * 60):
+                result = get_poster().prefetch(job.name)
+            if not result.get("success"):
+                status = "failed"
+        except Exception as e:
+            print(f"⚠️ {job.name} 사전 수집 실패: {e}")
+            status = "failed"
+        
+        self._finish(key, day, status)
+        return status
+    
+    def run_job(self, job: SlotJob, day: Optional[date] = None, force: bool = False) -> str:
+        """슬롯 main() 실행 - 결과 상태 반환"""
+        day = day or datetime.now(KST).date()
+        if not force and not self._claim(job.name, day):
+            print(f"⏭️ {job.name} ({day}) 이미 실행됨")
+            return "duplicate"
+        
+        print(f"🚀 슬롯 실행: {job.name} ({day} {job.time} KST)")
+        status = "done"
+        try:
+            # 자정을 넘긴 캐치업도 휴장일 확인은 예정 실행일 기준
+            with deadline(self.slot_budget_sec), run_day(day):
+                job.load()()
+        except SystemExit as e:
+            # 슬롯 main()은 실패 시 sys.exit(1) 호출
+            if e.code not in (None, 0):
+                status = "failed"
+        except Exception as e:
+            print(f"💥 슬롯 {job.name} 실행 오류: {e}")
+            traceback.print_exc()
+            status = "failed"
+        
+        if not force:
+            self._finish(job.name, day, status)
+        print(f"🏁 슬롯 종료: {job.name} ({status})")
+        return status
+    
+    def seconds_until_next(self, now: datetime) -> float:
+        """다음 슬롯까지 남은 시간 (폴링 주기 이내)"""
+        upcoming = [
+            at
+            for day in (now.date(), now.date() + timedelta(days=1))
+            for job in self.jobs
+            if self.is_scheduled_day(job, day)
+            for at in (self.prefetch_at(job, day), self.scheduled_at(job, day))
+        ]
+        upcoming = [at for at in upcoming if at > now]
+        if not upcoming:
+            return self.tick_sec
+        return max(0.5, min(self.tick_sec, (min(upcoming) - now).total_seconds()))
+    
+    def warm_up(self):
+        """슬롯 모듈과 의존성을 미리 import"""
+        for job in self.jobs:
+            try:
+                job.load()
+            except Exception as e:
+                print(f"⚠️ {job.name} 모듈 로드 실패: {e}")
+    
+    def stop(self, *args):
+        """종료 요청"""
+        print("🛑 종료 신호 수신")
+        self._stop.set()
+    
+    def serve(self):
+        """메인 루프"""
+        try:
+            with file_lock(self.instance_lock, blocking=False):
+                signal.signal(signal.SIGTERM, self.stop)
+                signal.signal(signal.SIGINT, self.stop)
+                
+                print(f"🕐 스케줄러 데몬 시작 (상태 파일: {self.state_path})")
+                self.warm_up()
+                
+                from .datasource.kis_stream import kis_stream, start_from_config as start_kis_stream
+                from .datasource.alpaca_stream import alpaca_stream, start_from_config as start_alpaca_stream
+                streams = [stream for stream, start in ((kis_stream, start_kis_stream), (alpaca_stream, start_alpaca_stream))
+                           if start()]
+                
+                while not self._stop.is_set():
+                    now = datetime.now(KST)
+                    for job in self.due_prefetches(now):
+                        self.run_prefetch(job, now.date())
+                    
+                    now = datetime.now(KST)
+                    for job, day in self.due_jobs(now):
+                        if self._stop.is_set():
+                            break
+                        self.run_job(job, day)
+                    self._stop.wait(self.seconds_until_next(datetime.now(KST)))
+                
+                for stream in streams:
+                    stream.stop()
+                print("🏁 스케줄러 데몬 종료")
+        except BlockingIOError:
+            print("❌ 이미 실행 중인 데몬이 있음")
+            sys.exit(1)
+
+def print_schedule(daemon: SlotDaemon):
+    """슬롯 일정 출력"""
+    today = datetime.now(KST).date()
+    state = read_json(daemon.state_path)
+    for job in daemon.jobs:
+        last = state.get(job.name, {})
+        days = "".join("월화수목금토일"[d] for d in job.weekdays)
+        print(f"{job.name:<12} {job.time} ({days}) 오늘: {daemon.scheduled_at(job, today).strftime('%H:%M:%S')}"
+              f" 최근: {last.get('date', '-')} {last.get('status', '')}")
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="Market Automation 스케줄러 데몬")
+    parser.add_argument("--list", action="store_true", help="슬롯 일정 출력")
+    parser.add_argument("--run", metavar="SLOT", help="슬롯 즉시 실행 (상태 기록 없이)")
+    args = parser.parse_args()
+    
+    daemon = SlotDaemon()
+    
+    if args.list:
+        print_schedule(daemon)
+    elif args.run:
+        jobs = get_jobs()
+        if args.run not in jobs:
+            print(f"❌ 알 수 없는 슬롯: {args.run} (지원: {', '.join(jobs)})")
+            sys.exit(1)
+        daemon.run_job(jobs[args.run], force=True)
+    else:
+        daemon.serve()
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,40 @@ Alpaca Markets API 클라이언트
 미국 증시 데이터 수집 (주요 지수, 섹터, 특징주)
 """
 
-import requests
 import json
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, Any, List, Optional
+from urllib.parse import urlparse
 from ..config import config
+from ..net.fanout import fanout, FetchSpec
+from ..net.session import sessions
+from ..net.ratelimit import limiter
+from ..storage.timeseries import timeseries, record, alpaca_rows, record_daily_closes, alpaca_daily_rows
+from ..trading_calendar import NYSE, et_date, last_us_session
+from ..analytics.sectors import get_universe, split_top_bottom
+from ..analytics.movers import load_universe, rank_movers, merge_movers
+from ..storage.files import cache_dir, read_json, atomic_write_json
+from ..storage.ticks import tick_store
+
+# 구성 종목 설정에 ETF 목록이 없을 때 쓰는 섹터 SPDR ETF
+DEFAULT_SECTOR_ETFS = {
+    "Information Technology": "XLK",
+    "Financials": "XLF",
+    "Health Care": "XLV",
+    "Consumer Discretionary": "XLY",
+    "Industrials": "XLI",
+    "Energy": "XLE",
+    "Materials": "XLB",
+    "Real Estate": "XLRE",
+    "Utilities": "XLU",
+    "Consumer Staples": "XLP",
+    "Communication Services": "XLC"
+}
 
 class AlpacaClient:
+    # 스냅샷 일괄 조회 시 요청당 최대 심볼 수 (URL 길이 제한 고려)
+    SNAPSHOT_CHUNK_SIZE = 200
+    
     def __init__(self):
         self.config = config
         self.api_key = self.config.get("ALPACA_API_KEY", "")
@@ -33,10 +60,12 @@ class AlpacaClient:
     def _make_request(self, url: str, method: str = "GET", params: Dict = None, data: Dict = None) -> Dict[str, Any]:
         """API 요청 실행"""
         try:
+            limiter.acquire("alpaca", urlparse(url).path)
+            session = sessions.get(url)
             if method.upper() == "GET":
-                response = requests.get(url, headers=self.headers, params=params)
+                response = session.get(url, headers=self.headers, params=params)
             elif method.upper() == "POST":
-                response = requests.post(url, headers=self.headers, json=data)
+                response = session.post(url, headers=self.headers, json=data)
             else:
                 return {"error": f"Unsupported method: {method}"}
             
@@ -53,6 +82,141 @@ class AlpacaClient:
         url = f"{self.base_url}/v2/account"
         return self._make_request(url)
     
+    def get_snapshots(self, symbols: List[str]) -> Dict[str, Any]:
+        """여러 심볼의 스냅샷 일괄 조회 (현재가, 전일 종가, 거래량)
+
+        멀티 심볼 스냅샷 엔드포인트를 사용하므로 심볼 수와 무관하게
+        SNAPSHOT_CHUNK_SIZE개당 요청 1회로 전체 유니버스를 조회한다.
+        응답에 없는 심볼과 실패한 청크의 심볼은 결과에서 빠진다 (모든 청크가 실패하면 error).
+        """
+        unique_symbols = list(dict.fromkeys(s for s in symbols if s))
+        snapshots = {}
+        
+        try:
+            url = f"{self.data_url}/v2/stocks/snapshots"
+            
+            # 청크가 여러 개면 동시에 요청
+            chunks = [unique_symbols[i:i + self.SNAPSHOT_CHUNK_SIZE]
+                      for i in range(0, len(unique_symbols), self.SNAPSHOT_CHUNK_SIZE)]
+            results = fanout.gather([
+                FetchSpec(f"snapshots_{i}", self._make_request, (url,),
+                          {"params": {"symbols": ",".join(chunk)}}, host=self.data_url)
+                for i, chunk in enumerate(chunks)
+            ])
+            
+            # 실패한 청크만 건너뛰고 성공한 청크는 사용 (모든 청크가 실패했을 때만 error)
+            failed = {name: data for name, data in results.items() if "error" in data}
+            if failed and len(failed) == len(results):
+                return next(iter(failed.values()))
+            for name, data in failed.items():
+                print(f"⚠️ Alpaca {name} 조회 실패, 해당 청크 제외: {data['error']}")
+            
+            for data in results.values():
+                if "error" in data:
+                    continue
+                
+                # 단일/다중 응답 형식 모두 처리 ({"snapshots": {...}} 또는 {심볼: {...}})
+                raw = data.get("snapshots", data)
+                for symbol, snapshot in raw.items():
+                    parsed = self._parse_snapshot(snapshot)
+                    if parsed:
+                        snapshots[symbol] = parsed
+            
+            record(alpaca_rows(snapshots), "Alpaca")
+            record_daily_closes(alpaca_daily_rows(snapshots), "Alpaca")
+            if tick_store.index:
+                self._seed_stream(snapshots)
+            return snapshots
+            
+        except Exception as e:
+            return {"error": str(e)}
+    
+    def _parse_snapshot(self, snapshot: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """스냅샷 응답을 가격 데이터 형식으로 변환"""
+        if not snapshot:
+            return None
+        
+        latest_trade = snapshot.get("latestTrade") or {}
+        daily_bar = snapshot.get("dailyBar") or {}
+        prev_daily_bar = snapshot.get("prevDailyBar") or {}
+        
+        price = latest_trade.get("p") or daily_bar.get("c")
+        if not price:
+            return None
+        
+        # 전일 종가 → 오늘 시가 → 현재가 순으로 대체
+        prev_close = prev_daily_bar.get("c") or daily_bar.get("o") or price
+        
+        return {
+            "price": price,                                        # 현재가
+            "prev_close": prev_close,                              # 전일 종가 또는 시가
+            "volume": daily_bar.get("v", latest_trade.get("s", 0)),  # 거래량
+            "timestamp": latest_trade.get("t") or daily_bar.get("t"),
+            "session_date": et_date(daily_bar.get("t")),             # 당일 일봉 거래일
+            "daily_close": daily_bar.get("c"),                      # 당일 일봉 종가 (장중엔 현재가)
+            "prev_session_date": et_date(prev_daily_bar.get("t")),   # 전일 일봉 거래일
+            "prev_daily_close": prev_daily_bar.get("c"),             # 전일 일봉 종가
+            "prev_volume": prev_daily_bar.get("v")                   # 전일 거래량 (거래량 급증 판단)
+        }
+    
+    def _seed_stream(self, snapshots: Dict[str, Any]):
+        """실시간 스트림 종목의 전일 종가/당일 누적 거래량을 스냅샷으로 갱신
+
+        개장 전에는 당일 일봉이 직전 세션이므로 그 종가가 전일 종가가 됨
+        """
+        from .alpaca_stream import epoch
+        
+        today = NYSE.local_date().isoformat()
+        for symbol, snap in snapshots.items():
+            if symbol not in tick_store.index:
+                continue
+            session_date = snap.get("session_date")
+            if session_date == today and snap.get("prev_daily_close") and snap.get("prev_session_date"):
+                prev_close, prev_day = snap["prev_daily_close"], snap["prev_session_date"]
+                volume, t = snap.get("volume") or 0, epoch(snap["timestamp"]) if snap.get("timestamp") else 0.0
+            elif session_date and snap.get("daily_close"):
+                prev_close, prev_day, volume, t = snap["daily_close"], session_date, 0, 0.0
+            else:
+                continue
+            tick_store.seed(symbol, prev_close, datetime.strptime(prev_day, "%Y-%m-%d").toordinal(), volume, t)
+    
+    def _stream_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """실시간 스트림 버퍼의 최신 시세 (스트림이 없거나 오래됐으면 None)"""
+        if not tick_store.index:
+            return None
+        return tick_store.latest(symbol, float(self.config.get("ALPACA_STREAM_MAX_AGE_SEC", "120")))
+    
+    def get_daily_closes(self, symbols: List[str], trading_date: Optional[str] = None) -> Dict[str, Any]:
+        """거래일 세션 종가 조회 - 세션 종가 캐시 우선, 없는 심볼만 스냅샷 요청
+
+        trading_date가 없으면 마감된 가장 최근 미국 정규장. 스냅샷 조회 시
+        일봉이 캐시에 기록되므로 같은 거래일의 이후 슬롯은 네트워크 없이 응답한다.
+        """
+        trading_date = trading_date or last_us_session().isoformat()
+        if not NYSE.is_session(datetime.strptime(trading_date, "%Y-%m-%d").date()):
+            return {"error": f"{trading_date}는 NYSE 휴장일"}
+        
+        closes = timeseries.daily_closes(symbols, trading_date)
+        missing = [s for s in symbols if s not in closes]
+        
+        if missing:
+            snapshots = self.get_snapshots(missing)
+            if "error" in snapshots and not closes:
+                return snapshots
+            closes.update(timeseries.daily_closes(missing, trading_date))
+        
+        return closes
+    
+    def _calc_change(self, price_data: Dict[str, Any]) -> tuple:
+        """전일 종가 대비 변동폭/변동률 계산"""
+        prev_close = price_data.get("prev_close", 0)
+        current_price = price_data.get("price", 0)
+        
+        if prev_close > 0:
+            change = current_price - prev_close
+            return change, (change / prev_close) * 100
+        return 0, 0
+    
     def get_us_indices(self) -> Dict[str, Any]:
         """미국 주요 지수 데이터 조회"""
         try:
@@ -65,66 +229,50 @@ class AlpacaClient:
                 "rty": "RUT"    # Russell 2000 Index
             }
             
+            # 실시간 스트림 버퍼에 지수(또는 대체 ETF) 최신 시세가 있으면 REST 생략
+            streamed = {}
+            for index_name, symbol in indices.items():
+                quote = self._stream_quote(symbol) or self._stream_quote(self._get_etf_symbol(index_name))
+                if quote:
+                    streamed[index_name] = quote
+            
+            # 나머지 지수 심볼과 대체 ETF 심볼을 한 번에 조회
+            missing = [name for name in indices if name not in streamed]
+            snapshots = {}
+            if missing:
+                symbols = [indices[name] for name in missing] + [self._get_etf_symbol(name) for name in missing]
+                snapshots = self.get_snapshots(symbols)
+                if "error" in snapshots:
+                    return snapshots
+            else:
+                print("📡 미국 지수 실시간 버퍼 사용 (REST 생략)")
+            
             result = {}
             
             for index_name, symbol in indices.items():
-                # 지수 데이터는 다른 엔드포인트를 사용해야 할 수 있음
-                # 먼저 일반적인 주식 데이터로 시도
-                price_data = self.get_latest_price(symbol)
-                if "error" not in price_data:
-                    # 전일 종가와 비교하여 변동률 계산
-                    prev_close = price_data.get("prev_close", 0)
-                    current_price = price_data.get("price", 0)
-                    
-                    if prev_close > 0:
-                        change = current_price - prev_close
-                        change_pct = (change / prev_close) * 100
-                    else:
-                        change = 0
-                        change_pct = 0
-                    
-                    # 코멘트 생성
-                    comment = self._generate_index_comment(index_name, change_pct)
-                    
-                    result[index_name] = {
-                        "price": current_price,
-                        "diff": change,
-                        "pct": change_pct,
-                        "comment": comment,
-                        "volume": price_data.get("volume", 0),
-                        "timestamp": datetime.now().isoformat()
-                    }
-                else:
+                price_data = streamed.get(index_name) or snapshots.get(symbol)
+                if not price_data:
                     # 지수 데이터 실패 시 ETF 데이터로 대체
                     print(f"⚠️ {symbol} 지수 데이터 실패, ETF로 대체 시도")
                     etf_symbol = self._get_etf_symbol(index_name)
-                    if etf_symbol:
-                        etf_data = self.get_latest_price(etf_symbol)
-                        if "error" not in etf_data:
-                            prev_close = etf_data.get("prev_close", 0)
-                            current_price = etf_data.get("price", 0)
-                            
-                            if prev_close > 0:
-                                change = current_price - prev_close
-                                change_pct = (change / prev_close) * 100
-                            else:
-                                change = 0
-                                change_pct = 0
-                            
-                            comment = self._generate_index_comment(index_name, change_pct)
-                            
-                            result[index_name] = {
-                                "price": current_price,
-                                "diff": change,
-                                "pct": change_pct,
-                                "comment": comment,
-                                "volume": etf_data.get("volume", 0),
-                                "timestamp": datetime.now().isoformat()
-                            }
-                        else:
-                            result[index_name] = {"error": f"ETF {etf_symbol} 데이터 실패: {etf_data['error']}"}
-                    else:
-                        result[index_name] = {"error": f"지수 {symbol} 데이터 실패: {price_data['error']}"}
+                    price_data = snapshots.get(etf_symbol)
+                    if not price_data:
+                        result[index_name] = {"error": f"ETF {etf_symbol} 데이터 실패: 스냅샷 없음"}
+                        continue
+                
+                change, change_pct = self._calc_change(price_data)
+                
+                # 코멘트 생성
+                comment = self._generate_index_comment(index_name, change_pct)
+                
+                result[index_name] = {
+                    "price": price_data.get("price", 0),
+                    "diff": change,
+                    "pct": change_pct,
+                    "comment": comment,
+                    "volume": price_data.get("volume", 0),
+                    "timestamp": datetime.now().isoformat()
+                }
             
             return result
             
@@ -132,151 +280,120 @@ class AlpacaClient:
             return {"error": str(e)}
     
     def get_latest_price(self, symbol: str) -> Dict[str, Any]:
-        """특정 심볼의 최신 가격 데이터 조회"""
-        try:
-            # 최신 가격 조회
-            url = f"{self.data_url}/v2/stocks/{symbol}/trades/latest"
-            latest_data = self._make_request(url)
-            
-            if "error" in latest_data:
-                return latest_data
-            
-            # 전일 종가 조회 - 더 정확한 방법 사용
-            yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-            url = f"{self.data_url}/v2/stocks/{symbol}/bars"
-            params = {
-                "start": yesterday,
-                "end": yesterday,
-                "timeframe": "1Day",
-                "limit": 1
-            }
-            
-            prev_data = self._make_request(url, params=params)
-            
-            if "error" in prev_data or not prev_data.get("bars"):
-                # 전일 데이터가 없으면 오늘 데이터에서 시가를 사용
-                print(f"⚠️ {symbol} 전일 데이터 없음, 오늘 시가 사용")
-                today = datetime.now().strftime("%Y-%m-%d")
-                today_params = {
-                    "start": today,
-                    "end": today,
-                    "timeframe": "1Day",
-                    "limit": 1
-                }
-                today_data = self._make_request(url, params=today_params)
-                if "error" not in today_data and today_data.get("bars"):
-                    prev_close = today_data["bars"][0]["o"]  # 시가
-                else:
-                    prev_close = latest_data["trade"]["p"]  # 현재가
-            else:
-                prev_close = prev_data["bars"][0]["c"]  # 전일 종가
-            
-            return {
-                "price": latest_data["trade"]["p"],  # 현재가
-                "prev_close": prev_close,            # 전일 종가 또는 시가
-                "volume": latest_data["trade"]["s"], # 거래량
-                "timestamp": latest_data["trade"]["t"]
-            }
-            
-        except Exception as e:
-            return {"error": str(e)}
+        """특정 심볼의 최신 가격 데이터 조회 (실시간 버퍼가 최신이면 REST 생략)"""
+        quote = self._stream_quote(symbol)
+        if quote:
+            return quote
+        
+        snapshots = self.get_snapshots([symbol])
+        
+        if "error" in snapshots:
+            return snapshots
+        
+        if symbol not in snapshots:
+            return {"error": f"{symbol} 스냅샷 없음"}
+        
+        return snapshots[symbol]
     
     def get_sector_performance(self) -> Dict[str, List[Dict[str, Any]]]:
-        """섹터별 성과 조회 (SPDR ETF 기준)"""
+        """섹터별 성과 조회 - 구성 종목 시세로 가중 수익률/상승 비율 계산 (구성 종목이 없는 섹터는 SPDR ETF 수익률)"""
         try:
-            # 주요 섹터 ETF 심볼들
-            sector_etfs = {
-                "Information Technology": "XLK",
-                "Financials": "XLF", 
-                "Health Care": "XLV",
-                "Consumer Discretionary": "XLY",
-                "Industrials": "XLI",
-                "Energy": "XLE",
-                "Materials": "XLB",
-                "Real Estate": "XLRE",
-                "Utilities": "XLU",
-                "Consumer Staples": "XLP",
-                "Communication Services": "XLC"
-            }
+            universe = get_universe("us")
+            sector_etfs = config.constituents.get("us", {}).get("etfs") or DEFAULT_SECTOR_ETFS
             
-            top_sectors = []
-            bottom_sectors = []
+            # 구성 종목과 섹터 ETF를 한 번에 조회
+            symbols = list(sector_etfs.values()) + (universe.unique_symbols() if universe else [])
+            snapshots = self.get_snapshots(symbols)
+            if "error" in snapshots:
+                return snapshots
             
-            for sector_name, etf_symbol in sector_etfs.items():
-                price_data = self.get_latest_price(etf_symbol)
-                if "error" not in price_data:
-                    prev_close = price_data.get("prev_close", 0)
-                    current_price = price_data.get("price", 0)
-                    
-                    if prev_close > 0:
-                        ret1d = ((current_price - prev_close) / prev_close) * 100
-                        
-                        sector_data = {
-                            "name": sector_name,
-                            "ret1d": round(ret1d, 2),
-                            "breadth": 0.5  # 기본값, 실제로는 섹터 내 상승/하락 비율 계산 필요
-                        }
-                        
-                        if ret1d > 0:
-                            top_sectors.append(sector_data)
-                        else:
-                            bottom_sectors.append(sector_data)
+            sectors = {s["name"]: s for s in universe.compute(snapshots)} if universe else {}
             
-            # 수익률 기준으로 정렬
-            top_sectors.sort(key=lambda x: x["ret1d"], reverse=True)
-            bottom_sectors.sort(key=lambda x: x["ret1d"])
+            for sector_name, etf_symbol in sector_etfs.items():
+                price_data = snapshots.get(etf_symbol)
+                if sector_name in sectors or not price_data or price_data.get("prev_close", 0) <= 0:
+                    continue
+                _, ret1d = self._calc_change(price_data)
+                # 구성 종목이 없으면 상승/하락 비율을 알 수 없음 (중립값)
+                sectors[sector_name] = {"name": sector_name, "ret1d": round(ret1d, 2), "breadth": 0.5}
             
-            return {
-                "top": top_sectors[:5],      # 상위 5개
-                "bottom": bottom_sectors[:5]  # 하위 5개
-            }
+            return split_top_bottom(list(sectors.values()), top_n=5, bottom_n=5)
             
         except Exception as e:
             return {"error": str(e)}
     
+    def _list_assets(self) -> List[str]:
+        """거래 가능한 미국 주식 전체 심볼 (/v2/assets, 하루 한 번 조회 후 디스크 캐시)"""
+        cache_file = cache_dir() / "alpaca_assets.json"
+        today = datetime.now().strftime("%Y-%m-%d")
+        cached = read_json(cache_file)
+        if cached.get("date") == today and cached.get("symbols"):
+            return cached["symbols"]
+        
+        assets = self._make_request(f"{self.base_url}/v2/assets",
+                                    params={"status": "active", "asset_class": "us_equity"})
+        if isinstance(assets, dict):
+            print(f"⚠️ 종목 목록 조회 실패: {assets.get('error')}")
+            return cached.get("symbols", [])
+        
+        symbols = [a["symbol"] for a in assets if a.get("tradable") and a.get("exchange") != "OTC"]
+        atomic_write_json(cache_file, {"date": today, "symbols": symbols})
+        return symbols
+    
+    def get_movers(self, k: int = 5) -> Dict[str, Any]:
+        """유니버스 전체 스캔으로 상승/하락/거래량 급증 상위 k개 선정 (MOVERS_US_UNIVERSE)"""
+        symbols = load_universe("us")
+        if symbols is None:
+            symbols = self._list_assets()
+        if not symbols:
+            return {"error": "특징주 유니버스가 비어 있음"}
+        
+        snapshots = self.get_snapshots(symbols)
+        if "error" in snapshots:
+            return snapshots
+        return rank_movers(snapshots, "us", k)
+    
     def get_top_movers(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """상위 변동 종목 조회"""
+        """상위 변동 종목 조회 - compose_movers_summary 입력 형식 (변동률 절댓값 순)"""
         try:
-            # S&P 500 상위 종목들 (실제로는 더 정교한 필터링 필요)
-            top_symbols = ["AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "META", "TSLA", "BRK.A", "UNH", "JNJ"]
-            
-            movers = []
-            
-            for symbol in top_symbols[:limit]:
-                price_data = self.get_latest_price(symbol)
-                if "error" not in price_data:
-                    prev_close = price_data.get("prev_close", 0)
-                    current_price = price_data.get("price", 0)
-                    
-                    if prev_close > 0:
-                        ret1d = ((current_price - prev_close) / prev_close) * 100
-                        
-                        # 섹터 정보 (실제로는 별도 API 호출 필요)
-                        sector = self._get_stock_sector(symbol)
-                        
-                        movers.append({
-                            "symbol": symbol,
-                            "sector": sector,
-                            "ret1d": round(ret1d, 2),
-                            "mcap": "N/A",  # 시가총액은 별도 API 필요
-                            "reason": self._generate_mover_reason(symbol, ret1d)
-                        })
+            ranked = self.get_movers(k=limit)
+            if "error" in ranked:
+                return [ranked]
             
-            # 변동률 기준으로 정렬
-            movers.sort(key=lambda x: abs(x["ret1d"]), reverse=True)
-            
-            return movers[:limit]
+            movers = merge_movers(ranked, limit)
+            for mover in movers:
+                if mover["sector"] == "Unknown":
+                    mover["sector"] = self._get_stock_sector(mover["symbol"])
+                mover["reason"] = self._generate_mover_reason(mover["symbol"], mover["ret1d"])
+            return movers
             
         except Exception as e:
             return [{"error": str(e)}]
     
     def get_market_status(self) -> Dict[str, Any]:
-        """시장 상태 조회 (개장/폐장, 거래 시간 등)"""
-        try:
-            url = f"{self.base_url}/v2/clock"
-            return self._make_request(url)
-        except Exception as e:
-            return {"error": str(e)}
+        """시장 상태 조회 (개장/폐장, 거래 시간 등) - 로컬 NYSE 세션표 기준, API 요청 없음
+
+        /v2/clock 응답과 같은 키(is_open, next_open, next_close, timestamp)를 KST 시각으로 반환
+        """
+        now = datetime.now(NYSE.tz)
+        today = NYSE.local_date(now)
+        session = NYSE.session(today)
+        is_open = NYSE.is_open(now)
+        
+        if session and now < session.open:
+            next_session = session
+        else:
+            next_session = NYSE.session(NYSE.next_session(today))
+        close_session = session if is_open else next_session
+        
+        return {
+            "timestamp": now.isoformat(),
+            "is_open": is_open,
+            "next_open": next_session.open.isoformat(),
+            "next_close": close_session.close.isoformat(),
+            "early_close": bool(close_session.special),
+            "last_session": last_us_session(now).isoformat()
+        }
     
     def _generate_index_comment(self, index_name: str, change_pct: float) -> str:
         """지수별 코멘트 생성"""
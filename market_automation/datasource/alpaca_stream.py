@@ -0,0 +1,163 @@
+"""
+Alpaca 실시간 시세 스트리밍 클라이언트
+시장 데이터 WebSocket 인증 → 지수/섹터 ETF·관심 종목의 체결/분봉 구독 → 종목별 링 버퍼(storage.ticks)에 기록
+AlpacaClient.get_latest_price/get_us_indices는 버퍼가 최신이면 REST 없이 응답 (websockets 미설치 시 비활성화)
+"""
+
+import json
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from ..config import config
+from ..net.stream import ReconnectingStream, websockets
+from ..storage.ticks import TickStore, tick_store
+
+LIVE_WS_URL = "wss://stream.data.alpaca.markets/v2/{feed}"
+SANDBOX_WS_URL = "wss://stream.data.sandbox.alpaca.markets/v2/{feed}"
+
+# 지수 대체 ETF (AlpacaClient.get_us_indices와 동일)
+INDEX_ETFS = ["SPY", "QQQ", "DIA", "IWM"]
+
+_minute_epochs: Dict[str, int] = {}
+
+def epoch(timestamp: str) -> float:
+    """RFC3339 타임스탬프(초 이하 나노초까지, Z)를 epoch 초로 변환 - 분 단위 접두사는 캐시"""
+    minute = timestamp[:16]
+    base = _minute_epochs.get(minute)
+    if base is None:
+        base = int(datetime.strptime(minute, "%Y-%m-%dT%H:%M").replace(tzinfo=timezone.utc).timestamp())
+        if len(_minute_epochs) > 4096:
+            _minute_epochs.clear()
+        _minute_epochs[minute] = base
+    seconds = timestamp[17:].rstrip("Z")
+    return base + (float(seconds[:9]) if seconds else 0.0)
+
+class AlpacaStream(ReconnectingStream):
+    """Alpaca 시장 데이터 WebSocket 클라이언트 (체결은 최신가, 분봉은 링 버퍼로)"""
+    
+    label = "Alpaca 실시간"
+    
+    def __init__(self, url: Optional[str] = None, key: Optional[str] = None, secret: Optional[str] = None,
+                 store: Optional[TickStore] = None):
+        paper = config.get("ALPACA_PAPER", "true").lower() == "true"
+        feed = config.get("ALPACA_FEED", "iex")
+        super().__init__(url or config.get("ALPACA_WS_URL", "") or (SANDBOX_WS_URL if paper else LIVE_WS_URL).format(feed=feed),
+                         float(config.get("ALPACA_STREAM_RECONNECT_MAX_SEC", "30")))
+        self.key = key if key is not None else config.get("ALPACA_API_KEY", "")
+        self.secret = secret if secret is not None else config.get("ALPACA_API_SECRET", "")
+        self.store = store or tick_store
+        self.record_path = config.get("ALPACA_STREAM_RECORD", "")
+        self._symbols: Dict[str, None] = {}
+    
+    def _prepare(self) -> bool:
+        """API 키가 있어야 시작"""
+        if not (self.key and self.secret):
+            print("⚠️ Alpaca 키 없음 - 실시간 스트리밍 생략")
+            return False
+        return True
+    
+    def _message(self, action: str, symbols: List[str]) -> str:
+        """체결/분봉/갱신 분봉 등록·해제 요청"""
+        return json.dumps({"action": action, "trades": symbols, "bars": symbols, "updatedBars": symbols})
+    
+    def subscribe(self, symbols: List[str]):
+        """종목 구독 (연결 중이면 바로, 아니면 다음 접속 때 등록)"""
+        new = [s for s in dict.fromkeys(symbols) if s and s not in self._symbols]
+        if new:
+            self._symbols.update(dict.fromkeys(new))
+            self._send_threadsafe(self._message("subscribe", new))
+    
+    def unsubscribe(self, symbols: List[str]):
+        """종목 구독 해제"""
+        removed = [s for s in symbols if self._symbols.pop(s, "missing") != "missing"]
+        if removed:
+            self._send_threadsafe(self._message("unsubscribe", removed))
+    
+    def stats(self):
+        """수신 프레임/체결/재접속 횟수와 구독 종목 수, 버퍼 메모리"""
+        return dict(super().stats(), subscriptions=len(self._symbols), store_bytes=self.store.nbytes)
+    
+    def handle(self, message: str):
+        """수신 메시지(JSON 배열) 처리 - 체결/분봉은 저장소에 기록, 오류는 로그"""
+        self._counters["frames"] += 1
+        try:
+            items = json.loads(message)
+        except ValueError:
+            self._counters["errors"] += 1
+            return
+        
+        store = self.store
+        ticks = 0
+        for item in items if isinstance(items, list) else [items]:
+            kind = item.get("T")
+            try:
+                if kind == "t":
+                    store.add_trade(item["S"], epoch(item["t"]), item["p"], item.get("s", 0))
+                    ticks += 1
+                elif kind in ("b", "u"):
+                    store.add_bar(item["S"], int(epoch(item["t"])), item["o"], item["h"], item["l"], item["c"], item.get("v", 0))
+                    ticks += 1
+                elif kind == "error":
+                    print(f"⚠️ Alpaca 실시간 오류 {item.get('code')}: {item.get('msg')}")
+            except (KeyError, TypeError, ValueError) as e:
+                self._counters["errors"] += 1
+                print(f"⚠️ Alpaca 실시간 메시지 해석 실패: {e}")
+        self._counters["ticks"] += ticks
+    
+    async def _session(self):
+        """접속 1회 - 인증 후 구독 종목을 다시 등록하고 연결이 끊길 때까지 수신"""
+        record = open(self.record_path, "a", encoding="utf-8") if self.record_path else None
+        try:
+            async with websockets.connect(self.url, ping_interval=20, max_size=None) as ws:
+                await ws.recv()  # [{"T":"success","msg":"connected"}]
+                await ws.send(json.dumps({"action": "auth", "key": self.key, "secret": self.secret}))
+                reply = json.loads(await ws.recv())
+                if not any(item.get("msg") == "authenticated" for item in reply):
+                    raise RuntimeError(f"인증 실패: {reply}")
+                
+                self._ws = ws
+                if self._symbols:
+                    await ws.send(self._message("subscribe", list(self._symbols)))
+                self._connected.set()
+                print(f"📡 Alpaca 실시간 연결: {self.url} ({len(self._symbols)}종목 구독)")
+                
+                async for message in ws:
+                    if isinstance(message, bytes):
+                        message = message.decode("utf-8", errors="replace")
+                    if record:
+                        record.write(message + "\n")
+                    self.handle(message)
+                    if self._stop.is_set():
+                        break
+        finally:
+            if record:
+                record.close()
+
+def stream_symbols() -> List[str]:
+    """구독 대상 - 지수 대체 ETF, 섹터 ETF, ALPACA_STREAM_WATCHLIST 종목"""
+    from .alpaca import DEFAULT_SECTOR_ETFS
+    
+    sector_etfs = (config.constituents.get("us") or {}).get("etfs") or DEFAULT_SECTOR_ETFS
+    watchlist = [s.strip().upper() for s in config.get("ALPACA_STREAM_WATCHLIST", "").split(",") if s.strip()]
+    return list(dict.fromkeys(INDEX_ETFS + list(sector_etfs.values()) + watchlist))
+
+# 전역 스트림 인스턴스 (데몬에서 시작, AlpacaClient가 tick_store로 조회)
+alpaca_stream = AlpacaStream()
+
+def start_from_config() -> bool:
+    """ALPACA_STREAM=true면 구독 종목의 전일 종가를 REST 스냅샷으로 채운 뒤 수신 시작"""
+    if config.get("ALPACA_STREAM", "false").lower() != "true":
+        return False
+    
+    if not alpaca_stream._prepare():
+        return False
+    
+    from .alpaca import AlpacaClient
+    
+    symbols = stream_symbols()
+    tick_store.track(symbols)
+    snapshots = AlpacaClient().get_snapshots(symbols)
+    if "error" in snapshots:
+        print(f"⚠️ Alpaca 스냅샷 시드 실패 (전일 종가 없이 시작): {snapshots['error']}")
+    alpaca_stream.subscribe(symbols)
+    return alpaca_stream.start()
@@ -0,0 +1,63 @@
+"""
+lxml 기반 빠른 HTML 추출 도우미
+필요한 요소(id/클래스/테이블/스크립트)만 찾아 텍스트를 꺼냄
+(lxml이 없으면 available()이 False - 호출 측에서 BeautifulSoup으로 폴백)
+"""
+
+from typing import List, Optional
+
+try:
+    from lxml import html as lxml_html
+except ImportError:  # lxml 미설치 환경
+    lxml_html = None
+
+def available() -> bool:
+    """lxml 사용 가능 여부"""
+    return lxml_html is not None
+
+def _class_xpath(tag: str, cls: str) -> str:
+    """클래스 토큰 일치 XPath (BeautifulSoup class_ 검색과 동일한 의미)"""
+    return f"//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]"
+
+class FastDocument:
+    """lxml로 파싱한 문서 - BeautifulSoup get_text()와 같은 규칙으로 텍스트 반환"""
+    
+    def __init__(self, html: str):
+        if lxml_html is None:
+            raise RuntimeError("lxml이 설치되어 있지 않음")
+        self.root = lxml_html.document_fromstring(html)
+    
+    def by_id(self, element_id: str):
+        """id로 요소 조회"""
+        found = self.root.xpath("//*[@id=$id]", id=element_id)
+        return found[0] if found else None
+    
+    def first_by_class(self, tag: str, cls: str):
+        """태그/클래스로 첫 요소 조회"""
+        found = self.root.xpath(_class_xpath(tag, cls))
+        return found[0] if found else None
+    
+    @staticmethod
+    def text(element, strip: bool = False) -> str:
+        """요소 하위 텍스트 (strip=True면 조각별 공백 제거 후 연결)"""
+        if element is None:
+            return ""
+        if strip:
+            return "".join(piece.strip() for piece in element.itertext())
+        return "".join(element.itertext())
+    
+    def text_by_id(self, element_id: str) -> Optional[str]:
+        """id 요소의 텍스트"""
+        element = self.by_id(element_id)
+        return self.text(element) if element is not None else None
+    
+    def table_rows(self, cls: str) -> Optional[List[List[str]]]:
+        """클래스가 일치하는 첫 테이블의 행별 td 텍스트 (테이블이 없으면 None)"""
+        table = self.first_by_class("table", cls)
+        if table is None:
+            return None
+        return [[self.text(td, strip=True) for td in tr.iter("td")] for tr in table.iter("tr")]
+    
+    def script_texts(self) -> List[str]:
+        """모든 script 태그 본문"""
+        return [script.text or "" for script in self.root.iter("script")]
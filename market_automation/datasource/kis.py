@@ -3,14 +3,30 @@
 실전투자 API 연동
 """
 
-import requests
-import json
-from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
-import os
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+import time
+from pathlib import Path
 from ..config import config
+from ..net.fanout import fanout, FetchSpec
+from ..net.cassette import REDACTED, cassette
+from ..net.session import sessions
+from ..net.ratelimit import limiter
+from .kis_token import KISTokenStore
+from .mst import IDXCODE_LAYOUT, MstTable, load_table
+from ..storage.timeseries import record, kis_rows
+from ..trading_calendar import KRX
+from ..analytics.sectors import get_universe
+from ..analytics.movers import load_universe, rank_movers, merge_movers
+
+def is_throttled(response) -> bool:
+    """KIS 호출 한도 초과 응답 - 초당 한도 초과를 HTTP 500 + EGW00201로 알림 (서킷 브레이커 실패로 세지 않음)"""
+    return response.status_code == 429 or "EGW00201" in response.text
 
 class KISClient:
+    # 관심종목 멀티 시세 요청당 최대 종목 수
+    MULTI_QUOTE_SIZE = 30
+    
     def __init__(self):
         self.config = config
         self.app_key = self.config.get_kis_app_key()
@@ -22,86 +38,75 @@ class KISClient:
             self.base_url = "https://openapi.koreainvestment.com:9443"
         else:
             self.base_url = "https://openapivts.koreainvestment.com:29443"
+        # 호출 제한 버킷 (실전/모의 한도가 다름)
+        self.rate_key = "kis" if self.vts == "REAL" else "kis_vts"
+        
+        # 공용 keep-alive 세션 (포트 9443 TLS 핸드셰이크 재사용)
+        self.session = sessions.get(self.base_url)
+        self.session.throttled = is_throttled
         
         # 토큰 관리
         self.access_token = None
         self.token_expires = None
+        self.token_store = KISTokenStore()
         
-        # idxcode.mst 파일에서 지수 코드 매핑 생성
-        self.index_code_map = self._load_index_codes()
+        # idxcode.mst 컴파일 테이블 (mmap, 프로세스 내 공유)
+        self.index_codes = self._load_index_codes()
         
         print(f"🔧 KIS 클라이언트 초기화 완료")
         print(f"🏢 VTS: {self.vts}")
         print(f"🔗 도메인: {self.base_url}")
-        print(f"📊 지수 코드 매핑: {len(self.index_code_map)}개 로드됨")
+        print(f"📊 지수 코드 테이블: {len(self.index_codes or [])}개 로드됨")
     
-    def _load_index_codes(self) -> Dict[str, str]:
-        """idxcode.mst 파일을 로드하여 지수 이름 ↔ fid_input_iscd 매핑 생성"""
-        index_code_map = {}
-        
+    def _load_index_codes(self) -> Optional[MstTable]:
+        """idxcode.mst를 컴파일 테이블로 로드 (지수 이름 ↔ fid_input_iscd 조회용)"""
         try:
             # idxcode.mst 파일 경로 (프로젝트 루트 기준)
-            idxcode_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "idxcode.mst")
+            idxcode_path = Path(__file__).resolve().parent.parent.parent / "idxcode.mst"
             
-            if os.path.exists(idxcode_path):
-                # 다양한 인코딩 시도
-                encodings = ['cp949', 'euc-kr', 'utf-8', 'latin-1']
-                
-                for encoding in encodings:
-                    try:
-                        with open(idxcode_path, 'r', encoding=encoding) as f:
-                            for line in f:
-                                line = line.strip()
-                                if line and len(line) >= 5:
-                                    # 앞 5자리가 지수 코드, 나머지가 지수 이름
-                                    code = line[:5].strip()
-                                    name = line[5:].strip()
-                                    
-                                    if code and name and code != "00000":
-                                        index_code_map[name] = code
-                                        index_code_map[code] = name  # 양방향 매핑
-                        
-                        print(f"✅ idxcode.mst 파일 로드 성공: {idxcode_path} (인코딩: {encoding})")
-                        break
-                        
-                    except UnicodeDecodeError:
-                        continue
-                else:
-                    print(f"⚠️ 모든 인코딩 시도 실패, 기본 지수 코드 사용")
-                    # 기본 지수 코드 설정
-                    index_code_map = {
-                        "KOSPI": "00001",
-                        "00001": "KOSPI",
-                        "KOSDAQ": "11001", 
-                        "11001": "KOSDAQ"
-                    }
-            else:
-                print(f"⚠️ idxcode.mst 파일을 찾을 수 없음: {idxcode_path}")
-                # 기본 지수 코드 설정
-                index_code_map = {
-                    "KOSPI": "00001",
-                    "00001": "KOSPI",
-                    "KOSDAQ": "11001", 
-                    "11001": "KOSDAQ"
-                }
-                
+            if idxcode_path.exists():
+                table = load_table(idxcode_path, IDXCODE_LAYOUT)
+                print(f"✅ idxcode.mst 테이블 로드 성공: {table.path}")
+                return table
+            
+            print(f"⚠️ idxcode.mst 파일을 찾을 수 없음: {idxcode_path}, 기본 지수 코드 사용")
+        
         except Exception as e:
-            print(f"❌ idxcode.mst 파일 로드 실패: {e}")
-            # 기본 지수 코드 설정
-            index_code_map = {
-                "KOSPI": "00001",
-                "00001": "KOSPI",
-                "KOSDAQ": "11001",
-                "11001": "KOSDAQ"
-            }
+            print(f"❌ idxcode.mst 파일 로드 실패: {e}, 기본 지수 코드 사용")
         
-        return index_code_map
+        return None
+    
+    def _index_code(self, name: str, default: str) -> str:
+        """지수 이름으로 fid_input_iscd 조회 (테이블에 없으면 기본값)"""
+        if self.index_codes is None:
+            return default
+        record = self.index_codes.find(name)
+        return record["key"] if record else default
     
     def _get_access_token(self) -> str:
-        """액세스 토큰 발급 - 개선된 버전"""
+        """액세스 토큰 발급 - 디스크 캐시 우선, 없거나 만료 임박 시 발급"""
         if self.access_token and self.token_expires and datetime.now() < self.token_expires:
             return self.access_token
         
+        if cassette.mode == "replay":
+            # 카세트 재생 중에는 발급/디스크 캐시를 건너뜀 (기록된 토큰은 가려져 있고 요청 매칭에 쓰지 않음)
+            return REDACTED
+        
+        try:
+            token, expires_at = self.token_store.get_or_issue(self.app_key, self.base_url, self._issue_access_token)
+        except Exception as e:
+            print(f"⚠️ KIS 토큰 캐시 사용 불가, 직접 발급: {e}")
+            token, expires_at = self._issue_access_token()
+        
+        if token and expires_at:
+            self.access_token = token
+            # 만료 직전 재발급을 위해 여유 시간을 빼고 메모리에 보관
+            self.token_expires = datetime.fromtimestamp(expires_at - self.token_store.refresh_margin)
+        
+        return token
+    
+    def _issue_access_token(self) -> Tuple[str, Optional[float]]:
+        """토큰 발급 API 호출 - (토큰, 만료 epoch) 반환"""
         try:
             # 토큰 발급 URL
             url = f"{self.base_url}/oauth2/tokenP"
@@ -124,33 +129,48 @@ class KISClient:
             print(f"🔒 VTS: {self.vts}")
             
             # POST 요청
-            response = requests.post(url, json=payload, headers=headers)
+            response = self.session.post(url, json=payload, headers=headers)
             
             print(f"📡 응답 상태 코드: {response.status_code}")
             
             if response.status_code == 200:
                 result = response.json()
-                print(f"📋 응답 내용: {result}")
                 
                 if "access_token" in result:
-                    self.access_token = result["access_token"]
-                    # 토큰 만료 시간 설정 (23시간 후)
-                    self.token_expires = datetime.now() + timedelta(hours=23)
-                    print(f"✅ KIS 액세스 토큰 발급 성공: {self.access_token[:20]}...")
-                    return self.access_token
+                    token = result["access_token"]
+                    # 응답의 expires_in(초) 사용, 없으면 23시간
+                    expires_in = int(result.get("expires_in") or 23 * 3600)
+                    print(f"✅ KIS 액세스 토큰 발급 성공: {token[:20]}... (유효 {expires_in}초)")
+                    return token, time.time() + expires_in
                 else:
                     print(f"❌ 응답에 access_token이 없음: {result}")
-                    return ""
+                    return "", None
             else:
                 print(f"❌ KIS 액세스 토큰 발급 실패: HTTP {response.status_code}")
                 print(f"📋 오류 응답: {response.text}")
-                return ""
-                
+                return "", None
+        
         except Exception as e:
             print(f"❌ KIS 액세스 토큰 발급 오류: {e}")
             import traceback
             traceback.print_exc()
-            return ""
+            return "", None
+    
+    def get_approval_key(self) -> str:
+        """실시간(WebSocket) 접속키 발급 - 실패 시 빈 문자열"""
+        try:
+            response = self.session.post(
+                f"{self.base_url}/oauth2/Approval",
+                json={"grant_type": "client_credentials", "appkey": self.app_key, "secretkey": self.app_secret},
+                headers={"Content-Type": "application/json"}
+            )
+            if response.status_code == 200 and response.json().get("approval_key"):
+                print("✅ KIS 실시간 접속키 발급 성공")
+                return response.json()["approval_key"]
+            print(f"❌ KIS 실시간 접속키 발급 실패: HTTP {response.status_code} {response.text}")
+        except Exception as e:
+            print(f"❌ KIS 실시간 접속키 발급 오류: {e}")
+        return ""
     
     def _make_authenticated_request(self, method: str, endpoint: str, token: str, **kwargs) -> Dict[str, Any]:
         """Bearer token 기반 인증 요청 - 다른 지수 조회 TR ID 시도"""
@@ -161,8 +181,10 @@ class KISClient:
             headers["appkey"] = self.app_key
             headers["appsecret"] = self.app_secret
             
-            # VTS에 따른 TR ID 설정 - 다른 지수 조회 TR ID 시도
-            if self.vts == "REAL":
+            # VTS에 따른 TR ID 설정 - 다른 지수 조회 TR ID 시도 (호출 측 지정 TR ID 우선)
+            if "tr_id" in headers:
+                pass
+            elif self.vts == "REAL":
                 # 실전투자: 다른 지수 조회 TR ID 시도
                 headers["tr_id"] = "FHKST01010100"  # 일반적인 지수 조회 TR ID
             else:
@@ -176,7 +198,15 @@ class KISClient:
             print(f"🏷️ TR ID: {headers['tr_id']}")
             print(f"🏢 VTS: {self.vts}")
             
-            response = requests.request(method, url, headers=headers, **kwargs)
+            limiter.acquire(self.rate_key, endpoint)
+            response = self.session.request(method, url, headers=headers, **kwargs)
+            
+            # 초당 호출 한도 초과(EGW00201)면 버킷을 비우고 한 번 재시도
+            if response.status_code != 200 and is_throttled(response):
+                print("⏳ KIS 호출 한도 초과(EGW00201), 대기 후 재시도")
+                limiter.penalize(self.rate_key, endpoint)
+                limiter.acquire(self.rate_key, endpoint)
+                response = self.session.request(method, url, headers=headers, **kwargs)
             
             print(f"📡 응답 상태 코드: {response.status_code}")
             
@@ -187,7 +217,7 @@ class KISClient:
                 print(f"❌ API 요청 실패: HTTP {response.status_code}")
                 print(f"📋 오류 응답: {response.text}")
                 return {"error": f"HTTP Error: {response.status_code}"}
-                
+        
         except Exception as e:
             print(f"❌ 인증 요청 오류: {e}")
             return {"error": str(e)}
@@ -202,20 +232,24 @@ class KISClient:
             
             print("✅ KIS 액세스 토큰 발급 성공")
             
-            # KOSPI 데이터 조회
-            kospi_data = self._get_kospi_data(token)
+            # KOSPI/KOSDAQ 데이터 동시 조회
+            results = fanout.gather([
+                FetchSpec("kospi", self._get_kospi_data, (token,), host=self.base_url),
+                FetchSpec("kosdaq", self._get_kosdaq_data, (token,), host=self.base_url)
+            ])
+            kospi_data = results["kospi"]
+            kosdaq_data = results["kosdaq"]
             print(f"📊 KOSPI 데이터: {kospi_data}")
-            
-            # KOSDAQ 데이터 조회
-            kosdaq_data = self._get_kosdaq_data(token)
             print(f"📊 KOSDAQ 데이터: {kosdaq_data}")
             
-            return {
+            market_data = {
                 "kospi": kospi_data,
                 "kosdaq": kosdaq_data,
                 "exchange": None  # 환율은 별도 조회
             }
-                
+            record(kis_rows(market_data), "KIS")
+            return market_data
+        
         except Exception as e:
             print(f"❌ 한국 시장 데이터 조회 실패: {e}")
             return {"error": str(e)}
@@ -224,12 +258,12 @@ class KISClient:
         """KOSPI 데이터 조회"""
         try:
             endpoint = "/uapi/domestic-stock/v1/quotations/inquire-index-daily-price"
-            kospi_code = self.index_code_map.get("KOSPI", "00001")
+            kospi_code = self._index_code("KOSPI", "00001")
             
             params = {
                 "FID_COND_MRKT_DIV_CODE": "1",
                 "FID_INPUT_ISCD": kospi_code,
-                "FID_INPUT_DATE": datetime.now().strftime("%Y%m%d"),
+                "FID_INPUT_DATE": KRX.current_or_prev_session().strftime("%Y%m%d"),
                 "FID_INPUT_PRICE": "1",
                 "FID_VOL_CNT": "1"
             }
@@ -250,7 +284,7 @@ class KISClient:
                 }
             else:
                 return {"error": f"KOSPI 조회 실패: {result.get('msg1', 'Unknown error')}"}
-                
+        
         except Exception as e:
             return {"error": str(e)}
     
@@ -258,12 +292,12 @@ class KISClient:
         """KOSDAQ 데이터 조회"""
         try:
             endpoint = "/uapi/domestic-stock/v1/quotations/inquire-index-daily-price"
-            kosdaq_code = self.index_code_map.get("KOSDAQ", "11001")
+            kosdaq_code = self._index_code("KOSDAQ", "11001")
             
             params = {
                 "FID_COND_MRKT_DIV_CODE": "1",
                 "FID_INPUT_ISCD": kosdaq_code,
-                "FID_INPUT_DATE": datetime.now().strftime("%Y%m%d"),
+                "FID_INPUT_DATE": KRX.current_or_prev_session().strftime("%Y%m%d"),
                 "FID_INPUT_PRICE": "1",
                 "FID_VOL_CNT": "1"
             }
@@ -284,7 +318,7 @@ class KISClient:
                 }
             else:
                 return {"error": f"KOSDAQ 조회 실패: {result.get('msg1', 'Unknown error')}"}
-                
+        
         except Exception as e:
             return {"error": str(e)}
     
@@ -317,7 +351,7 @@ class KISClient:
                     return {"error": f"API Error: {result['msg1']}"}
             else:
                 return result
-                
+        
         except Exception as e:
             return {"error": str(e)}
     
@@ -330,14 +364,17 @@ class KISClient:
             
             print(f"✅ KIS 액세스 토큰 발급 성공: {token[:20]}...")
             
-            # 대안 1: 다른 지수 조회 방법 시도
-            kospi_data = self._get_kospi_alternative(token)
+            # 대안 1: 다른 지수 조회 방법 시도 (동시 조회)
+            results = fanout.gather([
+                FetchSpec("kospi", self._get_kospi_alternative, (token,), host=self.base_url),
+                FetchSpec("kosdaq", self._get_kosdaq_alternative, (token,), host=self.base_url),
+                FetchSpec("exchange", self._get_exchange_alternative, (token,), host=self.base_url)
+            ])
+            kospi_data = results["kospi"]
+            kosdaq_data = results["kosdaq"]
+            exchange_data = results["exchange"]
             print(f"🔍 KOSPI 대안 데이터: {kospi_data}")
-            
-            kosdaq_data = self._get_kosdaq_alternative(token)
             print(f"🔍 KOSDAQ 대안 데이터: {kosdaq_data}")
-            
-            exchange_data = self._get_exchange_alternative(token)
             print(f"🔍 환율 대안 데이터: {exchange_data}")
             
             return {
@@ -346,7 +383,7 @@ class KISClient:
                 "exchange": exchange_data,
                 "timestamp": datetime.now().isoformat()
             }
-            
+        
         except Exception as e:
             return {"error": str(e)}
     
@@ -370,7 +407,7 @@ class KISClient:
                 "FID_INPUT_ISCD": "KS11"  # KS11: KOSPI 지수 심볼
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = self.session.get(url, headers=headers, params=params)
             
             if response.status_code == 200:
                 result = response.json()
@@ -388,7 +425,7 @@ class KISClient:
                     return {"error": f"API Error: {result['msg1']}"}
             else:
                 return {"error": f"HTTP Error: {response.status_code}"}
-                
+        
         except Exception as e:
             return {"error": str(e)}
     
@@ -411,7 +448,7 @@ class KISClient:
                 "FID_INPUT_ISCD": "KQ11"  # KQ11: KOSDAQ 지수 심볼
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = self.session.get(url, headers=headers, params=params)
             
             if response.status_code == 200:
                 result = response.json()
@@ -429,7 +466,7 @@ class KISClient:
                     return {"error": f"API Error: {result['msg1']}"}
             else:
                 return {"error": f"HTTP Error: {response.status_code}"}
-                
+        
         except Exception as e:
             return {"error": str(e)}
     
@@ -452,7 +489,7 @@ class KISClient:
                 "FID_INPUT_ISCD": "USDKRW"
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = self.session.get(url, headers=headers, params=params)
             
             if response.status_code == 200:
                 result = response.json()
@@ -469,18 +506,104 @@ class KISClient:
                     return {"error": f"API Error: {result['msg1']}"}
             else:
                 return {"error": f"HTTP Error: {response.status_code}"}
-                
+        
         except Exception as e:
             return {"error": str(e)}
     
+    def get_quotes(self, codes: List[str], token: Optional[str] = None) -> Dict[str, Any]:
+        """여러 종목 현재가 일괄 조회 (관심종목 멀티 시세, 요청당 MULTI_QUOTE_SIZE 종목)
+
+        반환: {종목코드: {"price", "prev_close", "change_rate", "volume"}} - 응답에 없는 종목은 빠짐
+        """
+        unique_codes = list(dict.fromkeys(c for c in codes if c))
+        token = token or self._get_access_token()
+        if not token:
+            return {"error": "Failed to get access token"}
+        
+        chunks = [unique_codes[i:i + self.MULTI_QUOTE_SIZE]
+                  for i in range(0, len(unique_codes), self.MULTI_QUOTE_SIZE)]
+        results = fanout.gather([
+            FetchSpec(f"quotes_{i}", self._get_multi_quote, (token, chunk), host=self.base_url)
+            for i, chunk in enumerate(chunks)
+        ])
+        
+        quotes = {}
+        for data in results.values():
+            if "error" in data:
+                return data
+            quotes.update(data)
+        return quotes
+    
+    def _get_multi_quote(self, token: str, codes: List[str]) -> Dict[str, Any]:
+        """관심종목 멀티 시세 1회 조회"""
+        params = {}
+        for i, code in enumerate(codes, 1):
+            params[f"FID_COND_MRKT_DIV_CODE_{i}"] = "J"
+            params[f"FID_INPUT_ISCD_{i}"] = code
+        
+        result = self._make_authenticated_request(
+            "GET", "/uapi/domestic-stock/v1/quotations/intstock-multprice", token,
+            headers={"tr_id": "FHKST11300006", "custtype": "P"}, params=params
+        )
+        if "error" in result or result.get("rt_cd") != "0":
+            return {"error": f"멀티 시세 조회 실패: {result.get('error') or result.get('msg1', 'Unknown error')}"}
+        
+        quotes = {}
+        for row in result.get("output") or []:
+            try:
+                quotes[row["inter_shrn_iscd"]] = {
+                    "price": float(row.get("inter2_prpr") or 0),
+                    "prev_close": float(row.get("inter2_sdpr") or 0),
+                    "change_rate": float(row.get("prdy_ctrt") or 0),
+                    "volume": int(row.get("acml_vol") or 0)
+                }
+            except (KeyError, ValueError):
+                continue
+        return quotes
+    
     def get_sector_performance(self) -> List[Dict[str, Any]]:
-        """섹터별 성과 조회"""
-        # TODO: 실제 섹터 성과 API 구현
-        # 현재는 샘플 데이터 반환
-        return [
-            {"name": "Information Technology", "ret1d": 1.6, "breadth": 0.74},
-            {"name": "Financials", "ret1d": 1.2, "breadth": 0.68},
-            {"name": "Industrials", "ret1d": 1.1, "breadth": 0.66},
-            {"name": "Utilities", "ret1d": -0.2, "breadth": 0.42},
-            {"name": "Real Estate", "ret1d": 0.1, "breadth": 0.48}
-        ]
+        """섹터별 성과 조회 - 구성 종목 일괄 시세로 가중 수익률/상승 비율 계산 (수익률 내림차순)"""
+        try:
+            universe = get_universe("kr")
+            if not universe:
+                return [{"error": "kr 섹터 구성 종목 설정 없음 (assets/sector_constituents.yml)"}]
+            
+            quotes = self.get_quotes(universe.unique_symbols())
+            if "error" in quotes:
+                return [quotes]
+            
+            sectors = universe.compute(quotes)
+            sectors.sort(key=lambda x: x["ret1d"], reverse=True)
+            return sectors
+        
+        except Exception as e:
+            return [{"error": str(e)}]
+    
+    def get_movers(self, k: int = 5) -> Dict[str, Any]:
+        """유니버스 전체 일괄 시세로 상승/하락 상위 k개 선정 (MOVERS_KR_UNIVERSE, 기본: 섹터 구성 종목)"""
+        codes = load_universe("kr")
+        if codes is None:
+            universe = get_universe("kr")
+            codes = universe.unique_symbols() if universe else []
+        if not codes:
+            return {"error": "특징주 유니버스가 비어 있음"}
+        
+        quotes = self.get_quotes(codes)
+        if "error" in quotes:
+            return quotes
+        return rank_movers(quotes, "kr", k)
+    
+    def get_top_movers(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """상위 변동 종목 조회 - compose_movers_summary 입력 형식 (변동률 절댓값 순)"""
+        try:
+            ranked = self.get_movers(k=limit)
+            if "error" in ranked:
+                return [ranked]
+            
+            movers = merge_movers(ranked, limit)
+            for mover in movers:
+                mover["reason"] = f"{mover['sector']} {'강세' if mover['ret1d'] > 0 else '약세'}"
+            return movers
+        
+        except Exception as e:
+            return [{"error": str(e)}]
@@ -0,0 +1,236 @@
+"""
+KIS 실시간 시세 스트리밍 클라이언트
+WebSocket 접속키 발급 → 지수/주식 체결 TR 구독 → 종목별 최신 체결 테이블 유지 (끊기면 재접속 후 재구독)
+데몬/슬롯은 latest()로 요청 없이 최신 시세를 읽음 (websockets 미설치 시 스트리밍 비활성화)
+"""
+
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..config import config
+from ..net.stream import ReconnectingStream, websockets
+
+REAL_WS_URL = "ws://ops.koreainvestment.com:21000"
+VTS_WS_URL = "ws://ops.koreainvestment.com:31000"
+
+# 세션당 최대 실시간 등록 수 (KIS 제한)
+MAX_SUBSCRIPTIONS = 41
+
+INDEX_TR = "H0UPCNT0"  # 국내 지수 체결 (tr_key: 업종코드 0001=KOSPI, 1001=KOSDAQ)
+STOCK_TR = "H0STCNT0"  # 국내 주식 체결 (tr_key: 종목코드)
+
+# 데몬이 기본으로 구독하는 지수 (naver_data 키 → 업종코드)
+STREAM_INDEX_CODES = {"kospi": "0001", "kosdaq": "1001"}
+
+# TR별 필드 위치 (종목/시각/현재가/부호/전일 대비/등락률/누적 거래량)
+TR_FIELDS = {
+    INDEX_TR: {"symbol": 0, "time": 1, "price": 2, "sign": 3, "change": 4, "volume": 5, "change_rate": 9},
+    STOCK_TR: {"symbol": 0, "time": 1, "price": 2, "sign": 3, "change": 4, "change_rate": 5, "volume": 13},
+}
+
+# 전일 대비 부호 코드 (4: 하한, 5: 하락)
+NEGATIVE_SIGNS = {"4", "5"}
+
+def _signed(value: str, sign: str) -> float:
+    """부호 코드를 반영한 전일 대비 값"""
+    number = abs(float(value or 0))
+    return -number if sign in NEGATIVE_SIGNS else number
+
+def decode_frame(frame: str, received_at: Optional[float] = None) -> List[Dict[str, Any]]:
+    """실시간 데이터 프레임('0|TR_ID|건수|필드^필드...')을 체결 목록으로 변환
+
+    한 프레임에 여러 건이 이어 붙어 오므로 필드 수를 건수로 나눠 자름.
+    암호화 프레임(1|...)과 알 수 없는 TR은 빈 목록.
+    """
+    encrypted, tr_id, count, payload = frame.split("|", 3)
+    spec = TR_FIELDS.get(tr_id)
+    if encrypted != "0" or spec is None:
+        return []
+    
+    parts = payload.split("^")
+    count = max(1, int(count))
+    width = len(parts) // count
+    received_at = received_at or time.time()
+    
+    ticks = []
+    for start in range(0, width * count, width):
+        record = parts[start:start + width]
+        sign = record[spec["sign"]]
+        ticks.append({
+            "tr_id": tr_id,
+            "symbol": record[spec["symbol"]],
+            "time": record[spec["time"]],
+            "price": float(record[spec["price"]]),
+            "change": _signed(record[spec["change"]], sign),
+            "change_rate": _signed(record[spec["change_rate"]], sign),
+            "volume": int(float(record[spec["volume"]] or 0)),
+            "received_at": received_at,
+        })
+    return ticks
+
+class TickTable:
+    """(TR, 종목)별 최신 체결 - 스트림 스레드가 쓰고 다른 스레드가 읽음"""
+    
+    def __init__(self):
+        self._ticks: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def update(self, ticks: List[Dict[str, Any]]):
+        with self._lock:
+            for tick in ticks:
+                self._ticks[(tick["tr_id"], tick["symbol"])] = tick
+    
+    def get(self, symbol: str, tr_id: Optional[str] = None, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """최신 체결 (max_age초보다 오래됐으면 None)"""
+        with self._lock:
+            if tr_id:
+                tick = self._ticks.get((tr_id, symbol))
+            else:
+                tick = next((t for (_, s), t in self._ticks.items() if s == symbol), None)
+        if tick and max_age is not None and time.time() - tick["received_at"] > max_age:
+            return None
+        return dict(tick) if tick else None
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """전체 최신 체결 복사본 ('TR:종목' 키)"""
+        with self._lock:
+            return {f"{tr}:{symbol}": dict(tick) for (tr, symbol), tick in self._ticks.items()}
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._ticks)
+
+class KISStream(ReconnectingStream):
+    """KIS 실시간 WebSocket 클라이언트 (백그라운드 스레드의 asyncio 루프에서 수신)"""
+    
+    label = "KIS 실시간"
+    
+    def __init__(self, url: Optional[str] = None, approval_key: Optional[str] = None,
+                 key_provider: Optional[Callable[[], str]] = None):
+        vts = config.get_kis_vts()
+        super().__init__(url or config.get("KIS_WS_URL", "") or (REAL_WS_URL if vts == "REAL" else VTS_WS_URL),
+                         float(config.get("KIS_STREAM_RECONNECT_MAX_SEC", "30")))
+        self.table = TickTable()
+        self.record_path = config.get("KIS_STREAM_RECORD", "")
+        
+        self._approval_key = approval_key
+        self._key_provider = key_provider
+        self._subscriptions: Dict[Tuple[str, str], None] = {}
+    
+    def _get_approval_key(self) -> str:
+        """접속키 (처음 한 번 발급, 기본 발급자는 KISClient)"""
+        if not self._approval_key:
+            if self._key_provider is None:
+                from .kis import KISClient
+                self._key_provider = KISClient().get_approval_key
+            self._approval_key = self._key_provider()
+        return self._approval_key
+    
+    def _message(self, tr_type: str, tr_id: str, tr_key: str) -> str:
+        """등록(1)/해제(2) 요청 메시지"""
+        return json.dumps({
+            "header": {"approval_key": self._get_approval_key(), "custtype": "P",
+                       "tr_type": tr_type, "content-type": "utf-8"},
+            "body": {"input": {"tr_id": tr_id, "tr_key": tr_key}}
+        })
+    
+    def subscribe(self, tr_id: str, tr_key: str) -> bool:
+        """실시간 등록 (최대 MAX_SUBSCRIPTIONS개)"""
+        key = (tr_id, tr_key)
+        if key in self._subscriptions:
+            return True
+        if len(self._subscriptions) >= MAX_SUBSCRIPTIONS:
+            print(f"⚠️ 실시간 등록 한도({MAX_SUBSCRIPTIONS}) 초과: {tr_id} {tr_key}")
+            return False
+        self._subscriptions[key] = None
+        self._send_threadsafe(self._message("1", tr_id, tr_key))
+        return True
+    
+    def unsubscribe(self, tr_id: str, tr_key: str):
+        """실시간 해제"""
+        if self._subscriptions.pop((tr_id, tr_key), "missing") != "missing":
+            self._send_threadsafe(self._message("2", tr_id, tr_key))
+    
+    def latest(self, symbol: str, tr_id: Optional[str] = None, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """종목 최신 체결 (요청 없음)"""
+        return self.table.get(symbol, tr_id, max_age)
+    
+    def stats(self) -> Dict[str, Any]:
+        """수신 프레임/체결/재접속 횟수와 등록/종목 수"""
+        return dict(super().stats(), subscriptions=len(self._subscriptions), symbols=len(self.table))
+    
+    def handle(self, message: str) -> Optional[str]:
+        """수신 메시지 처리 - 서버에 돌려보낼 응답(PINGPONG)이 있으면 반환"""
+        self._counters["frames"] += 1
+        if message[:1] in ("0", "1"):
+            try:
+                ticks = decode_frame(message)
+            except (ValueError, IndexError) as e:
+                self._counters["errors"] += 1
+                print(f"⚠️ 실시간 프레임 해석 실패: {e}")
+                return None
+            self.table.update(ticks)
+            self._counters["ticks"] += len(ticks)
+            return None
+        
+        try:
+            data = json.loads(message)
+        except ValueError:
+            self._counters["errors"] += 1
+            return None
+        
+        header = data.get("header", {})
+        if header.get("tr_id") == "PINGPONG":
+            return message
+        body = data.get("body", {})
+        if body.get("rt_cd") not in (None, "0"):
+            print(f"⚠️ 실시간 등록 실패 {header.get('tr_id')} {header.get('tr_key')}: {body.get('msg1')}")
+        return None
+    
+    async def _session(self):
+        """접속 1회 - 등록된 TR을 모두 다시 등록하고 연결이 끊길 때까지 수신"""
+        record = open(self.record_path, "a", encoding="utf-8") if self.record_path else None
+        try:
+            async with websockets.connect(self.url, ping_interval=None, max_size=None) as ws:
+                self._ws = ws
+                for tr_id, tr_key in list(self._subscriptions):
+                    await ws.send(self._message("1", tr_id, tr_key))
+                self._connected.set()
+                print(f"📡 KIS 실시간 연결: {self.url} ({len(self._subscriptions)}개 등록)")
+                
+                async for message in ws:
+                    if isinstance(message, bytes):
+                        message = message.decode("utf-8", errors="replace")
+                    if record:
+                        record.write(message + "\n")
+                    reply = self.handle(message)
+                    if reply:
+                        await ws.send(reply)
+                    if self._stop.is_set():
+                        break
+        finally:
+            if record:
+                record.close()
+    
+    def _prepare(self) -> bool:
+        """접속키는 호출 스레드에서 미리 발급 (실패 시 시작하지 않음)"""
+        return bool(self._get_approval_key())
+
+# 전역 스트림 인스턴스 (데몬에서 시작, 슬롯은 latest()로 조회)
+kis_stream = KISStream()
+
+def start_from_config() -> bool:
+    """KIS_STREAM=true면 지수(KOSPI/KOSDAQ)와 KIS_STREAM_SYMBOLS 종목을 구독하고 수신 시작"""
+    if config.get("KIS_STREAM", "false").lower() != "true":
+        return False
+    if not config.get_kis_app_key():
+        print("⚠️ KIS 키 없음 - 실시간 스트리밍 생략")
+        return False
+    
+    for code in STREAM_INDEX_CODES.values():
+        kis_stream.subscribe(INDEX_TR, code)
+    for code in filter(None, (s.strip() for s in config.get("KIS_STREAM_SYMBOLS", "").split(","))):
+        kis_stream.subscribe(STOCK_TR, code)
+    return kis_stream.start()
@@ -0,0 +1,65 @@
+"""
+KIS 액세스 토큰 디스크 캐시
+크론으로 실행되는 슬롯 프로세스끼리 토큰을 공유 (파일 잠금, 원자적 쓰기, 0600 권한)
+"""
+
+import hashlib
+import time
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+from ..config import config
+from ..storage.files import cache_dir, file_lock, read_json, atomic_write_json
+
+# 만료 직전 토큰은 재발급 (초)
+DEFAULT_REFRESH_MARGIN = 600
+
+class KISTokenStore:
+    def __init__(self, path: Optional[str] = None, refresh_margin: Optional[int] = None):
+        self.path = Path(path or config.get("KIS_TOKEN_CACHE", "") or cache_dir() / "kis_token.json")
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.refresh_margin = refresh_margin if refresh_margin is not None else int(
+            config.get("KIS_TOKEN_REFRESH_MARGIN", str(DEFAULT_REFRESH_MARGIN))
+        )
+    
+    def _key(self, app_key: str, base_url: str) -> str:
+        """앱키 + 도메인(실전/모의) 조합 키 (앱키 원문은 저장하지 않음)"""
+        return hashlib.sha256(f"{app_key}|{base_url}".encode("utf-8")).hexdigest()[:32]
+    
+    def load(self, app_key: str, base_url: str) -> Optional[Tuple[str, float]]:
+        """유효한 캐시 토큰 반환 (토큰, 만료 epoch) - 만료 임박 시 None"""
+        entry = read_json(self.path).get(self._key(app_key, base_url))
+        if not entry:
+            return None
+        
+        if entry.get("expires_at", 0) - self.refresh_margin <= time.time():
+            return None
+        
+        return entry["access_token"], entry["expires_at"]
+    
+    def save(self, app_key: str, base_url: str, token: str, expires_at: float):
+        """토큰 저장 (만료된 다른 항목은 정리)"""
+        now = time.time()
+        entries = {k: v for k, v in read_json(self.path).items() if v.get("expires_at", 0) > now}
+        entries[self._key(app_key, base_url)] = {
+            "access_token": token,
+            "expires_at": expires_at,
+            "issued_at": now
+        }
+        atomic_write_json(self.path, entries)
+    
+    def get_or_issue(self, app_key: str, base_url: str,
+                     issue: Callable[[], Tuple[str, Optional[float]]]) -> Tuple[str, Optional[float]]:
+        """캐시된 토큰 반환, 없으면 잠금 안에서 한 번만 발급"""
+        with file_lock(self.lock_path):
+            cached = self.load(app_key, base_url)
+            if cached:
+                return cached
+            
+            token, expires_at = issue()
+            if token and expires_at:
+                try:
+                    self.save(app_key, base_url, token, expires_at)
+                except Exception as e:
+                    print(f"⚠️ KIS 토큰 캐시 저장 실패: {e}")
+            return token, expires_at
@@ -0,0 +1,286 @@
+"""
+KIS 마스터 파일(.mst) 컴파일 테이블
+고정폭 마스터 파일을 키 정렬 바이너리 테이블로 컴파일하고 mmap + 이진 탐색으로 조회
+(원본 mtime/크기/해시가 바뀌면 자동 재컴파일)
+사용법: python -m market_automation.datasource.mst <mst 파일> [조회 키/이름 ...]
+"""
+
+import argparse
+import bisect
+import hashlib
+import mmap
+import struct
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..storage.files import cache_dir, file_lock, atomic_write_bytes
+
+@dataclass(frozen=True)
+class MstLayout:
+    """고정폭 마스터 파일 레코드 레이아웃 (필드 폭은 바이트 단위)"""
+    name: str
+    fields: Tuple[Tuple[str, int], ...]
+    key_fields: Tuple[str, ...]   # 이어 붙여 정렬/조회 키로 사용할 필드
+    name_field: str               # 이름 역조회 인덱스를 만들 필드
+    encoding: str = "cp949"
+    
+    @property
+    def record_size(self) -> int:
+        return sum(width for _, width in self.fields)
+    
+    def offset(self, field: str) -> Tuple[int, int]:
+        """필드의 (레코드 내 시작 위치, 폭)"""
+        start = 0
+        for name, width in self.fields:
+            if name == field:
+                return start, width
+            start += width
+        raise KeyError(field)
+    
+    @property
+    def signature(self) -> bytes:
+        """레이아웃이 바뀌면 컴파일 파일도 무효화되도록 하는 서명"""
+        return hashlib.sha256(repr(self).encode("utf-8")).digest()[:16]
+
+# idxcode.mst: 구분(1) + 업종코드(4) + 업종명(40)
+# 키는 기존 fid_input_iscd 형식과 같은 앞 5자리 (예: 00001 = 종합)
+IDXCODE_LAYOUT = MstLayout(
+    name="idxcode",
+    fields=(("division", 1), ("code", 4), ("name", 40)),
+    key_fields=("division", "code"),
+    name_field="name",
+)
+
+# 헤더: 매직, 버전, 레코드 크기, 레코드 수, 원본 mtime_ns, 원본 크기, 원본 sha256, 레이아웃 서명
+HEADER = struct.Struct("<4sHHIqq32s16s")
+MAGIC = b"MSTC"
+VERSION = 1
+STAT_OFFSET = struct.calcsize("<4sHHI")  # 원본 mtime_ns/크기 위치 (재서명용)
+STAT = struct.Struct("<qq")
+INDEX_ITEM = struct.Struct("<I")
+
+def _file_sha256(path: Path) -> bytes:
+    """원본 파일 sha256"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+def parse_records(data: bytes, layout: MstLayout) -> List[bytes]:
+    """원본 바이트를 레이아웃 크기의 고정폭 레코드 목록으로 변환"""
+    size = layout.record_size
+    records = []
+    for line in data.splitlines():
+        if not line.strip():
+            continue
+        # 짧은 줄은 공백으로 채우고 긴 줄은 레이아웃 크기로 자름
+        records.append(line[:size].ljust(size, b" "))
+    return records
+
+def compile_mst(source: Path, layout: MstLayout) -> bytes:
+    """마스터 파일을 컴파일 테이블 바이트로 변환"""
+    raw = source.read_bytes()
+    stat = source.stat()
+    key_start, key_width = _key_span(layout)
+    name_start, name_width = layout.offset(layout.name_field)
+    
+    # 키 기준 정렬 (중복 키는 원본 순서상 첫 레코드만 유지)
+    by_key: Dict[bytes, bytes] = {}
+    for record in parse_records(raw, layout):
+        by_key.setdefault(record[key_start:key_start + key_width], record)
+    records = [by_key[key] for key in sorted(by_key)]
+    
+    # 이름 역조회 인덱스: (이름, 키) 순으로 정렬된 레코드 번호
+    name_index = sorted(
+        range(len(records)),
+        key=lambda i: (records[i][name_start:name_start + name_width].rstrip(b" "), records[i][key_start:key_start + key_width])
+    )
+    
+    header = HEADER.pack(MAGIC, VERSION, layout.record_size, len(records),
+                         stat.st_mtime_ns, stat.st_size, hashlib.sha256(raw).digest(), layout.signature)
+    return header + b"".join(records) + b"".join(INDEX_ITEM.pack(i) for i in name_index)
+
+def _key_span(layout: MstLayout) -> Tuple[int, int]:
+    """키 필드들의 (시작 위치, 전체 폭) - 키 필드는 레이아웃상 연속이어야 함"""
+    start, _ = layout.offset(layout.key_fields[0])
+    width = sum(layout.offset(field)[1] for field in layout.key_fields)
+    return start, width
+
+class _FieldView:
+    """mmap된 레코드 영역의 특정 필드를 bisect용 시퀀스로 노출"""
+    
+    def __init__(self, table: "MstTable", start: int, width: int, by_name: bool = False):
+        self.table = table
+        self.start = start
+        self.width = width
+        self.by_name = by_name  # True면 이름 인덱스 순서, False면 레코드(키) 순서
+    
+    def __len__(self) -> int:
+        return self.table.count
+    
+    def __getitem__(self, i: int) -> bytes:
+        if self.by_name:
+            i = self.table._index_at(i)
+        base = self.table.records_offset + i * self.table.record_size + self.start
+        return self.table.mm[base:base + self.width].rstrip(b" ")
+
+class MstTable:
+    """mmap 기반 컴파일 마스터 테이블 (읽기 전용)"""
+    
+    def __init__(self, path: Path, layout: MstLayout):
+        self.path = Path(path)
+        self.layout = layout
+        
+        with open(self.path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        magic, version, self.record_size, self.count, self.source_mtime_ns, self.source_size, \
+            self.source_sha256, signature = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != VERSION or signature != layout.signature:
+            self.mm.close()
+            raise ValueError(f"호환되지 않는 컴파일 테이블: {self.path}")
+        
+        self.records_offset = HEADER.size
+        self.index_offset = self.records_offset + self.count * self.record_size
+        
+        key_start, key_width = _key_span(layout)
+        name_start, name_width = layout.offset(layout.name_field)
+        self._keys = _FieldView(self, key_start, key_width)
+        self._names = _FieldView(self, name_start, name_width, by_name=True)
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+    
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        for i in range(self.count):
+            yield self._record(i)
+    
+    def _index_at(self, i: int) -> int:
+        """이름 인덱스의 i번째 레코드 번호"""
+        return INDEX_ITEM.unpack_from(self.mm, self.index_offset + i * INDEX_ITEM.size)[0]
+    
+    def _record(self, i: int) -> Dict[str, str]:
+        """i번째 레코드를 필드 딕셔너리로 디코딩 (key 포함)"""
+        base = self.records_offset + i * self.record_size
+        raw = self.mm[base:base + self.record_size]
+        record = {}
+        start = 0
+        for field, width in self.layout.fields:
+            record[field] = raw[start:start + width].decode(self.layout.encoding, errors="replace").strip()
+            start += width
+        record["key"] = "".join(record[field] for field in self.layout.key_fields)
+        return record
+    
+    def _encode(self, value: str) -> bytes:
+        return value.encode(self.layout.encoding, errors="replace")
+    
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        """키(예: 00001)로 레코드 조회"""
+        target = self._encode(key)
+        i = bisect.bisect_left(self._keys, target)
+        if i < self.count and self._keys[i] == target:
+            return self._record(i)
+        return None
+    
+    def find_all(self, name: str) -> List[Dict[str, str]]:
+        """이름으로 레코드 조회 (같은 이름이 여러 개면 키 순)"""
+        target = self._encode(name)
+        i = bisect.bisect_left(self._names, target)
+        matches = []
+        while i < self.count and self._names[i] == target:
+            matches.append(self._record(self._index_at(i)))
+            i += 1
+        return matches
+    
+    def find(self, name: str) -> Optional[Dict[str, str]]:
+        """이름으로 첫 레코드 조회"""
+        matches = self.find_all(name)
+        return matches[0] if matches else None
+    
+    def close(self):
+        self.mm.close()
+
+def compiled_path(source: Path, layout: MstLayout) -> Path:
+    """원본 파일별 컴파일 테이블 경로 (캐시 디렉토리)"""
+    tag = hashlib.sha256(str(Path(source).resolve()).encode("utf-8")).hexdigest()[:8]
+    return cache_dir() / f"{Path(source).stem}.{layout.name}.{tag}.mstc"
+
+def _is_fresh(source: Path, target: Path, layout: MstLayout) -> bool:
+    """컴파일 테이블이 원본과 일치하는지 확인 (stat이 달라도 내용이 같으면 재서명)"""
+    try:
+        with open(target, "rb") as f:
+            header = f.read(HEADER.size)
+        magic, version, _, _, mtime_ns, size, sha256, signature = HEADER.unpack(header)
+    except (OSError, struct.error):
+        return False
+    
+    if magic != MAGIC or version != VERSION or signature != layout.signature:
+        return False
+    
+    stat = source.stat()
+    if (stat.st_mtime_ns, stat.st_size) == (mtime_ns, size):
+        return True
+    
+    # mtime만 바뀐 경우(체크아웃, 복사 등)는 해시로 확인 후 헤더 stat만 갱신
+    if stat.st_size == size and _file_sha256(source) == sha256:
+        data = bytearray(target.read_bytes())
+        STAT.pack_into(data, STAT_OFFSET, stat.st_mtime_ns, stat.st_size)
+        atomic_write_bytes(target, bytes(data))
+        return True
+    
+    return False
+
+def build(source: Path, layout: MstLayout, target: Optional[Path] = None) -> Path:
+    """필요 시 마스터 파일을 컴파일하고 테이블 경로 반환"""
+    source = Path(source)
+    target = Path(target or compiled_path(source, layout))
+    
+    with file_lock(target.with_name(target.name + ".lock")):
+        if not _is_fresh(source, target, layout):
+            atomic_write_bytes(target, compile_mst(source, layout))
+            print(f"🔨 마스터 파일 컴파일: {source.name} → {target}")
+    
+    return target
+
+_tables: Dict[Tuple[str, str], Tuple[int, MstTable]] = {}
+_tables_lock = threading.Lock()
+
+def load_table(source: Path, layout: MstLayout = IDXCODE_LAYOUT) -> MstTable:
+    """컴파일 테이블을 열어 반환 (프로세스 내 공유, 원본 변경 시 다시 엶)"""
+    source = Path(source)
+    cache_key = (str(source.resolve()), layout.name)
+    mtime_ns = source.stat().st_mtime_ns
+    
+    with _tables_lock:
+        cached = _tables.get(cache_key)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        
+        table = MstTable(build(source, layout), layout)
+        _tables[cache_key] = (mtime_ns, table)
+        return table
+
+def main():
+    """메인 함수 - 컴파일 후 키/이름 조회"""
+    parser = argparse.ArgumentParser(description="KIS 마스터 파일 컴파일/조회")
+    parser.add_argument("source", help="마스터 파일 경로 (예: idxcode.mst)")
+    parser.add_argument("queries", nargs="*", help="조회할 키 또는 이름")
+    args = parser.parse_args()
+    
+    table = load_table(Path(args.source))
+    print(f"✅ {args.source}: {len(table)}개 레코드 ({table.path})")
+    for query in args.queries:
+        matches = [table.get(query)] if query in table else table.find_all(query)
+        if not matches:
+            print(f"❌ {query}: 없음")
+        for record in matches:
+            print(f"📊 {query}: {record}")
+
+if __name__ == "__main__":
+    main()
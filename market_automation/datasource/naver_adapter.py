@@ -3,16 +3,58 @@
 """
 
 import json
+import math
 import os
+import time
 from datetime import datetime
 from typing import Dict, Any, Optional
 from pathlib import Path
 
+from ..storage.timeseries import timeseries, NAVER_WORLD_SYMBOLS
+from ..trading_calendar import last_us_session
+
+# us_wrap 필드 → 네이버 세계지수 키
+US_WRAP_FIELDS = {"spx_pct": "sp500", "ndx_pct": "nasdaq", "djia_pct": "dow"}
+
 class NaverDataAdapter:
     """네이버 금융 데이터를 기존 시스템 형식으로 변환"""
     
     def __init__(self):
         self.data_file = Path(__file__).parent.parent.parent / "naver_market_data.json"
+        # 저장소의 미국 지수 스냅샷을 us_wrap으로 쓸 수 있는 최대 경과 시간
+        self.us_wrap_max_age = 36 * 3600
+    
+    def _us_wrap(self, naver_data: Dict[str, Any]) -> Dict[str, float]:
+        """전일 미국 지수 등락률 - 세션 종가 캐시 → 수집 데이터 → 시계열 저장소 최신 스냅샷 순"""
+        world = naver_data.get("world") or {}
+        us_wrap = {field: 0.0 for field in US_WRAP_FIELDS}
+        missing = {}
+        
+        closes = {}
+        try:
+            closes = timeseries.daily_closes(list(NAVER_WORLD_SYMBOLS.values()), last_us_session())
+        except Exception as e:
+            print(f"⚠️ 세션 종가 캐시 조회 실패: {e}")
+        
+        for field, key in US_WRAP_FIELDS.items():
+            cached = closes.get(NAVER_WORLD_SYMBOLS[key])
+            if cached and cached["change_rate"] is not None:
+                us_wrap[field] = float(cached["change_rate"])
+            elif key in world and "change_rate" in world[key]:
+                us_wrap[field] = world[key]["change_rate"]
+            else:
+                missing[NAVER_WORLD_SYMBOLS[key]] = field
+        
+        if missing:
+            try:
+                for row in timeseries.latest("index", list(missing)):
+                    if time.time() - row["ts"] <= self.us_wrap_max_age and not math.isnan(row["change_rate"]):
+                        us_wrap[missing[row["symbol"]]] = float(row["change_rate"])
+                        print(f"🗃️ {row['symbol']} 등락률 저장소 사용: {row['change_rate']:+.2f}%")
+            except Exception as e:
+                print(f"⚠️ 시계열 저장소 조회 실패: {e}")
+        
+        return us_wrap
     
     def load_naver_data(self) -> Optional[Dict[str, Any]]:
         """네이버 데이터 파일 로드"""
@@ -38,11 +80,7 @@ class NaverDataAdapter:
             # 기존 시스템에서 요구하는 구조로 변환
             converted_data = {
                 "date": current_date,
-                "us_wrap": {
-                    "spx_pct": 0.0,  # 전일 미증시 데이터는 별도 필요
-                    "ndx_pct": 0.0,
-                    "djia_pct": 0.0
-                },
+                "us_wrap": self._us_wrap(naver_data),
                 "futures": {
                     "k200f": 0.0,    # 선물 데이터는 별도 필요
                     "es": 0.0,
@@ -239,11 +277,7 @@ class NaverDataAdapter:
             
             converted_data = {
                 "date": current_date,
-                "us_wrap": {
-                    "spx_pct": 0.0,
-                    "ndx_pct": 0.0,
-                    "djia_pct": 0.0
-                },
+                "us_wrap": self._us_wrap(naver_data),
                 "futures": {
                     "es": 0.0,
                     "nq": 0.0,
@@ -259,19 +293,6 @@ class NaverDataAdapter:
                 "risks": ["글로벌 경제 불확실성", "원자재 가격 변동성"]
             }
             
-            # 전일 미국 지수 데이터 업데이트
-            if "world" in naver_data:
-                world = naver_data["world"]
-                
-                if "sp500" in world:
-                    converted_data["us_wrap"]["spx_pct"] = world["sp500"]["change_rate"]
-                
-                if "nasdaq" in world:
-                    converted_data["us_wrap"]["ndx_pct"] = world["nasdaq"]["change_rate"]
-                
-                if "dow" in world:
-                    converted_data["us_wrap"]["djia_pct"] = world["dow"]["change_rate"]
-            
             print(f"✅ 미국 개장 전 형식으로 변환 완료")
             return converted_data
             
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+HTTP 기록/재생(카세트) 모듈
+공용 세션 아래의 전송 어댑터로 요청/응답 쌍을 gzip JSON Lines 카세트 파일에 기록하고, 네트워크 없이 그대로 재생
+키/토큰(appkey, appsecret, Bearer, access_token 등)은 기록 전에 가림 - 재생 지연은 기록된 응답 시간 또는 고정값
+OpenAI SDK(httpx)용 전송도 제공 (http_client())
+사용법: python -m market_automation.net.cassette [이름]  (카세트 항목을 호스트/경로별로 요약)
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import threading
+import time
+from datetime import timedelta
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from ..config import config
+
+# 값을 가리는 헤더/쿼리/JSON 키 (소문자)
+SECRET_KEYS = {
+    "authorization", "appkey", "appsecret", "secretkey", "approval_key", "access_token", "refresh_token",
+    "apca-api-key-id", "apca-api-secret-key", "api_key", "apikey", "client_secret", "cookie", "set-cookie",
+}
+REDACTED = "REDACTED"
+
+# 요청 매칭에 쓰는 헤더 (KIS는 같은 경로라도 tr_id로 API가 갈림)
+KEY_HEADERS = ("tr_id",)
+
+# 기록/재생에서 빼는 요청 헤더 - 조건부 요청을 빼야 304 대신 본문이 기록되고 캐시 없는 환경에서도 재생됨
+DROP_REQUEST_HEADERS = ("If-None-Match", "If-Modified-Since")
+
+# 보관하는 응답 헤더 (본문은 디코딩된 상태로 저장하므로 전송 인코딩/길이는 버림)
+KEEP_RESPONSE_HEADERS = ("content-type", "cache-control", "etag", "last-modified", "date", "retry-after")
+
+DEFAULT_DIR = Path(__file__).resolve().parent.parent.parent / "samples" / "cassettes"
+
+class CassetteMiss(requests.RequestException):
+    """재생 모드에서 카세트에 없는 요청 - 연결 오류가 아니므로 재시도하지 않고 서킷 브레이커에도 기록하지 않음"""
+
+def _redact_url(url: str) -> str:
+    parsed = urlparse(url)
+    query = sorted((k, REDACTED if k.lower() in SECRET_KEYS else v) for k, v in parse_qsl(parsed.query, keep_blank_values=True))
+    return urlunparse(parsed._replace(query=urlencode(query)))
+
+def _redact_json(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: REDACTED if k.lower() in SECRET_KEYS else _redact_json(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_redact_json(v) for v in value]
+    return value
+
+def _redact_body(body: Optional[bytes]) -> Optional[bytes]:
+    """요청/응답 본문 - JSON이면 비밀 키 값을 가림 (그 외 형식은 그대로)"""
+    if not body:
+        return body
+    try:
+        return json.dumps(_redact_json(json.loads(body)), ensure_ascii=False, sort_keys=True).encode("utf-8")
+    except (ValueError, UnicodeDecodeError):
+        return body
+
+def _encode_body(body: Optional[bytes]) -> Dict[str, str]:
+    if not body:
+        return {}
+    try:
+        return {"body": body.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"body_b64": base64.b64encode(body).decode("ascii")}
+
+def _decode_body(entry: Dict[str, Any]) -> bytes:
+    if "body_b64" in entry:
+        return base64.b64decode(entry["body_b64"])
+    return entry.get("body", "").encode("utf-8")
+
+class Cassette:
+    """카세트 파일 하나 - 요청 키별 응답 목록 (같은 요청은 기록 순서대로 재생하고 마지막 응답을 반복)"""
+    
+    def __init__(self, mode: Optional[str] = None, name: Optional[str] = None, directory: Optional[str] = None,
+                 latency: Optional[str] = None):
+        # 설정값은 첫 사용 때 읽음 (import 시 .env 로드 방지)
+        self._options = {"mode": mode, "name": name, "directory": directory, "latency": latency}
+        
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[Tuple, List[Dict[str, Any]]]] = None
+        self._by_path: Dict[Tuple, List[Dict[str, Any]]] = {}
+        self._cursor: Dict[Tuple, int] = {}
+        self._counters = {"recorded": 0, "replayed": 0, "loose": 0, "misses": 0}
+    
+    @cached_property
+    def mode(self) -> str:
+        """record | replay | "" (off)"""
+        mode = self._options["mode"]
+        mode = (mode if mode is not None else config.get("HTTP_CASSETTE", "off")).lower()
+        return mode if mode in ("record", "replay") else ""
+    
+    @cached_property
+    def name(self) -> str:
+        return self._options["name"] or config.get("HTTP_CASSETTE_NAME", "default")
+    
+    @cached_property
+    def directory(self) -> Path:
+        return Path(self._options["directory"] or config.get("HTTP_CASSETTE_DIR", "") or DEFAULT_DIR)
+    
+    @cached_property
+    def latency(self) -> str:
+        """recorded: 기록된 응답 시간만큼 대기, 숫자: 고정 지연(ms), 0: 지연 없음"""
+        latency = self._options["latency"]
+        return (latency if latency is not None else config.get("HTTP_CASSETTE_LATENCY_MS", "recorded")).lower()
+    
+    @property
+    def path(self) -> Path:
+        return self.directory / f"{self.name}.jsonl.gz"
+    
+    def key(self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes]) -> Tuple:
+        """요청 키 - 메서드, 가린 URL(쿼리 정렬), 매칭 헤더, 가린 본문 해시"""
+        lowered = {k.lower(): v for k, v in (headers or {}).items()}
+        digest = hashlib.sha256(_redact_body(body)).hexdigest()[:16] if body else ""
+        return (method.upper(), _redact_url(url), tuple(lowered.get(h, "") for h in KEY_HEADERS), digest)
+    
+    def _path_key(self, key: Tuple) -> Tuple:
+        """느슨한 키 - 메서드 + 쿼리 없는 URL + 매칭 헤더 (날짜 파라미터가 바뀐 요청도 재생)"""
+        parsed = urlparse(key[1])
+        return (key[0], f"{parsed.scheme}://{parsed.netloc}{parsed.path}", key[2])
+    
+    def _load(self) -> Dict[Tuple, List[Dict[str, Any]]]:
+        if self._entries is not None:
+            return self._entries
+        self._entries = {}
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        key = tuple(entry["key"][:2]) + (tuple(entry["key"][2]), entry["key"][3])
+                        self._entries.setdefault(key, []).append(entry)
+                        self._by_path.setdefault(self._path_key(key), []).append(entry)
+        except FileNotFoundError:
+            print(f"⚠️ 카세트 없음: {self.path}")
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 카세트 읽기 실패 ({self.path}): {e}")
+        return self._entries
+    
+    def lookup(self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes]) -> Dict[str, Any]:
+        """재생할 응답 항목 - 정확히 같은 요청 우선, 없으면 같은 경로의 기록, 둘 다 없으면 CassetteMiss"""
+        key = self.key(method, url, headers, body)
+        with self._lock:
+            entries = self._load()
+            candidates, cursor_key = entries.get(key), key
+            if not candidates:
+                cursor_key = self._path_key(key)
+                candidates = self._by_path.get(cursor_key)
+                if candidates:
+                    self._counters["loose"] += 1
+            if not candidates:
+                self._counters["misses"] += 1
+                raise CassetteMiss(f"카세트 '{self.name}'에 없는 요청: {key[0]} {key[1]}")
+            index = self._cursor.get(cursor_key, 0)
+            self._cursor[cursor_key] = index + 1
+            self._counters["replayed"] += 1
+            entry = candidates[min(index, len(candidates) - 1)]
+        
+        delay = entry.get("elapsed_ms", 0) / 1000 if self.latency == "recorded" else float(self.latency or 0) / 1000
+        if delay > 0:
+            time.sleep(delay)
+        return entry
+    
+    def record(self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes], status: int,
+               reason: str, response_headers: Dict[str, str], content: bytes, elapsed_ms: float):
+        """요청/응답 한 쌍을 가려서 카세트에 추가 (항목마다 gzip 멤버로 덧붙여 중간에 종료돼도 보존)"""
+        entry = {
+            "key": list(self.key(method, url, headers, body)),
+            "request_headers": {k: REDACTED if k.lower() in SECRET_KEYS else v for k, v in (headers or {}).items()},
+            "status": status,
+            "reason": reason,
+            "headers": {k: v for k, v in response_headers.items() if k.lower() in KEEP_RESPONSE_HEADERS},
+            "elapsed_ms": round(elapsed_ms, 1),
+            **_encode_body(_redact_body(content)),
+        }
+        line = (json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "ab") as f:
+                f.write(gzip.compress(line))
+            self._counters["recorded"] += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """기록/재생/느슨한 매칭/누락 횟수"""
+        with self._lock:
+            return dict(self._counters, mode=self.mode or "off", path=str(self.path))
+
+class CassetteAdapter(HTTPAdapter):
+    """requests 전송 어댑터 - 기록 모드는 실제 요청 후 기록, 재생 모드는 네트워크 없이 카세트 응답 반환"""
+    
+    def __init__(self, cassette: "Cassette", **kwargs):
+        self.cassette = cassette
+        super().__init__(**kwargs)
+    
+    def send(self, request, **kwargs):
+        for name in DROP_REQUEST_HEADERS:
+            request.headers.pop(name, None)
+        body = request.body.encode("utf-8") if isinstance(request.body, str) else request.body
+        
+        if self.cassette.mode == "replay":
+            entry = self.cassette.lookup(request.method, request.url, request.headers, body)
+            response = requests.Response()
+            response.status_code = entry["status"]
+            response.reason = entry.get("reason", "")
+            response.headers = CaseInsensitiveDict(entry.get("headers", {}))
+            response._content = _decode_body(entry)
+            response.encoding = get_encoding_from_headers(response.headers)
+            response.url = request.url
+            response.request = request
+            response.connection = self
+            response.elapsed = timedelta(milliseconds=entry.get("elapsed_ms", 0))
+            return response
+        
+        started = time.perf_counter()
+        response = super().send(request, **kwargs)
+        content = response.content
+        self.cassette.record(request.method, request.url, request.headers, body, response.status_code,
+                             response.reason or "", response.headers, content, (time.perf_counter() - started) * 1000)
+        return response
+
+def http_client():
+    """httpx 기반 SDK(OpenAI)에 넘길 카세트 클라이언트 - 기록/재생 모드가 아니면 None (SDK 기본 클라이언트 사용)"""
+    if not cassette.mode:
+        return None
+    import httpx
+    
+    class CassetteTransport(httpx.BaseTransport):
+        def __init__(self):
+            self._inner = httpx.HTTPTransport() if cassette.mode == "record" else None
+        
+        def handle_request(self, request):
+            body = request.read()
+            if self._inner is None:
+                entry = cassette.lookup(request.method, str(request.url), dict(request.headers), body)
+                return httpx.Response(entry["status"], headers=entry.get("headers", {}), content=_decode_body(entry),
+                                      request=request)
+            
+            started = time.perf_counter()
+            response = self._inner.handle_request(request)
+            content = response.read()
+            cassette.record(request.method, str(request.url), dict(request.headers), body, response.status_code,
+                            response.reason_phrase, dict(response.headers), content, (time.perf_counter() - started) * 1000)
+            headers = [(k, v) for k, v in response.headers.items()
+                       if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")]
+            return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+        
+        def close(self):
+            if self._inner is not None:
+                self._inner.close()
+    
+    return httpx.Client(transport=CassetteTransport())
+
+# 전역 카세트 (HTTP_CASSETTE=record|replay일 때 공용 세션이 사용)
+cassette = Cassette()
+
+def main():
+    """메인 함수"""
+    import argparse
+    from collections import Counter
+    
+    parser = argparse.ArgumentParser(description="HTTP 카세트 요약")
+    parser.add_argument("name", nargs="?", help="카세트 이름 (기본: HTTP_CASSETTE_NAME)")
+    args = parser.parse_args()
+    
+    target = Cassette(mode="replay", name=args.name or cassette.name)
+    entries = target._load()
+    if not entries:
+        return
+    counts = Counter()
+    for key, items in entries.items():
+        counts[target._path_key(key)[:2]] += len(items)
+    print(f"📼 {target.path} ({target.path.stat().st_size:,}B, {sum(counts.values())}건)")
+    for (method, url), count in sorted(counts.items(), key=lambda item: item[0][1]):
+        print(f"{count:>5}  {method:<6} {url}")
+
+if __name__ == "__main__":
+    main()
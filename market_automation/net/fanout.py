@@ -0,0 +1,250 @@
+"""
+병렬 데이터 수집 모듈
+서로 독립적인 요청을 동시에 실행하고 호스트별 동시 요청 수를 제한
+"""
+
+import contextvars
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+from ..config import config
+
+# 호스트별 기본 동시 요청 수 (KIS는 초당 호출 제한이 엄격함)
+# 네이버: 메인/세계지수/섹터 3페이지 + 특징주 헤지 후보 3페이지가 한 번에 겹칠 수 있음
+DEFAULT_HOST_LIMITS = {
+    "openapi.koreainvestment.com": 2,
+    "openapivts.koreainvestment.com": 1,
+    "finance.naver.com": 6,
+}
+
+# 헤지 요청 기본 지연(ms) - 앞 후보가 이 시간 안에 응답하지 않거나 실패할 때만 다음 후보를 띄움
+DEFAULT_HEDGE_DELAY_MS = 500
+
+@dataclass
+class FetchSpec:
+    """병렬 실행할 수집 작업 명세"""
+    name: str
+    func: Callable[..., Any]
+    args: tuple = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    host: str = ""  # 동시성 제한 키 (URL 또는 호스트명, 빈 값이면 제한 없음)
+
+def host_of(url_or_host: str) -> str:
+    """URL 또는 호스트명에서 호스트 추출"""
+    if "://" in url_or_host:
+        return urlparse(url_or_host).hostname or ""
+    return url_or_host
+
+class FanoutExecutor:
+    """FetchSpec 목록을 스레드 풀에서 동시에 실행"""
+    
+    def __init__(self, max_workers: Optional[int] = None, per_host_limit: Optional[int] = None):
+        # 설정값은 첫 사용 때 읽음 (import 시 .env 로드 방지)
+        self._max_workers = max_workers
+        self._per_host_limit = per_host_limit
+        
+        self._semaphores: Dict[str, threading.Semaphore] = {}
+        self._hedge_stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+    
+    @cached_property
+    def max_workers(self) -> int:
+        return self._max_workers or int(config.get("FANOUT_MAX_WORKERS", "8"))
+    
+    @cached_property
+    def per_host_limit(self) -> int:
+        return self._per_host_limit or int(config.get("FANOUT_PER_HOST", "4"))
+    
+    @cached_property
+    def host_limits(self) -> Dict[str, int]:
+        return {**DEFAULT_HOST_LIMITS, **self._parse_host_limits(config.get("FANOUT_HOST_LIMITS", ""))}
+    
+    @cached_property
+    def hedge_delay(self) -> float:
+        """헤지 요청: 다음 후보를 띄우기 전 대기 시간(초)"""
+        return float(config.get("FANOUT_HEDGE_DELAY_MS", str(DEFAULT_HEDGE_DELAY_MS))) / 1000
+    
+    def _parse_host_limits(self, value: str) -> Dict[str, int]:
+        """'host=n,host=n' 형식의 설정값 파싱"""
+        limits = {}
+        for item in value.split(","):
+            if "=" in item:
+                host, limit = item.split("=", 1)
+                try:
+                    limits[host.strip()] = int(limit)
+                except ValueError:
+                    print(f"⚠️ 잘못된 FANOUT_HOST_LIMITS 항목 무시: {item}")
+        return limits
+    
+    def _semaphore_for(self, host: str) -> Optional[threading.Semaphore]:
+        """호스트별 세마포어 반환 (호스트 미지정 시 None)"""
+        if not host:
+            return None
+        
+        with self._lock:
+            if host not in self._semaphores:
+                limit = self.host_limits.get(host, self.per_host_limit)
+                self._semaphores[host] = threading.Semaphore(limit)
+            return self._semaphores[host]
+    
+    def _run(self, spec: FetchSpec) -> Any:
+        """단일 작업 실행 (예외는 error 딕셔너리로 변환)"""
+        semaphore = self._semaphore_for(host_of(spec.host))
+        if semaphore:
+            semaphore.acquire()
+        try:
+            return spec.func(*spec.args, **spec.kwargs)
+        except Exception as e:
+            print(f"❌ {spec.name} 수집 실패: {e}")
+            return {"error": str(e)}
+        finally:
+            if semaphore:
+                semaphore.release()
+    
+    def gather(self, specs: List[FetchSpec], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """모든 작업을 동시에 실행하고 이름별 결과 반환 (시간 초과 시 error)"""
+        # 호출마다 별도 풀을 사용하므로 작업 안에서 gather를 다시 호출해도 교착되지 않음
+        if not specs:
+            return {}
+        
+        if len(specs) == 1:
+            return {specs[0].name: self._run(specs[0])}
+        
+        started = time.monotonic()
+        results = {}
+        pool = ThreadPoolExecutor(max_workers=min(len(specs), self.max_workers))
+        try:
+            # 호출 마감 시각(resilience.deadline) 등 컨텍스트 변수를 작업 스레드로 전달
+            futures = {spec.name: pool.submit(contextvars.copy_context().run, self._run, spec) for spec in specs}
+            for name, future in futures.items():
+                remaining = None
+                if timeout is not None:
+                    remaining = max(0.0, timeout - (time.monotonic() - started))
+                try:
+                    results[name] = future.result(timeout=remaining)
+                except FutureTimeout:
+                    results[name] = {"error": f"{name} 시간 초과"}
+        finally:
+            pool.shutdown(wait=False)
+        
+        return results
+    
+    def _accepted(self, result: Any) -> bool:
+        """헤지 후보 결과 성공 여부 (빈 값/error 딕셔너리는 실패)"""
+        return bool(result) and not (isinstance(result, dict) and "error" in result)
+    
+    def hedge(self, specs: List[FetchSpec], hedge_delay: Optional[float] = None, timeout: Optional[float] = None,
+              label: str = "", accept: Optional[Callable[[Any], bool]] = None, sequential: bool = False) -> Dict[str, Any]:
+        """우선순위 순 후보 중 가장 우선순위가 높은 성공 결과 반환
+
+        hedge_delay초마다 다음 후보를 추가로 띄우고(0이면 동시에, 앞 후보가 실패하면 즉시),
+        sequential이면 스레드 없이 순서대로 실행. 승자가 정해지면 나머지는 취소하고 결과는 버림.
+        반환: {"winner", "result", "latency_ms", "attempts"} 또는 {"error", "attempts"}
+        """
+        if hedge_delay is None:
+            hedge_delay = self.hedge_delay
+        accept = accept or self._accepted
+        label = label or "/".join(spec.name for spec in specs)
+        started = time.monotonic()
+        outcomes: List[Optional[tuple]] = [None] * len(specs)  # (성공 여부, 결과, 지연 ms)
+        
+        def elapsed_ms() -> float:
+            return round((time.monotonic() - started) * 1000, 1)
+        
+        def best(final: bool) -> Optional[int]:
+            """앞선 후보가 모두 실패한 가장 높은 우선순위 성공 후보 (final이면 대기 중 후보 무시)"""
+            for i, outcome in enumerate(outcomes):
+                if outcome is None:
+                    if not final:
+                        return None
+                elif outcome[0]:
+                    return i
+            return None
+        
+        if sequential or len(specs) == 1:
+            for i, spec in enumerate(specs):
+                result = self._run(spec)
+                outcomes[i] = (accept(result), result, elapsed_ms())
+                if outcomes[i][0]:
+                    break
+            winner = best(final=True)
+        else:
+            done: "queue.Queue[tuple]" = queue.Queue()
+            pool = ThreadPoolExecutor(max_workers=min(len(specs), self.max_workers))
+            launched = 0
+            last_launch = started
+            
+            def launch():
+                nonlocal launched, last_launch
+                index = launched
+                future = pool.submit(contextvars.copy_context().run, self._run, specs[index])
+                future.add_done_callback(lambda f: done.put((index, f)))
+                launched += 1
+                last_launch = time.monotonic()
+            
+            try:
+                launch()
+                while True:
+                    winner = best(final=False)
+                    if winner is not None or all(outcome is not None for outcome in outcomes):
+                        break
+                    
+                    # 띄운 후보가 모두 실패했으면 다음 후보를 바로 띄움
+                    if launched < len(specs) and all(outcomes[i] is not None for i in range(launched)):
+                        launch()
+                        continue
+                    
+                    waits = []
+                    if launched < len(specs):
+                        waits.append(last_launch + hedge_delay - time.monotonic())
+                    if timeout is not None:
+                        waits.append(started + timeout - time.monotonic())
+                    wait = max(0.0, min(waits)) if waits else None
+                    
+                    try:
+                        index, future = done.get(timeout=wait)
+                        result = future.result()
+                        outcomes[index] = (accept(result), result, elapsed_ms())
+                    except queue.Empty:
+                        if timeout is not None and time.monotonic() - started >= timeout:
+                            winner = best(final=True)
+                            break
+                        if launched < len(specs):
+                            launch()
+            finally:
+                pool.shutdown(wait=False, cancel_futures=True)
+        
+        attempts = {
+            spec.name: ("won" if i == winner else "failed" if outcomes[i] and not outcomes[i][0]
+                        else "cancelled" if outcomes[i] is None else "discarded")
+            for i, spec in enumerate(specs)
+        }
+        
+        if winner is None:
+            print(f"❌ {label} 헤지 요청 실패: 모든 후보 실패 ({elapsed_ms()}ms)")
+            return {"error": f"{label} 모든 후보 실패", "attempts": attempts}
+        
+        name = specs[winner].name
+        latency_ms = outcomes[winner][2]
+        with self._lock:
+            stats = self._hedge_stats.setdefault(label, {"wins": {}})
+            stats["wins"][name] = stats["wins"].get(name, 0) + 1
+            stats["last_winner"] = name
+            stats["last_latency_ms"] = latency_ms
+        print(f"🏁 {label} 헤지 요청 승자: {name} ({latency_ms}ms)")
+        
+        return {"winner": name, "result": outcomes[winner][1], "latency_ms": latency_ms, "attempts": attempts}
+    
+    def hedge_stats(self) -> Dict[str, Dict[str, Any]]:
+        """헤지 요청 라벨별 승자 횟수와 마지막 승자/지연"""
+        with self._lock:
+            return {label: {**stats, "wins": dict(stats["wins"])} for label, stats in self._hedge_stats.items()}
+
+# 전역 병렬 실행기 인스턴스
+fanout = FanoutExecutor()
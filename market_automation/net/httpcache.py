@@ -0,0 +1,185 @@
+"""
+HTTP 조건부 요청 캐시
+ETag/Last-Modified/Cache-Control을 따르는 디스크 응답 캐시와 파싱 결과 재사용
+(페이지 종류별 신선도 TTL 설정, 적중/미스/절약 바이트 통계)
+"""
+
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from ..config import config
+from ..storage.files import cache_dir, read_json, atomic_write_bytes, atomic_write_json
+from .session import sessions
+
+# 페이지 종류별 기본 신선도 TTL(초) - 이 시간 안에는 요청 없이 디스크에서 응답
+DEFAULT_PAGE_TTLS = {
+    "main": 30,
+    "world": 60,
+    "sectors": 120,
+    "movers": 60,
+}
+
+@dataclass
+class CachedPage:
+    """캐시를 거친 응답 본문"""
+    url: str
+    content: bytes
+    sha256: str
+    status: str  # fresh(디스크) / revalidated(304) / miss(새로 받음)
+    
+    def text(self, encoding: str = "utf-8") -> str:
+        return self.content.decode(encoding, errors="replace")
+
+def _parse_cache_control(value: str) -> Dict[str, Optional[str]]:
+    """Cache-Control 헤더를 지시어 딕셔너리로 변환"""
+    directives = {}
+    for item in value.split(","):
+        item = item.strip().lower()
+        if not item:
+            continue
+        name, _, arg = item.partition("=")
+        directives[name.strip()] = arg.strip().strip('"') or None
+    return directives
+
+class HTTPCache:
+    """URL별 응답 본문/검증자/파싱 결과를 디스크에 보관하는 캐시"""
+    
+    def __init__(self, directory: Optional[str] = None):
+        # 설정값과 캐시 디렉토리는 첫 사용 때 결정 (import 시 .env 로드 방지)
+        self._directory = directory
+        self._counters = {"fresh": 0, "revalidated": 0, "miss": 0, "bytes_saved": 0, "parse_skipped": 0}
+        self._lock = threading.Lock()
+    
+    @cached_property
+    def directory(self) -> Path:
+        return Path(self._directory or config.get("HTTP_CACHE_DIR", "") or cache_dir() / "http")
+    
+    @cached_property
+    def page_ttls(self) -> Dict[str, int]:
+        """페이지 종류별 신선도 TTL(초)"""
+        return {**DEFAULT_PAGE_TTLS, **self._parse_ttls(config.get("HTTP_CACHE_TTL", ""))}
+    
+    def _parse_ttls(self, value: str) -> Dict[str, int]:
+        """'page=초,page=초' 형식의 설정값 파싱"""
+        ttls = {}
+        for item in value.split(","):
+            if "=" in item:
+                page, ttl = item.split("=", 1)
+                try:
+                    ttls[page.strip()] = int(ttl)
+                except ValueError:
+                    print(f"⚠️ 잘못된 HTTP_CACHE_TTL 항목 무시: {item}")
+        return ttls
+    
+    def _paths(self, url: str):
+        """URL별 (본문, 메타) 파일 경로"""
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        return self.directory / f"{key}.body", self.directory / f"{key}.json"
+    
+    def _count(self, status: str, saved: int = 0):
+        with self._lock:
+            self._counters[status] += 1
+            self._counters["bytes_saved"] += saved
+    
+    def _freshness(self, page_type: str, cache_control: Dict[str, Optional[str]]) -> int:
+        """신선도 유지 시간(초) - 페이지별 TTL 설정 우선, 0이면 서버 max-age"""
+        ttl = self.page_ttls.get(page_type, 0)
+        if ttl > 0:
+            return ttl
+        if "no-cache" in cache_control:
+            return 0
+        try:
+            return int(cache_control.get("max-age") or 0)
+        except ValueError:
+            return 0
+    
+    def fetch(self, url: str, page_type: str, headers: Optional[Dict[str, str]] = None) -> CachedPage:
+        """URL 응답 본문 반환 - 신선하면 디스크, 아니면 조건부 요청 (HTTP 오류 시 예외)"""
+        body_path, meta_path = self._paths(url)
+        meta = read_json(meta_path)
+        
+        content = None
+        if meta and body_path.exists():
+            content = body_path.read_bytes()
+            if hashlib.sha256(content).hexdigest() != meta.get("sha256"):
+                content, meta = None, {}
+        
+        if content is not None and time.time() - meta.get("stored_at", 0) < meta.get("fresh_for", 0):
+            self._count("fresh", len(content))
+            return CachedPage(url, content, meta["sha256"], "fresh")
+        
+        request_headers = dict(headers or {})
+        if content is not None:
+            if meta.get("etag"):
+                request_headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                request_headers["If-Modified-Since"] = meta["last_modified"]
+        
+        response = sessions.get(url).get(url, headers=request_headers)
+        cache_control = _parse_cache_control(response.headers.get("Cache-Control", ""))
+        
+        if response.status_code == 304 and content is not None:
+            meta["stored_at"] = time.time()
+            meta["fresh_for"] = self._freshness(page_type, cache_control)
+            atomic_write_json(meta_path, meta)
+            self._count("revalidated", len(content))
+            return CachedPage(url, content, meta["sha256"], "revalidated")
+        
+        response.raise_for_status()
+        content = response.content
+        digest = hashlib.sha256(content).hexdigest()
+        self._count("miss")
+        
+        if "no-store" not in cache_control:
+            # 본문이 같으면 이전 파싱 결과를 그대로 유지
+            parsed = {}
+            if meta.get("parsed_sha256") == digest:
+                parsed = {"parsed_sha256": digest, "parsed": meta["parsed"]}
+            atomic_write_bytes(body_path, content)
+            atomic_write_json(meta_path, {
+                "url": url,
+                "sha256": digest,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "stored_at": time.time(),
+                "fresh_for": self._freshness(page_type, cache_control),
+                **parsed
+            })
+        
+        return CachedPage(url, content, digest, "miss")
+    
+    def parse(self, page: CachedPage, parser: Callable[[CachedPage], Any]) -> Any:
+        """본문 해시가 지난 파싱 때와 같으면 저장된 결과 반환, 아니면 파싱 후 저장"""
+        _, meta_path = self._paths(page.url)
+        meta = read_json(meta_path)
+        
+        if meta.get("sha256") == page.sha256 and meta.get("parsed_sha256") == page.sha256:
+            self._count("parse_skipped")
+            return meta["parsed"]
+        
+        result = parser(page)
+        
+        # 실패 결과는 저장하지 않음 (다음 실행에서 다시 파싱)
+        if result and not (isinstance(result, dict) and "error" in result) and meta.get("sha256") == page.sha256:
+            try:
+                meta.update({"parsed_sha256": page.sha256, "parsed": result})
+                atomic_write_json(meta_path, meta)
+            except (TypeError, ValueError) as e:
+                print(f"⚠️ 파싱 결과 캐시 저장 생략 ({page.url}): {e}")
+        
+        return result
+    
+    def stats(self) -> Dict[str, int]:
+        """적중/미스/절약 바이트 통계 (fresh + revalidated = 적중)"""
+        with self._lock:
+            stats = dict(self._counters)
+        stats["hits"] = stats["fresh"] + stats["revalidated"]
+        return stats
+
+# 전역 HTTP 캐시 인스턴스
+http_cache = HTTPCache()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+클라이언트 측 호출 제한/할당량 모듈
+제공자(또는 제공자:엔드포인트)별 토큰 버킷으로 초당 호출을 맞추고, 한도에 걸리면 실패 대신 대기
+버킷 상태와 일일 호출 장부는 잠금 파일로 보호되는 상태 파일에 두어 스레드·프로세스(데몬/크론 슬롯) 간 공유
+사용법: python -m market_automation.net.ratelimit [--date YYYY-MM-DD]  (일일 호출/잔여 할당량 출력)
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import pytz
+
+from ..config import config
+from ..storage.files import cache_dir, file_lock
+
+KST = pytz.timezone("Asia/Seoul")
+
+# 기본 호출 속도 (공식 한도보다 낮게: KIS 실전 20/s, 모의 2/s, Alpaca 200/m)
+DEFAULT_RATES = {
+    "kis": "15/s",
+    "kis_vts": "2/s",
+    "alpaca": "180/m",
+    "threads": "1/s",
+    "openai": "60/m",
+}
+
+# 기본 일일 할당량 (Threads 24시간 게시 250건, 답글 1,000건)
+DEFAULT_QUOTAS = {
+    "threads:publish": 250,
+    "threads:reply": 1000,
+}
+
+# 장부 보관 일수
+LEDGER_DAYS = 14
+
+UNITS = {"s": 1, "m": 60, "h": 3600}
+
+class QuotaExceeded(Exception):
+    """일일 할당량 소진 (기다려도 풀리지 않으므로 호출 측에서 오류 처리)"""
+
+def parse_rate(value: str) -> Tuple[float, float]:
+    """'15/s', '180/m', '1000/h', '5'(초당) 형식을 (초당 토큰, 버킷 크기)로 변환"""
+    count, _, unit = str(value).strip().partition("/")
+    per_sec = float(count) / UNITS[(unit or "s").strip()[:1]]
+    return per_sec, float(max(1, math.floor(per_sec)))
+
+def _parse_pairs(value: str, name: str) -> Dict[str, str]:
+    """'key=value,key=value' 형식의 설정값 파싱"""
+    pairs = {}
+    for item in value.split(","):
+        if "=" in item:
+            key, val = item.split("=", 1)
+            pairs[key.strip()] = val.strip()
+        elif item.strip():
+            print(f"⚠️ 잘못된 {name} 항목 무시: {item}")
+    return pairs
+
+class RateLimiter:
+    """토큰 버킷 호출 제한 + 일일 호출 장부"""
+    
+    def __init__(self, rates: Optional[Dict[str, str]] = None, quotas: Optional[Dict[str, int]] = None,
+                 state_path: Optional[str] = None, shared: Optional[bool] = None):
+        # 설정값과 상태 파일 경로는 첫 사용 때 결정 (import 시 .env 로드/캐시 디렉토리 생성 방지)
+        self._rates = rates
+        self._quotas = quotas
+        self._state_path = state_path
+        self._shared = shared
+        
+        self._lock = threading.Lock()
+        self._memory: Dict[str, Any] = {"buckets": {}, "ledger": {}}
+        self._waited: Dict[str, float] = {}
+    
+    @cached_property
+    def enabled(self) -> bool:
+        return config.get("RATE_LIMIT", "true").lower() == "true"
+    
+    @cached_property
+    def shared(self) -> bool:
+        if self._shared is not None:
+            return self._shared
+        return config.get("RATE_LIMIT_SHARED", "true").lower() == "true"
+    
+    @cached_property
+    def state_path(self) -> Path:
+        return Path(self._state_path or config.get("RATE_LIMIT_STATE", "") or cache_dir() / "ratelimit.json")
+    
+    @cached_property
+    def lock_path(self) -> Path:
+        return self.state_path.with_name(self.state_path.name + ".lock")
+    
+    @cached_property
+    def rates(self) -> Dict[str, Tuple[float, float]]:
+        """버킷별 (초당 토큰, 버킷 크기)"""
+        rates = {}
+        for key, value in {**DEFAULT_RATES, **_parse_pairs(config.get("RATE_LIMITS", ""), "RATE_LIMITS"), **(self._rates or {})}.items():
+            try:
+                rates[key] = parse_rate(value)
+            except (ValueError, KeyError):
+                print(f"⚠️ 잘못된 호출 속도 무시: {key}={value}")
+        return rates
+    
+    @cached_property
+    def quotas(self) -> Dict[str, int]:
+        """키별 일일 할당량"""
+        quotas = dict(DEFAULT_QUOTAS)
+        for key, value in _parse_pairs(config.get("DAILY_QUOTAS", ""), "DAILY_QUOTAS").items():
+            try:
+                quotas[key] = int(value)
+            except ValueError:
+                print(f"⚠️ 잘못된 일일 할당량 무시: {key}={value}")
+        quotas.update(self._quotas or {})
+        return quotas
+    
+    def bucket_for(self, provider: str, endpoint: str = "") -> Optional[str]:
+        """적용할 버킷 키 (제공자:엔드포인트 설정 우선, 없으면 제공자, 둘 다 없으면 None)"""
+        if endpoint and f"{provider}:{endpoint}" in self.rates:
+            return f"{provider}:{endpoint}"
+        return provider if provider in self.rates else None
+    
+    def _load(self) -> Dict[str, Any]:
+        if not self.shared:
+            return self._memory
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            state = {}
+        state.setdefault("buckets", {})
+        state.setdefault("ledger", {})
+        return state
+    
+    def _save(self, state: Dict[str, Any]):
+        if not self.shared:
+            return
+        # 매 호출마다 쓰는 단기 상태라 fsync 없이 잠금 안에서 덮어씀 (손상 시 빈 상태로 시작)
+        self.state_path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        fd = os.open(self.state_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f, separators=(",", ":"))
+    
+    @contextmanager
+    def _locked(self):
+        """스레드 잠금 + (공유 모드면) 프로세스 간 파일 잠금"""
+        with self._lock:
+            if self.shared:
+                with file_lock(self.lock_path):
+                    yield
+            else:
+                yield
+    
+    def _today(self) -> str:
+        return datetime.now(KST).date().isoformat()
+    
+    def _try_take(self, state: Dict[str, Any], bucket: str, cost: float, now: float) -> float:
+        """토큰 차감 시도 - 성공하면 0, 부족하면 기다릴 시간(초)"""
+        per_sec, capacity = self.rates[bucket]
+        entry = state["buckets"].get(bucket) or {"tokens": capacity, "updated": now}
+        tokens = min(capacity, entry["tokens"] + max(0.0, now - entry["updated"]) * per_sec)
+        if tokens >= cost:
+            state["buckets"][bucket] = {"tokens": tokens - cost, "updated": now}
+            return 0.0
+        state["buckets"][bucket] = {"tokens": tokens, "updated": now}
+        return (cost - tokens) / per_sec
+    
+    def _check_quota(self, state: Dict[str, Any], keys, day: str):
+        counts = state["ledger"].get(day, {})
+        for key in keys:
+            quota = self.quotas.get(key)
+            if quota is not None and counts.get(key, 0) >= quota:
+                raise QuotaExceeded(f"{key} 일일 할당량 소진 ({counts.get(key, 0)}/{quota}, {day})")
+    
+    def _count(self, state: Dict[str, Any], keys, day: str):
+        ledger = state["ledger"]
+        counts = ledger.setdefault(day, {})
+        for key in keys:
+            counts[key] = counts.get(key, 0) + 1
+        for old in sorted(ledger)[:-LEDGER_DAYS]:
+            del ledger[old]
+    
+    def acquire(self, provider: str, endpoint: str = "", cost: float = 1.0) -> float:
+        """호출 1회 허가 - 토큰이 생길 때까지 대기하고 장부에 기록, 대기한 시간(초) 반환
+
+        일일 할당량이 소진됐으면 QuotaExceeded (장부 키: 제공자, 엔드포인트가 있으면 제공자:엔드포인트도)
+        """
+        if not self.enabled:
+            return 0.0
+        
+        bucket = self.bucket_for(provider, endpoint)
+        keys = [provider] + ([f"{provider}:{endpoint}"] if endpoint else [])
+        waited = 0.0
+        while True:
+            with self._locked():
+                state = self._load()
+                day = self._today()
+                self._check_quota(state, keys, day)
+                wait = self._try_take(state, bucket, cost, time.time()) if bucket else 0.0
+                if not wait:
+                    self._count(state, keys, day)
+                self._save(state)
+            if not wait:
+                break
+            waited += wait
+            time.sleep(wait)
+        
+        if waited:
+            self._waited[provider] = self._waited.get(provider, 0.0) + waited
+            if waited >= 1.0:
+                print(f"⏳ {bucket} 호출 제한으로 {waited:.1f}초 대기")
+        return waited
+    
+    def penalize(self, provider: str, endpoint: str = "", seconds: float = 1.0):
+        """서버가 한도 초과를 알려오면 버킷을 비워 다음 호출을 seconds초 늦춤"""
+        bucket = self.bucket_for(provider, endpoint)
+        if not (self.enabled and bucket):
+            return
+        per_sec, _ = self.rates[bucket]
+        with self._locked():
+            state = self._load()
+            state["buckets"][bucket] = {"tokens": -seconds * per_sec, "updated": time.time()}
+            self._save(state)
+    
+    def report(self, day: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """일일 호출 수와 잔여 할당량 {키: {"requests", "quota", "remaining"}}"""
+        day = day or self._today()
+        with self._locked():
+            counts = dict(self._load()["ledger"].get(day, {}))
+        report = {}
+        for key in sorted(set(counts) | set(self.quotas)):
+            quota = self.quotas.get(key)
+            used = counts.get(key, 0)
+            report[key] = {"requests": used, "quota": quota,
+                           "remaining": max(0, quota - used) if quota is not None else None}
+        return report
+    
+    def stats(self) -> Dict[str, float]:
+        """이 프로세스에서 제공자별 누적 대기 시간(초)"""
+        return {key: round(value, 3) for key, value in self._waited.items()}
+
+# 전역 호출 제한기
+limiter = RateLimiter()
+
+def main():
+    """메인 함수"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="일일 호출/할당량 장부")
+    parser.add_argument("--date", help="조회 날짜 (KST, 기본: 오늘)")
+    args = parser.parse_args()
+    
+    report = limiter.report(args.date)
+    if not report:
+        print("📒 기록 없음")
+        return
+    print(f"{'키':<24}{'호출':>8}{'할당량':>10}{'잔여':>10}")
+    for key, entry in report.items():
+        quota = entry["quota"] if entry["quota"] is not None else "-"
+        remaining = entry["remaining"] if entry["remaining"] is not None else "-"
+        print(f"{key:<24}{entry['requests']:>8,}{quota:>10}{remaining:>10}")
+
+if __name__ == "__main__":
+    main()
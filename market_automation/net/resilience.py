@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+요청 복원력 모듈
+슬롯 발행 예산에 맞춘 호출 마감 시각(deadline), 멱등 GET의 지터 지수 백오프 재시도(tenacity),
+호스트별 서킷 브레이커(연속 실패 시 일정 시간 즉시 실패), 데이터 소스 폴백 체인(KIS → 네이버 → 저장소)
+사용법: python -m market_automation.net.resilience  (호스트별 브레이커 상태 출력)
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+from tenacity import Retrying, retry_if_exception, retry_if_result, stop_after_attempt, wait_random_exponential
+
+from ..config import config
+from ..storage.files import cache_dir, read_json, atomic_write_json
+from .cassette import CassetteMiss, cassette
+from .fanout import FetchSpec, host_of
+
+# 재시도할 응답 상태 (서버 오류, 호출 한도)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# 응답이 호출 한도 초과인지 판별 (세션별 지정, 예: KIS는 HTTP 500 + EGW00201)
+ThrottleCheck = Callable[[requests.Response], bool]
+
+# 재시도하는 멱등 메서드
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# 마감까지 이보다 적게 남으면 새 요청/재시도를 하지 않음 (초)
+MIN_REMAINING = 0.2
+
+class DeadlineExceeded(requests.Timeout):
+    """호출 마감 시각 초과"""
+
+class CircuitOpen(requests.ConnectionError):
+    """서킷 브레이커가 열린 호스트로의 요청 (즉시 실패)"""
+
+# 현재 작업의 마감 시각 (time.monotonic 기준, fanout 작업 스레드로도 전달)
+_deadline: contextvars.ContextVar = contextvars.ContextVar("deadline", default=None)
+
+@contextmanager
+def deadline(seconds: Optional[float]):
+    """블록 안의 모든 요청이 seconds초 안에 끝나도록 제한 (바깥 마감이 더 이르면 그대로 유지)"""
+    if not seconds or seconds <= 0:
+        yield
+        return
+    current = _deadline.get()
+    at = time.monotonic() + seconds
+    token = _deadline.set(at if current is None else min(current, at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def remaining() -> Optional[float]:
+    """마감까지 남은 시간(초), 마감이 없으면 None"""
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+def clamp_timeout(timeout: Any) -> Any:
+    """요청 타임아웃을 남은 시간으로 제한 ((connect, read) 또는 숫자), 마감이 지났으면 DeadlineExceeded"""
+    left = remaining()
+    if left is None:
+        return timeout
+    if left < MIN_REMAINING:
+        raise DeadlineExceeded(f"호출 마감 초과 (남은 시간 {left:.2f}초)")
+    if isinstance(timeout, tuple):
+        return tuple(min(value, left) if value else left for value in timeout)
+    return min(timeout, left) if timeout else left
+
+class CircuitBreaker:
+    """호스트 하나의 브레이커 - closed → (연속 failure_threshold회 실패) open → (cooldown 후) half_open → 성공 시 closed"""
+    
+    def __init__(self, host: str, failure_threshold: int, cooldown: float):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0  # time.time() 기준 (프로세스 간 공유)
+        self.last_error = ""
+        self.trips = 0
+        self._trial = False
+        self._lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        """요청 허용 여부 (half_open에서는 시험 요청 1개만)"""
+        with self._lock:
+            if self.state == "open":
+                if time.time() - self.opened_at < self.cooldown:
+                    return False
+                self.state = "half_open"
+                self._trial = False
+            if self.state == "half_open":
+                if self._trial:
+                    return False
+                self._trial = True
+            return True
+    
+    def record_success(self) -> bool:
+        """성공 기록 - 상태가 바뀌면 True"""
+        with self._lock:
+            changed = self.state != "closed"
+            self.state, self.failures, self._trial = "closed", 0, False
+            return changed
+    
+    def release(self):
+        """결과를 기록하지 않고 half_open 시험 요청 기회만 반납 (마감 초과 등 호스트 상태와 무관한 중단)"""
+        with self._lock:
+            self._trial = False
+    
+    def record_failure(self, error: str) -> bool:
+        """실패 기록 - 브레이커가 열리면 True"""
+        with self._lock:
+            self.failures += 1
+            self.last_error = error[:200]
+            self._trial = False
+            if self.state == "half_open" or (self.state == "closed" and self.failures >= self.failure_threshold):
+                self.state, self.opened_at = "open", time.time()
+                self.trips += 1
+                return True
+            return False
+    
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            retry_in = max(0.0, self.cooldown - (time.time() - self.opened_at)) if self.state == "open" else 0.0
+            return {"state": self.state, "failures": self.failures, "trips": self.trips,
+                    "opened_at": self.opened_at, "retry_in": round(retry_in, 1), "last_error": self.last_error}
+
+class BreakerRegistry:
+    """호스트별 브레이커 - 상태 전이를 파일에 기록해서 다른 프로세스(크론 슬롯)도 열린 호스트를 바로 건너뜀"""
+    
+    def __init__(self, state_path: Optional[str] = None):
+        # 설정값과 상태 파일 경로는 첫 사용 때 결정 (import 시 .env 로드 방지)
+        self._state_file = state_path
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+    
+    @cached_property
+    def failure_threshold(self) -> int:
+        return int(config.get("BREAKER_FAILURES", "3"))
+    
+    @cached_property
+    def cooldown(self) -> float:
+        return float(config.get("BREAKER_COOLDOWN_SEC", "60"))
+    
+    @cached_property
+    def _state_path(self) -> Path:
+        return Path(self._state_file or config.get("BREAKER_STATE", "") or cache_dir() / "breakers.json")
+    
+    @property
+    def state_path(self) -> Path:
+        """상태 파일 - 카세트 재생 중에는 별도 파일 (재생한 5xx 응답이 실제 크론/데몬의 브레이커를 열지 않도록)"""
+        if cassette.mode == "replay":
+            return self._state_path.with_name(f"{self._state_path.stem}.replay{self._state_path.suffix}")
+        return self._state_path
+    
+    def _load(self):
+        """다른 프로세스가 연 브레이커 중 아직 냉각 중인 것만 복원"""
+        self._loaded = True
+        for host, saved in read_json(self.state_path, {}).items():
+            if saved.get("state") == "open" and time.time() - saved.get("opened_at", 0) < self.cooldown:
+                breaker = self._breakers.setdefault(host, CircuitBreaker(host, self.failure_threshold, self.cooldown))
+                breaker.state, breaker.opened_at = "open", saved["opened_at"]
+                breaker.failures, breaker.last_error = saved.get("failures", 0), saved.get("last_error", "")
+    
+    def get(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(host, self.failure_threshold, self.cooldown)
+            return self._breakers[host]
+    
+    def is_open(self, url_or_host: str) -> bool:
+        """열린(냉각 중인) 브레이커인지 - 시험 요청 기회는 소모하지 않음"""
+        snapshot = self.get(host_of(url_or_host)).snapshot()
+        return snapshot["state"] == "open" and snapshot["retry_in"] > 0
+    
+    def record(self, host: str, ok: bool, error: str = ""):
+        """요청 결과 기록 (상태가 바뀌면 로그 + 파일 갱신)"""
+        breaker = self.get(host)
+        if ok:
+            if breaker.record_success():
+                print(f"🟢 {host} 서킷 브레이커 복구")
+                self._persist()
+        elif breaker.record_failure(error):
+            print(f"🔴 {host} 서킷 브레이커 열림 ({breaker.cooldown:.0f}초간 즉시 실패): {breaker.last_error}")
+            self._persist()
+    
+    def _persist(self):
+        """이 프로세스의 브레이커 상태를 파일에 병합"""
+        try:
+            atomic_write_json(self.state_path, {**read_json(self.state_path, {}), **self.stats()})
+        except OSError as e:
+            print(f"⚠️ 브레이커 상태 저장 실패: {e}")
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """호스트별 브레이커 상태"""
+        with self._lock:
+            breakers = list(self._breakers.items())
+        return {host: breaker.snapshot() for host, breaker in breakers}
+
+# 전역 브레이커 레지스트리
+breakers = BreakerRegistry()
+
+def is_rate_limited(response: requests.Response) -> bool:
+    """기본 호출 한도 판별 - HTTP 429"""
+    return response.status_code == 429
+
+def retry_after(response: requests.Response) -> Optional[float]:
+    """Retry-After 헤더의 대기 시간(초) - 초 또는 HTTP 날짜 형식, 없거나 잘못된 값이면 None"""
+    value = response.headers.get("Retry-After", "").strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+def _throttle_wait(response: requests.Response, cap: float) -> Optional[float]:
+    """호출 한도 응답을 이 계층에서 다시 보낼 때 기다릴 시간 - Retry-After가 재시도 상한과 마감 안이면 그 값, 아니면 None (호출 측 처리)"""
+    wait = retry_after(response)
+    if wait is None or wait > cap:
+        return None
+    left = remaining()
+    if left is not None and wait + MIN_REMAINING >= left:
+        return None
+    return wait
+
+def _retryable(error: BaseException) -> bool:
+    """연결 오류/타임아웃만 재시도 (브레이커 차단, 마감 초과는 즉시 실패)"""
+    if isinstance(error, (CircuitOpen, DeadlineExceeded)):
+        return False
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+def _retryer(method: str, throttled: ThrottleCheck) -> Retrying:
+    """메서드별 재시도 정책 (멱등 GET만 재시도, 마감이 가까우면 중단)
+
+    호출 한도 응답은 Retry-After만큼 기다려 다시 보내거나 (상한/마감 안일 때만) 그대로 반환 - 지터 백오프로 재시도하지 않음
+    """
+    attempts = int(config.get("HTTP_RETRY_ATTEMPTS", "3")) if method.upper() in IDEMPOTENT_METHODS else 1
+    base = float(config.get("HTTP_RETRY_BASE_SEC", "0.3"))
+    cap = float(config.get("HTTP_RETRY_MAX_SEC", "4"))
+    backoff = wait_random_exponential(multiplier=base, max=cap)
+    
+    def near_deadline(retry_state) -> bool:
+        left = remaining()
+        return left is not None and left < MIN_REMAINING + base
+    
+    def retry_response(response: requests.Response) -> bool:
+        if response.status_code >= 400 and throttled(response):
+            return _throttle_wait(response, cap) is not None
+        return response.status_code in RETRY_STATUSES
+    
+    def wait(retry_state) -> float:
+        outcome = retry_state.outcome
+        if not outcome.failed:
+            response = outcome.result()
+            if response.status_code >= 400 and throttled(response):
+                return _throttle_wait(response, cap) or 0.0
+        return backoff(retry_state)
+    
+    return Retrying(
+        stop=stop_after_attempt(max(1, attempts)) | near_deadline,
+        wait=wait,
+        retry=retry_if_exception(_retryable) | retry_if_result(retry_response),
+        retry_error_callback=lambda retry_state: retry_state.outcome.result(),
+    )
+
+def send(method: str, url: str, attempt: Callable[[Any], requests.Response], timeout: Any,
+         throttled: ThrottleCheck = is_rate_limited) -> requests.Response:
+    """브레이커 확인 → (마감으로 줄인 타임아웃으로) 시도 → 재시도 → 결과를 브레이커에 기록
+
+    attempt(timeout)이 실제 요청을 보냄. 마지막 응답이 5xx여도 응답을 그대로 반환 (호출 측 오류 처리 유지).
+    throttled(response)가 True인 응답(호출 한도 초과)은 호스트 장애가 아니므로 브레이커 실패로 세지 않음.
+    """
+    host = host_of(url)
+    breaker = breakers.get(host)
+    
+    def once() -> requests.Response:
+        # 마감 확인은 시험 요청 기회를 받기 전에 (마감 초과로 half_open 브레이커가 막히지 않도록)
+        request_timeout = clamp_timeout(timeout)
+        if not breaker.allow():
+            raise CircuitOpen(f"{host} 서킷 브레이커 열림 - 요청 생략")
+        try:
+            response = attempt(request_timeout)
+        except requests.RequestException as e:
+            if isinstance(e, (CircuitOpen, DeadlineExceeded, CassetteMiss)):
+                breaker.release()
+            else:
+                breakers.record(host, False, f"{type(e).__name__}: {e}")
+            raise
+        except BaseException:
+            # 호스트 응답과 무관한 오류 - 실패로 세지 않고 시험 요청 기회만 반납
+            breaker.release()
+            raise
+        if response.status_code >= 400 and throttled(response):
+            # 호출 한도 초과 - 호스트는 응답 중이므로 실패로 세지 않고 시험 요청 기회만 반납
+            breaker.release()
+            return response
+        breakers.record(host, response.status_code < 500, f"HTTP {response.status_code}")
+        return response
+    
+    return _retryer(method, throttled)(once)
+
+def fallback(specs: List[FetchSpec], valid: Callable[[Any], bool], label: str = "") -> Tuple[Optional[str], Any]:
+    """우선순위 순 소스 중 첫 유효 결과 (브레이커가 열린 호스트와 마감이 지난 경우는 바로 건너뜀)
+
+    반환: (소스 이름, 결과) 또는 (None, None)
+    """
+    for spec in specs:
+        if spec.host and breakers.is_open(spec.host):
+            print(f"⚡ {label} {spec.name} 건너뜀 (서킷 브레이커 열림)")
+            continue
+        left = remaining()
+        if left is not None and left < MIN_REMAINING:
+            print(f"⏱️ {label} {spec.name} 건너뜀 (호출 마감 초과)")
+            continue
+        try:
+            result = spec.func(*spec.args, **spec.kwargs)
+        except Exception as e:
+            print(f"⚠️ {label} {spec.name} 실패: {e}")
+            continue
+        if valid(result):
+            return spec.name, result
+        print(f"⚠️ {label} {spec.name} 결과 없음, 다음 소스 시도")
+    return None, None
+
+def main():
+    """메인 함수"""
+    stats = read_json(breakers.state_path, {})
+    if not stats:
+        print("🟢 기록된 서킷 브레이커 상태 없음")
+        return
+    print(f"{'호스트':<36}{'상태':<11}{'실패':>5}{'차단':>5}{'재시도까지':>10}  최근 오류")
+    now = time.time()
+    for host, entry in sorted(stats.items()):
+        retry_in = max(0.0, breakers.cooldown - (now - entry.get("opened_at", 0))) if entry.get("state") == "open" else 0.0
+        print(f"{host:<36}{entry.get('state', '-'):<11}{entry.get('failures', 0):>5}{entry.get('trips', 0):>5}"
+              f"{retry_in:>9.0f}s  {entry.get('last_error', '')}")
+
+if __name__ == "__main__":
+    main()
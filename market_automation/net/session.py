@@ -0,0 +1,116 @@
+"""
+공용 HTTP 세션 관리 모듈
+호스트별 keep-alive 커넥션 풀과 기본 타임아웃을 모든 클라이언트가 공유
+"""
+
+import threading
+from functools import cached_property
+from typing import Dict, Any, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..config import config
+from .cassette import CassetteAdapter, cassette
+from .resilience import ThrottleCheck, is_rate_limited, send
+
+class TimeoutSession(requests.Session):
+    """기본 (connect, read) 타임아웃 + 복원력 계층(마감 시각, 멱등 GET 재시도, 호스트별 서킷 브레이커)을 적용하는 세션
+
+    throttled: 호출 한도 초과 응답 판별 (기본 429) - 제공자가 다른 형식으로 알리면 클라이언트가 지정
+    """
+    
+    def __init__(self, timeout: Tuple[float, float]):
+        super().__init__()
+        self.default_timeout = timeout
+        self.throttled: ThrottleCheck = is_rate_limited
+    
+    def request(self, method, url, **kwargs):
+        timeout = kwargs.pop("timeout", None)
+        if timeout is None:
+            timeout = self.default_timeout
+        
+        def attempt(clamped):
+            return super(TimeoutSession, self).request(method, url, timeout=clamped, **kwargs)
+        
+        return send(method, url, attempt, timeout, self.throttled)
+
+class SessionRegistry:
+    """호스트(scheme://host:port)별 세션 레지스트리"""
+    
+    def __init__(self):
+        # 타임아웃/풀 크기 설정은 첫 세션 생성 때 읽음 (import 시 .env 로드 방지)
+        self._sessions: Dict[str, TimeoutSession] = {}
+        self._lock = threading.Lock()
+    
+    @cached_property
+    def connect_timeout(self) -> float:
+        return float(config.get("HTTP_CONNECT_TIMEOUT", "5"))
+    
+    @cached_property
+    def read_timeout(self) -> float:
+        return float(config.get("HTTP_READ_TIMEOUT", "20"))
+    
+    @cached_property
+    def pool_maxsize(self) -> int:
+        return int(config.get("HTTP_POOL_MAXSIZE", "8"))
+    
+    def _origin(self, url: str) -> str:
+        """URL에서 scheme://host:port 추출"""
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}"
+    
+    def _create(self) -> TimeoutSession:
+        """커넥션 풀이 설정된 새 세션 생성"""
+        session = TimeoutSession((self.connect_timeout, self.read_timeout))
+        # 재시도는 상위 계층에서 처리하므로 어댑터 재시도는 비활성화
+        options = dict(pool_connections=4, pool_maxsize=self.pool_maxsize, max_retries=0)
+        # HTTP_CASSETTE=record|replay면 카세트 어댑터로 기록/재생
+        adapter = CassetteAdapter(cassette, **options) if cassette.mode else HTTPAdapter(**options)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+    
+    def get(self, url: str) -> requests.Session:
+        """URL의 호스트에 해당하는 공용 세션 반환"""
+        origin = self._origin(url)
+        with self._lock:
+            if origin not in self._sessions:
+                self._sessions[origin] = self._create()
+            return self._sessions[origin]
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """호스트별 커넥션 통계 (새로 연 커넥션 수 / 재사용 수)"""
+        result = {}
+        with self._lock:
+            sessions = list(self._sessions.items())
+        
+        for origin, session in sessions:
+            opened = 0
+            requests_made = 0
+            for adapter in set(session.adapters.values()):
+                pools = adapter.poolmanager.pools
+                for key in list(pools.keys()):
+                    pool = pools.get(key)
+                    if pool is not None:
+                        opened += pool.num_connections
+                        requests_made += pool.num_requests
+            
+            result[origin] = {
+                "opened": opened,
+                "requests": requests_made,
+                "reused": max(0, requests_made - opened)
+            }
+        
+        return result
+    
+    def close_all(self):
+        """모든 세션 종료"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+# 전역 세션 레지스트리 인스턴스
+sessions = SessionRegistry()
@@ -0,0 +1,118 @@
+"""
+실시간 WebSocket 수신 공통 모듈
+백그라운드 스레드의 asyncio 루프에서 접속 → 수신을 반복하고 끊기면 지수 백오프로 재접속
+(KIS/Alpaca 스트림이 상속해서 _session()에 접속 절차와 수신 처리를 구현)
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional
+
+try:
+    import websockets
+except ImportError:  # websockets 미설치 환경
+    websockets = None
+
+def available() -> bool:
+    """websockets 사용 가능 여부"""
+    return websockets is not None
+
+class ReconnectingStream:
+    """재접속 루프와 스레드 수명 관리 - 하위 클래스는 _session()과 필요하면 _prepare()를 구현"""
+    
+    label = "실시간"
+    
+    def __init__(self, url: str, reconnect_max: float = 30.0):
+        self.url = url
+        self.reconnect_max = reconnect_max
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._ws = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._connected = threading.Event()
+        self._counters = {"frames": 0, "ticks": 0, "reconnects": 0, "errors": 0}
+    
+    def _prepare(self) -> bool:
+        """시작 전 준비 (호출 스레드에서 실행, False면 시작하지 않음)"""
+        return True
+    
+    async def _session(self):
+        """접속 1회 - 연결이 끊길 때까지 수신 (연결 후 self._ws 설정, self._connected.set())"""
+        raise NotImplementedError
+    
+    def _send_threadsafe(self, message: str):
+        """스트림 스레드의 연결로 메시지 전송 (연결 전이면 다음 접속 때 _session()이 처리)"""
+        if self._loop and self._ws is not None and self._connected.is_set():
+            asyncio.run_coroutine_threadsafe(self._ws.send(message), self._loop)
+    
+    async def _run(self):
+        """재접속 루프 (지수 백오프, 상한 reconnect_max초)"""
+        delay = 1.0
+        while not self._stop.is_set():
+            started = time.time()
+            try:
+                await self._session()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._counters["errors"] += 1
+                print(f"⚠️ {self.label} 연결 끊김: {e}")
+            finally:
+                self._connected.clear()
+                self._ws = None
+            if self._stop.is_set():
+                break
+            
+            # 오래 유지된 연결이 끊긴 경우는 바로 재접속
+            delay = 1.0 if time.time() - started > 60 else min(delay * 2, self.reconnect_max)
+            self._counters["reconnects"] += 1
+            print(f"🔁 {delay:.0f}초 후 {self.label} 재접속")
+            await asyncio.sleep(delay)
+    
+    def start(self) -> bool:
+        """백그라운드 수신 시작 (websockets가 없거나 이미 실행 중이면 False)"""
+        if not available():
+            print(f"⚠️ websockets 미설치 - {self.label} 스트리밍 비활성화")
+            return False
+        if self._thread and self._thread.is_alive():
+            return False
+        if not self._prepare():
+            return False
+        
+        self._stop.clear()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._thread_main, name=type(self).__name__, daemon=True)
+        self._thread.start()
+        return True
+    
+    def _thread_main(self):
+        """스트림 스레드 - stop()이 작업을 취소하면 루프 정리 후 종료"""
+        asyncio.set_event_loop(self._loop)
+        self._task = self._loop.create_task(self._run())
+        try:
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+    
+    def wait_connected(self, timeout: float = 10.0) -> bool:
+        """연결될 때까지 대기"""
+        return self._connected.wait(timeout)
+    
+    def stop(self, timeout: float = 5.0):
+        """수신 종료"""
+        self._stop.set()
+        if self._task is not None and self._loop and not self._loop.is_closed():
+            # 재접속 대기 중이어도 바로 끝나도록 작업 취소
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        if self._thread:
+            self._thread.join(timeout)
+        self._thread = None
+        self._task = None
+    
+    def stats(self) -> Dict[str, Any]:
+        """수신 프레임/체결/재접속 횟수"""
+        return dict(self._counters, connected=self._connected.is_set())
@@ -4,6 +4,7 @@
 """
 
 import json
+import time
 from datetime import datetime
 from typing import Dict, Any, Optional
 from ..config import config
@@ -11,6 +12,31 @@ from ..rendering.compose import ContentComposer
 from .threads_client import ThreadsClient
 from ..datasource.alpaca import AlpacaClient
 from ..datasource.naver_adapter import NaverDataAdapter
+from ..storage.timeseries import timeseries, NAVER_WORLD_SYMBOLS, naver_daily_rows, record_daily_closes
+from ..trading_calendar import last_us_session
+
+# 슬롯별 네이버 데이터 변환 함수
+SLOT_CONVERTERS = {
+    "us_close": "convert_to_us_close_format",
+    "kr_preopen": "convert_to_kr_preopen_format",
+    "kr_midday": "convert_to_kr_midday_format",
+    "kr_close": "convert_to_kr_close_format",
+    "us_preview": "convert_to_us_preview_format",
+    "us_premkt": "convert_to_us_preview_format"
+}
+
+# 발행 시점에 다시 수집하는 변동성 필드 (main: KOSPI/KOSDAQ, world: 미국 지수)
+VOLATILE_FIELDS = {
+    "us_close": "world",
+    "kr_preopen": "main",
+    "kr_midday": "main",
+    "kr_close": "main",
+    "us_preview": "world",
+    "us_premkt": "world"
+}
+
+# 전일 미국장 세션 종가만 쓰는 슬롯 (세션 종가 캐시가 있으면 세계지수 재수집 생략)
+DAILY_CLOSE_SLOTS = {"kr_preopen", "us_preview", "us_premkt"}
 
 class MarketPoster:
     def __init__(self):
@@ -19,8 +45,250 @@ class MarketPoster:
         self.client = ThreadsClient()
         self.alpaca = AlpacaClient()
         self.naver_adapter = NaverDataAdapter()
+        
+        # 사전 수집 초안 (슬롯별)
+        self._drafts: Dict[str, Dict[str, Any]] = {}
+        self._scraper = None
+        self._kis = None
+        self.prefetch_max_age = int(self.config.get("PREFETCH_MAX_AGE_MIN", "30")) * 60
+    
+    def _get_scraper(self):
+        """네이버 스크래퍼 (프로젝트 루트 모듈, 없으면 None)"""
+        if self._scraper is None:
+            try:
+                from naver_finance_scraper import NaverFinanceScraper
+                self._scraper = NaverFinanceScraper()
+            except ImportError as e:
+                print(f"⚠️ 네이버 스크래퍼를 불러올 수 없음: {e}")
+        return self._scraper
+    
+    def prefetch(self, slot: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """발행 전 사전 수집 - 전체 데이터 수집·변환·검증 후 초안 렌더링"""
+        if slot not in SLOT_CONVERTERS:
+            return {"success": False, "error": f"Unknown slot: {slot}", "slot": slot}
+        
+        started = time.time()
+        print(f"⏳ {slot} 사전 수집 시작")
+        
+        naver_data = None
+        scraper = self._get_scraper()
+        if scraper:
+            collected = scraper.get_market_data()
+            if collected and "error" not in collected:
+                naver_data = collected
+                scraper.save_to_json(collected, str(self.naver_adapter.data_file))
+        
+        if naver_data is None:
+            naver_data = self.naver_adapter.load_naver_data()
+        
+        # 네이버 수집이 실패했으면 한국 지수만이라도 다른 소스로 보충
+        if VOLATILE_FIELDS.get(slot) == "main" and not (naver_data and naver_data.get("kospi") and naver_data.get("kosdaq")):
+            naver_data = dict(naver_data or {})
+            self._refresh_kr_indices(naver_data, scraper)
+        
+        self._drafts[slot] = {
+            "naver_data": naver_data,
+            "prepared_at": time.time(),
+            "sections": {}
+        }
+        
+        if data is None:
+            data = getattr(self.naver_adapter, SLOT_CONVERTERS[slot])(naver_data or {})
+        
+        # 게시하지 않고 초안만 렌더링 (섹터 요약 등 무거운 합성 결과를 캐시)
+        draft = getattr(self, f"post_{slot}")(data, publish=False)
+        self._drafts[slot]["content"] = draft.get("content")
+        
+        elapsed = time.time() - started
+        print(f"✅ {slot} 사전 수집 완료 ({elapsed:.1f}초)")
+        draft["elapsed"] = elapsed
+        return draft
+    
+    def _get_draft(self, slot: str) -> Optional[Dict[str, Any]]:
+        """유효한 사전 수집 초안 반환 (오래된 초안은 폐기)"""
+        draft = self._drafts.get(slot)
+        if draft and time.time() - draft["prepared_at"] > self.prefetch_max_age:
+            print(f"⚠️ {slot} 사전 수집 초안이 오래되어 폐기")
+            self._drafts.pop(slot, None)
+            return None
+        return draft
+    
+    def _load_naver_data(self, slot: str, refresh: bool = True) -> Optional[Dict[str, Any]]:
+        """슬롯용 네이버 데이터 - 초안이 있으면 변동성 필드만 갱신해서 사용"""
+        draft = self._get_draft(slot)
+        if not draft or not draft.get("naver_data"):
+            return self.naver_adapter.load_naver_data()
+        
+        naver_data = dict(draft["naver_data"])
+        if refresh:
+            self._refresh_volatile(slot, naver_data)
+        return naver_data
+    
+    def _refresh_volatile(self, slot: str, naver_data: Dict[str, Any]):
+        """발행 직전 최신 지수만 다시 수집해서 반영"""
+        scraper = self._get_scraper()
+        field = VOLATILE_FIELDS.get(slot)
+        try:
+            if field == "main":
+                if self._stream_indices(naver_data):
+                    print(f"📡 {slot} 실시간 지수 반영 (재수집 생략)")
+                    return
+                if not self._refresh_kr_indices(naver_data, scraper):
+                    print(f"⚠️ {slot} 최신 지수 소스 모두 실패, 사전 수집 데이터 사용")
+                    return
+            elif field == "world":
+                if not scraper:
+                    return
+                if slot in DAILY_CLOSE_SLOTS and self._daily_closes_cached():
+                    print(f"🗃️ {slot} 전일 미국장 종가 캐시 사용 (세계지수 재수집 생략)")
+                    return
+                latest = scraper.get_world_market_data()
+                if latest and "error" not in latest:
+                    naver_data["world"] = latest
+            print(f"🔄 {slot} 최신 지수 갱신 완료")
+        except Exception as e:
+            print(f"⚠️ {slot} 최신 지수 갱신 실패, 사전 수집 데이터 사용: {e}")
+    
+    def _get_kis(self):
+        """KIS 클라이언트 (키가 없으면 None)"""
+        if not self.config.get_kis_app_key():
+            return None
+        if self._kis is None:
+            from ..datasource.kis import KISClient
+            self._kis = KISClient()
+        return self._kis
+    
+    def _refresh_kr_indices(self, naver_data: Dict[str, Any], scraper=None) -> Optional[str]:
+        """KOSPI/KOSDAQ 최신값을 KIS → 네이버 → 저장소 순으로 조회해서 반영 (브레이커가 열린 소스는 건너뜀)
+
+        반환: 사용한 소스 이름 (모두 실패하면 None)
+        """
+        from ..net.fanout import FetchSpec
+        from ..net.resilience import fallback
+        
+        specs = []
+        kis = self._get_kis()
+        if kis:
+            specs.append(FetchSpec("KIS", kis.get_kr_market_data, host=kis.base_url))
+        if scraper:
+            specs.append(FetchSpec("네이버", scraper._get_main_market_data, host=scraper.base_url))
+        specs.append(FetchSpec("저장소", self._stored_kr_indices))
+        
+        def valid(result: Any) -> bool:
+            return isinstance(result, dict) and "error" not in result and all(
+                isinstance(result.get(key), dict) and result[key].get("price") for key in ("kospi", "kosdaq"))
+        
+        source, latest = fallback(specs, valid, "KOSPI/KOSDAQ")
+        if source is None:
+            return None
+        for key in ("kospi", "kosdaq"):
+            naver_data[key] = {**(naver_data.get(key) or {}), **{field: latest[key][field] for field in
+                               ("price", "change", "change_rate") if field in latest[key]}}
+        naver_data["timestamp"] = latest.get("timestamp") or datetime.now().isoformat()
+        print(f"📊 KOSPI/KOSDAQ 최신값 소스: {source}")
+        return source
+    
+    def _stored_kr_indices(self) -> Dict[str, Any]:
+        """시계열 저장소의 최근 KOSPI/KOSDAQ 스냅샷 (KR_INDEX_CACHE_MAX_AGE_MIN 이내만)"""
+        max_age = float(self.config.get("KR_INDEX_CACHE_MAX_AGE_MIN", "30")) * 60
+        rows = {row["symbol"]: row for row in timeseries.latest("index", ["KOSPI", "KOSDAQ"])
+                if time.time() - row["ts"] <= max_age}
+        if len(rows) < 2:
+            return {"error": f"저장소에 {max_age / 60:.0f}분 이내 KOSPI/KOSDAQ 스냅샷 없음"}
+        result: Dict[str, Any] = {key.lower(): {"price": float(row["price"]), "change": float(row["change"]),
+                                                "change_rate": float(row["change_rate"])} for key, row in rows.items()}
+        result["timestamp"] = datetime.fromtimestamp(min(row["ts"] for row in rows.values())).isoformat()
+        return result
+    
+    def _stream_indices(self, naver_data: Dict[str, Any]) -> bool:
+        """데몬의 KIS 실시간 스트림에 최신 KOSPI/KOSDAQ 체결이 모두 있으면 반영"""
+        from ..datasource.kis_stream import kis_stream, INDEX_TR, STREAM_INDEX_CODES
+        
+        max_age = float(self.config.get("KIS_STREAM_MAX_AGE_SEC", "60"))
+        ticks = {key: kis_stream.latest(code, INDEX_TR, max_age) for key, code in STREAM_INDEX_CODES.items()}
+        if not all(ticks.values()):
+            return False
+        
+        for key, tick in ticks.items():
+            naver_data[key] = {**(naver_data.get(key) or {}),
+                               "price": tick["price"], "change": tick["change"], "change_rate": tick["change_rate"]}
+        naver_data["timestamp"] = datetime.fromtimestamp(max(t["received_at"] for t in ticks.values())).isoformat()
+        return True
+    
+    def _daily_closes_cached(self) -> bool:
+        """마감된 최근 미국장의 주요 지수 세션 종가가 모두 캐시되어 있는지"""
+        symbols = list(NAVER_WORLD_SYMBOLS.values())
+        try:
+            return len(timeseries.daily_closes(symbols, last_us_session())) == len(symbols)
+        except Exception as e:
+            print(f"⚠️ 세션 종가 캐시 조회 실패: {e}")
+            return False
+    
+    def _sector_analytics(self, market: str) -> Optional[Dict[str, Any]]:
+        """구성 종목 시세 기반 섹터 상위/하위 (us: Alpaca, kr: KIS) - 키가 없거나 실패하면 None"""
+        try:
+            if market == "us":
+                if not self.alpaca.api_key:
+                    return None
+                sectors = self.alpaca.get_sector_performance()
+            else:
+                kis = self._get_kis()
+                if not kis:
+                    return None
+                ranked = kis.get_sector_performance()
+                if ranked and "error" in ranked[0]:
+                    sectors = ranked[0]
+                else:
+                    from ..analytics.sectors import split_top_bottom
+                    sectors = split_top_bottom(ranked)
+        except Exception as e:
+            sectors = {"error": str(e)}
+        
+        if "error" in sectors:
+            print(f"⚠️ {market} 섹터 분석 실패, 기존 섹터 데이터 사용: {sectors['error']}")
+            return None
+        if not sectors.get("top") and not sectors.get("bottom"):
+            return None
+        return sectors
+    
+    def _slot_sector_analytics(self, slot: str, market: str) -> Optional[Dict[str, Any]]:
+        """슬롯용 섹터 분석 - 사전 수집 초안에 있으면 재사용 (발행 시점에 구성 종목 시세를 다시 받지 않음)"""
+        draft = self._get_draft(slot)
+        if draft and "sector_analytics" in draft:
+            return draft["sector_analytics"]
+        
+        sectors = self._sector_analytics(market)
+        if draft:
+            draft["sector_analytics"] = sectors
+        return sectors
+    
+    def _compose_sections(self, slot: str, sectors: Dict[str, Any], movers: Optional[list] = None) -> Dict[str, str]:
+        """섹터 요약 + 특징주 블록을 LLM 한 번으로 생성 (사전 수집 시 합성한 결과가 있으면 재사용)"""
+        inputs = {"sector_line": {"top_sectors": sectors.get("top", []), "bottom_sectors": sectors.get("bottom", [])}}
+        if movers is not None:
+            inputs["movers_block"] = {"movers": movers}
+        
+        draft = self._get_draft(slot)
+        key = json.dumps(inputs, sort_keys=True, ensure_ascii=False, default=str)
+        if draft and key in draft["sections"]:
+            return draft["sections"][key]
+        
+        sections = self.composer.compose_sections(inputs, slot=slot)
+        if draft:
+            draft["sections"][key] = sections
+        return sections
+    
+    def _publish(self, slot: str, content: str, publish: bool) -> Dict[str, Any]:
+        """포스팅 실행 (publish=False면 초안만 반환)"""
+        if not publish:
+            return {"success": True, "draft": True}
+        
+        result = self.client.post(content)
+        # 사용한 초안은 폐기
+        self._drafts.pop(slot, None)
+        return result
     
-    def post_us_close(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def post_us_close(self, data: Dict[str, Any], publish: bool = True) -> Dict[str, Any]:
         """미국 증시 마감 포스팅"""
         try:
             print("🔄 미국 증시 데이터 수집 중...")
@@ -28,7 +296,7 @@ class MarketPoster:
             # 네이버 크롤링 데이터 사용
             try:
                 # 네이버 데이터 로드
-                naver_data = self.naver_adapter.load_naver_data()
+                naver_data = self._load_naver_data("us_close", refresh=publish)
                 if not naver_data:
                     print("⚠️ 네이버 데이터 로드 실패, 샘플 데이터 사용")
                     indices = data["indices"]
@@ -37,6 +305,10 @@ class MarketPoster:
                 else:
                     print("✅ 네이버 데이터 로드 완료")
                     
+                    # 마감 직후 수집한 지수 종가를 이후 슬롯(08:30, 20:00, 23:00)용으로 기록
+                    if naver_data.get("world"):
+                        record_daily_closes(naver_daily_rows(naver_data["world"], last_us_session()), "네이버")
+                    
                     # 네이버 데이터를 미국 장 마감 형식으로 변환
                     converted_data = self.naver_adapter.convert_to_us_close_format(naver_data)
                     
@@ -45,7 +317,7 @@ class MarketPoster:
                     movers = converted_data.get("movers", [])
                     
                     print("✅ 네이버 데이터를 미국 장 마감 형식으로 변환 완료")
-                    
+            
             except Exception as e:
                 print(f"⚠️ 네이버 데이터 처리 실패, 샘플 데이터 사용: {e}")
                 indices = data["indices"]
@@ -62,15 +334,14 @@ class MarketPoster:
             print("🔍 데이터 검증 완료")
             print("🔄 콘텐츠 합성 중...")
             
-            # 섹터 요약 생성
-            sector_line = self.composer.compose_sector_summary(
-                sectors.get("top", []),
-                sectors.get("bottom", [])
-            )
+            # 섹터 요약 생성 (구성 종목 분석 결과 우선, 사전 수집 초안에 있으면 재사용)
+            sectors = self._slot_sector_analytics("us_close", "us") or sectors
+            # 섹터 요약 + 특징주 요약 생성 (LLM 한 번, 섹션별 규칙 기반 폴백)
+            sections = self._compose_sections("us_close", sectors, movers)
+            sector_line = sections["sector_line"]
             print(f"🏭 섹터 요약: {sector_line}")
             
-            # 특징주 요약 생성
-            movers_block = self.composer.compose_movers_summary(movers)
+            movers_block = sections["movers_block"]
             movers_line_count = len(movers_block.split('\n')) if movers_block else 0
             print(f"🚀 특징주 요약: {movers_line_count}줄")
             
@@ -102,17 +373,17 @@ class MarketPoster:
             print("📝 템플릿 렌더링 완료")
             
             # 포스팅
-            result = self.client.post(content)
+            result = self._publish("us_close", content, publish)
             result["slot"] = "us_close"
             result["timestamp"] = datetime.now().isoformat()
             result["content"] = content  # 드라이 런 모드에서 콘텐츠 확인용
             
             return result
-            
+        
         except Exception as e:
             return {"success": False, "error": str(e), "slot": "us_close"}
     
-    def post_kr_preopen(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def post_kr_preopen(self, data: Dict[str, Any], publish: bool = True) -> Dict[str, Any]:
         """한국 개장 전 포스팅"""
         try:
             print("🔄 한국 개장 전 데이터 수집 중...")
@@ -120,7 +391,7 @@ class MarketPoster:
             # 네이버 크롤링 데이터 사용
             try:
                 # 네이버 데이터 로드
-                naver_data = self.naver_adapter.load_naver_data()
+                naver_data = self._load_naver_data("kr_preopen", refresh=publish)
                 if not naver_data:
                     print("⚠️ 네이버 데이터 로드 실패, 샘플 데이터 사용")
                     realtime_data = data
@@ -131,7 +402,7 @@ class MarketPoster:
                     realtime_data = self.naver_adapter.convert_to_kr_preopen_format(naver_data)
                     
                     print("✅ 네이버 데이터를 한국 개장 전 형식으로 변환 완료")
-                    
+            
             except Exception as e:
                 print(f"⚠️ 네이버 데이터 처리 실패, 샘플 데이터 사용: {e}")
                 realtime_data = data
@@ -162,13 +433,13 @@ class MarketPoster:
             print("📝 한국 개장 전 템플릿 렌더링 완료")
             
             # 포스팅
-            result = self.client.post(content)
+            result = self._publish("kr_preopen", content, publish)
             result["slot"] = "kr_preopen"
             result["timestamp"] = datetime.now().isoformat()
             result["content"] = content
             
             return result
-            
+        
         except Exception as e:
             return {"success": False, "error": str(e), "slot": "kr_preopen"}
     
@@ -192,7 +463,7 @@ class MarketPoster:
         
         return True
     
-    def post_kr_midday(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def post_kr_midday(self, data: Dict[str, Any], publish: bool = True) -> Dict[str, Any]:
         """한국 장중 포스팅"""
         try:
             print("🔄 한국 장중 데이터 수집 중...")
@@ -200,7 +471,7 @@ class MarketPoster:
             # 네이버 크롤링 데이터 사용
             try:
                 # 네이버 데이터 로드
-                naver_data = self.naver_adapter.load_naver_data()
+                naver_data = self._load_naver_data("kr_midday", refresh=publish)
                 if not naver_data:
                     print("⚠️ 네이버 데이터 로드 실패, 샘플 데이터 사용")
                     realtime_data = data
@@ -213,7 +484,7 @@ class MarketPoster:
                     print("✅ 네이버 데이터를 한국 장중 형식으로 변환 완료")
                     print(f"📊 KOSPI: {realtime_data['kospi']['price']} ({realtime_data['kospi']['diff']:+.2f}, {realtime_data['kospi']['pct']:+.2f}%)")
                     print(f"📊 KOSDAQ: {realtime_data['kosdaq']['price']} ({realtime_data['kosdaq']['diff']:+.2f}, {realtime_data['kosdaq']['pct']:+.2f}%)")
-                    
+            
             except Exception as e:
                 print(f"⚠️ 네이버 데이터 처리 실패, 샘플 데이터 사용: {e}")
                 realtime_data = data
@@ -244,17 +515,17 @@ class MarketPoster:
             print("📝 한국 장중 템플릿 렌더링 완료")
             
             # 포스팅
-            result = self.client.post(content)
+            result = self._publish("kr_midday", content, publish)
             result["slot"] = "kr_midday"
             result["timestamp"] = datetime.now().isoformat()
             result["content"] = content
             
             return result
-            
+        
         except Exception as e:
             return {"success": False, "error": str(e), "slot": "kr_midday"}
     
-    def post_kr_close(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def post_kr_close(self, data: Dict[str, Any], publish: bool = True) -> Dict[str, Any]:
         """한국 장 마감 포스팅"""
         try:
             print("🔄 한국 장 마감 데이터 수집 중...")
@@ -262,7 +533,7 @@ class MarketPoster:
             # 네이버 크롤링 데이터 사용
             try:
                 # 네이버 데이터 로드
-                naver_data = self.naver_adapter.load_naver_data()
+                naver_data = self._load_naver_data("kr_close", refresh=publish)
                 if not naver_data:
                     print("⚠️ 네이버 데이터 로드 실패, 샘플 데이터 사용")
                     realtime_data = data
@@ -275,7 +546,7 @@ class MarketPoster:
                     print("✅ 네이버 데이터를 한국 장 마감 형식으로 변환 완료")
                     print(f"📊 KOSPI: {realtime_data['kospi']['price']} ({realtime_data['kospi']['diff']:+.2f}, {realtime_data['kospi']['pct']:+.2f}%)")
                     print(f"📊 KOSDAQ: {realtime_data['kosdaq']['price']} ({realtime_data['kosdaq']['diff']:+.2f}, {realtime_data['kosdaq']['pct']:+.2f}%)")
-                    
+            
             except Exception as e:
                 print(f"⚠️ 네이버 데이터 처리 실패, 샘플 데이터 사용: {e}")
                 realtime_data = data
@@ -287,16 +558,14 @@ class MarketPoster:
             print("🔍 한국 장 마감 데이터 검증 완료")
             print("🔄 한국 장 마감 콘텐츠 합성 중...")
             
-            # 섹터 요약 생성
-            sectors = realtime_data.get("sectors", {})
-            sector_line = self.composer.compose_sector_summary(
-                sectors.get("top", []),
-                sectors.get("bottom", [])
-            )
+            # 섹터 요약 생성 (구성 종목 분석 결과 우선, 사전 수집 초안에 있으면 재사용)
+            sectors = self._slot_sector_analytics("kr_close", "kr") or realtime_data.get("sectors", {})
+            # 섹터 요약 + 특징주 요약 생성 (LLM 한 번, 섹션별 규칙 기반 폴백)
+            sections = self._compose_sections("kr_close", sectors, realtime_data.get("movers", []))
+            sector_line = sections["sector_line"]
             print(f"🏭 한국 섹터 요약: {sector_line}")
             
-            # 특징주 요약 생성
-            movers_block = self.composer.compose_movers_summary(realtime_data.get("movers", []))
+            movers_block = sections["movers_block"]
             movers_line_count = len(movers_block.split('\n')) if movers_block else 0
             print(f"🚀 한국 특징주 요약: {movers_line_count}줄")
             
@@ -318,17 +587,17 @@ class MarketPoster:
             print("📝 한국 장 마감 템플릿 렌더링 완료")
             
             # 포스팅
-            result = self.client.post(content)
+            result = self._publish("kr_close", content, publish)
             result["slot"] = "kr_close"
             result["timestamp"] = datetime.now().isoformat()
             result["content"] = content
             
             return result
-            
+        
         except Exception as e:
             return {"success": False, "error": str(e), "slot": "kr_close"}
     
-    def post_us_preview(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def post_us_preview(self, data: Dict[str, Any], publish: bool = True) -> Dict[str, Any]:
         """미국 개장 전 포스팅"""
         try:
             print("🔄 미국 개장 전 데이터 수집 중...")
@@ -336,7 +605,7 @@ class MarketPoster:
             # 네이버 크롤링 데이터 사용
             try:
                 # 네이버 데이터 로드
-                naver_data = self.naver_adapter.load_naver_data()
+                naver_data = self._load_naver_data("us_preview", refresh=publish)
                 if not naver_data:
                     print("⚠️ 네이버 데이터 로드 실패, 샘플 데이터 사용")
                     realtime_data = data
@@ -347,7 +616,7 @@ class MarketPoster:
                     realtime_data = self.naver_adapter.convert_to_us_preview_format(naver_data)
                     
                     print("✅ 네이버 데이터를 미국 개장 전 형식으로 변환 완료")
-                    
+            
             except Exception as e:
                 print(f"⚠️ 네이버 데이터 처리 실패, 샘플 데이터 사용: {e}")
                 realtime_data = data
@@ -381,17 +650,17 @@ class MarketPoster:
             print("📝 미국 개장 전 템플릿 렌더링 완료")
             
             # 포스팅
-            result = self.client.post(content)
+            result = self._publish("us_preview", content, publish)
             result["slot"] = "us_preview"
             result["timestamp"] = datetime.now().isoformat()
             result["content"] = content
             
             return result
-            
+        
         except Exception as e:
             return {"success": False, "error": str(e), "slot": "us_preview"}
     
-    def post_us_premkt(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def post_us_premkt(self, data: Dict[str, Any], publish: bool = True) -> Dict[str, Any]:
         """미국 장전 포스팅"""
         try:
             print("🔄 미국 장전 데이터 수집 중...")
@@ -399,7 +668,7 @@ class MarketPoster:
             # 네이버 크롤링 데이터 사용
             try:
                 # 네이버 데이터 로드
-                naver_data = self.naver_adapter.load_naver_data()
+                naver_data = self._load_naver_data("us_premkt", refresh=publish)
                 if not naver_data:
                     print("⚠️ 네이버 데이터 로드 실패, 샘플 데이터 사용")
                     realtime_data = data
@@ -410,7 +679,7 @@ class MarketPoster:
                     realtime_data = self.naver_adapter.convert_to_us_preview_format(naver_data)
                     
                     print("✅ 네이버 데이터를 미국 장전 형식으로 변환 완료")
-                    
+            
             except Exception as e:
                 print(f"⚠️ 네이버 데이터 처리 실패, 샘플 데이터 사용: {e}")
                 realtime_data = data
@@ -444,13 +713,13 @@ class MarketPoster:
             print("📝 미국 장전 템플릿 렌더링 완료")
             
             # 포스팅
-            result = self.client.post(content)
+            result = self._publish("us_premkt", content, publish)
             result["slot"] = "us_premkt"
             result["timestamp"] = datetime.now().isoformat()
             result["content"] = content
             
             return result
-            
+        
         except Exception as e:
             return {"success": False, "error": str(e), "slot": "us_premkt"}
     
@@ -494,3 +763,13 @@ class MarketPoster:
                 return False
         
         return True
+
+# 프로세스 공용 인스턴스 (데몬에서 슬롯 간 클라이언트 재사용)
+_shared_poster: Optional[MarketPoster] = None
+
+def get_poster() -> MarketPoster:
+    """공용 MarketPoster 반환 (최초 호출 시 생성)"""
+    global _shared_poster
+    if _shared_poster is None:
+        _shared_poster = MarketPoster()
+    return _shared_poster
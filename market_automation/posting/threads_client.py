@@ -3,10 +3,11 @@ Threads API 클라이언트
 실제 포스팅 또는 프리뷰 모드
 """
 
-import requests
 import json
 from typing import Dict, Any, Optional
 from ..config import config
+from ..net.session import sessions
+from ..net.ratelimit import limiter
 
 class ThreadsClient:
     def __init__(self):
@@ -17,6 +18,7 @@ class ThreadsClient:
         
         # Threads API 엔드포인트 (실제)
         self.base_url = "https://graph.threads.net/v1.0"
+        self.session = sessions.get(self.base_url)
         self.session_id = None
     
     def login(self) -> bool:
@@ -37,7 +39,7 @@ class ThreadsClient:
             }
             
             # 간단한 API 호출로 토큰 유효성 확인
-            response = requests.get(f"{self.base_url}/me?fields=id,name", headers=headers)
+            response = self.session.get(f"{self.base_url}/me?fields=id,name", headers=headers)
             
             if response.status_code == 200:
                 print("✅ Threads 로그인 성공")
@@ -66,6 +68,8 @@ class ThreadsClient:
                 return {"success": False, "error": "Login failed"}
         
         try:
+            # 게시/답글 일일 한도 확인 (소진 시 QuotaExceeded → 실패 결과)
+            limiter.acquire("threads", "reply" if reply_to else "publish")
             headers = {
                 "Authorization": f"Bearer {self.access_token}",
                 "Content-Type": "application/json"
@@ -82,7 +86,7 @@ class ThreadsClient:
             # Threads API는 2단계 프로세스를 사용합니다
             # 1단계: 미디어 컨테이너 생성
             data["media_type"] = "TEXT"  # 대문자로 변경
-            response = requests.post(f"{self.base_url}/{self.user_id}/threads", headers=headers, json=data)
+            response = self.session.post(f"{self.base_url}/{self.user_id}/threads", headers=headers, json=data)
             
             if response.status_code == 200:
                 result = response.json()
@@ -93,7 +97,7 @@ class ThreadsClient:
                 time.sleep(2)  # Facebook 권장사항: 30초, 테스트용으로 2초
                 
                 publish_data = {"creation_id": container_id}
-                publish_response = requests.post(f"{self.base_url}/{self.user_id}/threads_publish", headers=headers, json=publish_data)
+                publish_response = self.session.post(f"{self.base_url}/{self.user_id}/threads_publish", headers=headers, json=publish_data)
                 
                 if publish_response.status_code == 200:
                     publish_result = publish_response.json()
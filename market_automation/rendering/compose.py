@@ -3,59 +3,249 @@ LLM을 사용한 콘텐츠 합성
 숫자 기반 요약만 수행
 """
 
+import contextvars
 import json
-import openai
-from typing import Dict, Any, List
+import re
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Callable, Dict, Any, List, Optional
 from ..config import config
+from ..net.ratelimit import limiter
+from ..net.resilience import remaining
+from .llmcache import bucket, llm_cache
+
+# LLM 설정 (캐시 키에 포함)
+LLM_MODEL = "gpt-3.5-turbo"
+LLM_SYSTEM = "당신은 증시 애널리스트입니다. 숫자만을 근거로 간결하게 요약하세요. 요청한 키만 가진 JSON 객체 하나로 답하세요."
+LLM_TEMPERATURE = 0.3
+
+# 생성 섹션: 이름 → (프롬프트 생성, 규칙 기반 대체, 형식 검증) 메서드 이름 - 새 섹션은 여기에 추가
+# 세 메서드는 섹션 입력을 키워드 인자로 받음 (검증은 첫 인자로 LLM 출력)
+SECTIONS = {
+    "sector_line": ("_sector_prompt", "_compose_sector_summary_rule_based", "_valid_sector_line"),
+    "movers_block": ("_movers_prompt", "compose_movers_summary", "_valid_movers_block"),
+}
+
+# 섹션별 출력 토큰 상한 (배치 요청은 합계 사용)
+SECTION_MAX_TOKENS = {"sector_line": 100, "movers_block": 200}
+
+# 섹터 요약으로 인정하는 최대 길이 (프롬프트는 40자 내외를 요구)
+SECTOR_MAX_CHARS = 80
+
+# 특징주 블록 최대 길이/줄 수 (프롬프트는 120자 이내, 3~5개 종목을 요구)
+MOVERS_MAX_CHARS = 200
+MOVERS_MAX_LINES = 5
+
+# 특징주 한 줄 형식: "티커 — 요인 (+1.2%)"
+MOVER_LINE = re.compile(r"^(?P<symbol>\S.*?) — (?P<reason>.+) \((?P<pct>[+-]?\d+(?:\.\d+)?)%\)$")
+
+# 이보다 예산이 적게 남으면 LLM 호출을 시작하지 않음 (초)
+MIN_LLM_BUDGET = 0.5
 
 class ContentComposer:
     def __init__(self):
         self.config = config
-        # OpenAI API 설정
-        openai.api_key = self.config.get_openai_api_key()
+        # LLM 호출 예산(초) 상한, 슬롯 마감 전 렌더링/게시용으로 남겨둘 시간(초)
+        self.llm_budget = float(self.config.get("LLM_BUDGET_SEC", "8"))
+        self.llm_reserve = float(self.config.get("LLM_PUBLISH_RESERVE_SEC", "5"))
+        self._llm_client = None
+        self._client_lock = threading.Lock()
+    
+    def _get_llm_client(self):
+        """OpenAI 클라이언트 (한 번 만들어 커넥션 풀 재사용) - import 비용이 커서 LLM 경로에서만 로드"""
+        with self._client_lock:
+            if self._llm_client is None:
+                import openai
+                from ..net.cassette import http_client
+                # 재시도는 예산 안에서 의미가 없으므로 끔 (실패하면 규칙 기반 결과 사용)
+                self._llm_client = openai.OpenAI(api_key=self.config.get_openai_api_key(),
+                                                 http_client=http_client(), max_retries=0)
+            return self._llm_client
+    
+    def llm_budget_sec(self) -> float:
+        """이번 LLM 호출 예산 - 슬롯 마감(발행 예산)이 있으면 렌더링/게시 시간을 뺀 남은 시간으로 제한"""
+        left = remaining()
+        if left is None:
+            return self.llm_budget
+        return max(0.0, min(self.llm_budget, left - self.llm_reserve))
     
-    def compose_sector_summary(self, top_sectors: List[Dict], bottom_sectors: List[Dict]) -> str:
-        """섹터 요약 생성 (LLM 사용)"""
+    def _start_llm(self, system: str, prompt: str, model: str, temperature: float, max_tokens: int,
+                   timeout: float, cache_key: str, valid: Callable[[str], bool], **options) -> Future:
+        """LLM 요청을 백그라운드로 시작 - 예산을 넘겨 늦게 끝난 응답도 (valid면) 캐시에 저장해서 다음 슬롯이 재사용
+
+        데몬 스레드를 써서 cron 실행에서 응답을 기다리느라 프로세스 종료가 늦어지지 않도록 함
+        """
+        future: Future = Future()
+        
+        def call():
+            try:
+                client = self._get_llm_client()
+                limiter.acquire("openai")
+                started = time.perf_counter()
+                response = client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": system},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    timeout=timeout,
+                    **options
+                )
+                text = response.choices[0].message.content.strip()
+                if valid(text):
+                    llm_cache.put(cache_key, text, (time.perf_counter() - started) * 1000, model)
+                future.set_result(text)
+            except BaseException as e:
+                future.set_exception(e)
+        
+        threading.Thread(target=contextvars.copy_context().run, args=(call,), name="llm", daemon=True).start()
+        return future
+    
+    def _sector_prompt(self, top_sectors: List[Dict], bottom_sectors: List[Dict]) -> Optional[str]:
+        """섹터 요약 프롬프트 (수치는 캐시 구간 단위로 반올림해서 근접 입력이 같은 프롬프트가 되도록)"""
         if not top_sectors and not bottom_sectors:
-            return "데이터 부족"
+            return None
+        from .prompts import SECTOR_LINE
         
-        try:
-            # LLM 프롬프트 생성
-            from .prompts import SECTOR_LINE
-            
-            top_json = json.dumps([{
-                "name": self.config.get_sector_alias(sector["name"]),
-                "ret1d": sector["ret1d"],
-                "breadth": sector["breadth"]
-            } for sector in top_sectors[:3]], ensure_ascii=False)
-            
-            bottom_json = json.dumps([{
+        def sector_json(sectors: List[Dict]) -> str:
+            return json.dumps([{
                 "name": self.config.get_sector_alias(sector["name"]),
-                "ret1d": sector["ret1d"],
-                "breadth": sector["breadth"]
-            } for sector in bottom_sectors[:2]], ensure_ascii=False)
-            
-            prompt = SECTOR_LINE.format(top_json=top_json, bottom_json=bottom_json)
+                "ret1d": bucket(sector["ret1d"], llm_cache.ret_step),
+                "breadth": bucket(sector["breadth"], llm_cache.breadth_step)
+            } for sector in sectors], ensure_ascii=False)
+        
+        return SECTOR_LINE.format(top_json=sector_json(top_sectors[:3]), bottom_json=sector_json(bottom_sectors[:2]))
+    
+    def _valid_sector_line(self, text: Any, top_sectors: List[Dict] = (), bottom_sectors: List[Dict] = ()) -> bool:
+        """LLM 섹터 요약 형식 검증 (한 줄, 길이 제한)"""
+        return isinstance(text, str) and bool(text.strip()) and "\n" not in text.strip() and len(text) <= SECTOR_MAX_CHARS
+    
+    def _mover_inputs(self, movers: List[Dict]) -> List[Dict]:
+        """규칙 기반 블록과 같은 기준으로 고른 특징주 (상위 5개 중 종목/요인이 있는 것)"""
+        return [{"symbol": mover["symbol"], "reason": mover["reason"], "ret1d": round(mover.get("ret1d", 0), 1)}
+                for mover in movers[:MOVERS_MAX_LINES] if mover.get("symbol") and mover.get("reason")]
+    
+    def _movers_prompt(self, movers: List[Dict]) -> Optional[str]:
+        """특징주 블록 프롬프트 (등락률은 표시 자릿수로 반올림)"""
+        selected = self._mover_inputs(movers)
+        if not selected:
+            return None
+        from .prompts import MOVERS_BLOCK
+        return MOVERS_BLOCK.format(movers_json=json.dumps(selected, ensure_ascii=False))
+    
+    def _valid_movers_block(self, text: Any, movers: List[Dict] = ()) -> bool:
+        """LLM 특징주 블록 검증 - 줄마다 "티커 — 요인 (등락률%)" 형식, 입력에 있는 종목과 등락률만 허용"""
+        if not isinstance(text, str) or not text.strip() or len(text) > MOVERS_MAX_CHARS:
+            return False
+        lines = text.strip().split("\n")
+        if len(lines) > MOVERS_MAX_LINES:
+            return False
+        expected = {mover["symbol"]: mover["ret1d"] for mover in self._mover_inputs(list(movers))}
+        for line in lines:
+            match = MOVER_LINE.match(line.strip())
+            if not match or match["symbol"] not in expected:
+                return False
+            if abs(float(match["pct"]) - expected[match["symbol"]]) > 0.051:
+                return False
+        return True
+    
+    def compose_sections(self, inputs: Dict[str, Dict[str, Any]], slot: str = "") -> Dict[str, str]:
+        """여러 생성 섹션을 한 번의 JSON 모드 LLM 호출로 합성 - 슬롯당 LLM 왕복 최대 1회
+
+        inputs: 섹션 이름(SECTIONS) → 해당 메서드의 키워드 인자.
+        규칙 기반 결과를 먼저 만들고, 예산 안에 온 LLM 응답 중 형식 검증을 통과한 섹션만 교체 (섹션별 폴백).
+        같은 입력이면 디스크 캐시 응답 재사용. 섹션별 결과(llm/cache/fallback/timeout)는 슬롯별로 기록
+        """
+        results: Dict[str, str] = {}
+        prompts: Dict[str, str] = {}
+        for name, kwargs in inputs.items():
+            prompt_method, fallback_method, _ = SECTIONS[name]
+            results[name] = getattr(self, fallback_method)(**kwargs)
+            try:
+                prompt = getattr(self, prompt_method)(**kwargs)
+            except (KeyError, TypeError, ValueError) as e:
+                # 입력 형식이 달라 프롬프트를 만들 수 없으면 이 섹션만 규칙 기반 사용
+                print(f"⚠️ LLM {name} 프롬프트 생성 실패, 규칙 기반 사용: {e!r}")
+                llm_cache.record_outcome(slot, "fallback")
+                continue
+            if prompt:
+                prompts[name] = prompt
+        
+        if not prompts:
+            return results
+        
+        def record(outcome: str, names=prompts):
+            for name in names:
+                llm_cache.record_outcome(slot, outcome)
+        
+        try:
+            from .prompts import BATCH_SECTIONS, BATCH_SECTION
             
-            # OpenAI API 호출 (최신 버전)
-            client = openai.OpenAI(api_key=self.config.get_openai_api_key())
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "당신은 증시 애널리스트입니다. 숫자만을 근거로 간결하게 요약하세요."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=100,
-                temperature=0.3
+            prompt = BATCH_SECTIONS.format(
+                keys=", ".join(prompts),
+                sections="\n\n".join(BATCH_SECTION.format(name=name, prompt=text) for name, text in prompts.items())
             )
             
-            summary = response.choices[0].message.content.strip()
-            return summary
+            def parse(text: Optional[str]) -> Optional[Dict[str, Any]]:
+                try:
+                    parsed = json.loads(text) if text else None
+                except ValueError:
+                    return None
+                return parsed if isinstance(parsed, dict) else None
+            
+            cache_key = llm_cache.key(LLM_MODEL, LLM_SYSTEM, prompt, LLM_TEMPERATURE)
+            parsed = parse(llm_cache.get(cache_key, slot))
+            outcome = "cache"
+            if parsed is not None:
+                print("🧠 LLM 캐시 적중 (API 호출 생략)")
+            else:
+                budget = self.llm_budget_sec()
+                if budget < MIN_LLM_BUDGET:
+                    print(f"⏱️ LLM 예산 부족 ({budget:.1f}초), 규칙 기반 합성 사용")
+                    record("timeout")
+                    return results
+                
+                max_tokens = sum(SECTION_MAX_TOKENS.get(name, 100) for name in prompts)
+                future = self._start_llm(LLM_SYSTEM, prompt, LLM_MODEL, LLM_TEMPERATURE, max_tokens, budget,
+                                         cache_key, lambda text: parse(text) is not None,
+                                         response_format={"type": "json_object"})
+                try:
+                    parsed = parse(future.result(timeout=budget))
+                except FutureTimeout:
+                    print(f"⏱️ LLM 합성 예산({budget:.1f}초) 초과, 규칙 기반 합성 사용")
+                    record("timeout")
+                    return results
+                if parsed is None:
+                    print("⚠️ LLM 응답이 JSON 객체가 아님, 규칙 기반으로 대체")
+                    record("fallback")
+                    return results
+                outcome = "llm"
             
+            for name in prompts:
+                text = parsed.get(name)
+                if getattr(self, SECTIONS[name][2])(text, **inputs[name]):
+                    results[name] = text.strip()
+                    record(outcome, [name])
+                else:
+                    print(f"⚠️ LLM {name} 형식 오류, 규칙 기반으로 대체: {text!r}")
+                    record("fallback", [name])
+            return results
+        
         except Exception as e:
-            print(f"⚠️ LLM 요약 실패, 규칙 기반으로 대체: {e}")
+            print(f"⚠️ LLM 합성 실패, 규칙 기반으로 대체: {e}")
             # LLM 실패 시 규칙 기반으로 대체
-            return self._compose_sector_summary_rule_based(top_sectors, bottom_sectors)
+            record("fallback")
+            return results
+    
+    def compose_sector_summary(self, top_sectors: List[Dict], bottom_sectors: List[Dict], slot: str = "") -> str:
+        """섹터 요약 생성 (LLM 사용, 예산 초과/실패 시 규칙 기반) - 다른 섹션과 함께 만들 때는 compose_sections 사용"""
+        if not top_sectors and not bottom_sectors:
+            return "데이터 부족"
+        sections = self.compose_sections({"sector_line": {"top_sectors": top_sectors, "bottom_sectors": bottom_sectors}}, slot)
+        return sections["sector_line"]
     
     def _compose_sector_summary_rule_based(self, top_sectors: List[Dict], bottom_sectors: List[Dict]) -> str:
         """섹터 요약 생성 (규칙 기반, LLM 실패 시 사용)"""
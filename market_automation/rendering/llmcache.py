@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+LLM 응답 디스크 캐시
+모델 + 시스템 프롬프트 + 렌더링된 사용자 프롬프트 + temperature의 해시로 응답을 보관 (TTL, 전체 크기 상한 LRU 삭제)
+입력 수치는 구간 단위로 반올림해 거의 같은 입력이 같은 키가 되도록 함 (bucket)
+슬롯별 적중률/절약 지연과 합성 결과(LLM 사용/캐시/대체/예산 초과)는 프로세스 간 누적 기록
+사용법: python -m market_automation.rendering.llmcache  (슬롯별 적중률, 절약 시간, 합성 결과, 캐시 크기 출력)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..config import config
+from ..storage.files import cache_dir, file_lock, read_json, atomic_write_json
+
+# 합성 결과 종류 (llm: 예산 안에 LLM 응답 사용, cache: 캐시 응답, fallback: 실패/형식 오류로 규칙 기반, timeout: 예산 초과로 규칙 기반)
+OUTCOMES = ("llm", "cache", "fallback", "timeout")
+
+def bucket(value: Any, step: float) -> Any:
+    """value를 step 단위로 반올림 (step이 0이거나 숫자가 아니면 그대로)"""
+    if not step or not isinstance(value, (int, float)):
+        return value
+    return round(round(value / step) * step, 6)
+
+class LLMCache:
+    """키(해시)별 JSON 파일 캐시 - 적중 시 mtime을 갱신해서 LRU 순서 유지"""
+    
+    def __init__(self, directory: Optional[str] = None):
+        # 설정값과 캐시 디렉토리는 첫 사용 때 결정 (import 시 .env 로드 방지)
+        self._directory = directory
+        self._counters: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+    
+    @cached_property
+    def enabled(self) -> bool:
+        return config.get("LLM_CACHE", "true").lower() == "true"
+    
+    @cached_property
+    def directory(self) -> Path:
+        return Path(self._directory or config.get("LLM_CACHE_DIR", "") or cache_dir() / "llm")
+    
+    @cached_property
+    def ttl(self) -> float:
+        return float(config.get("LLM_CACHE_TTL_HOURS", "24")) * 3600
+    
+    @cached_property
+    def max_bytes(self) -> int:
+        return int(config.get("LLM_CACHE_MAX_KB", "1024")) * 1024
+    
+    @cached_property
+    def ret_step(self) -> float:
+        """근접 입력 구간: 수익률 %p (0이면 반올림 안 함)"""
+        return float(config.get("LLM_BUCKET_RET1D", "0.1"))
+    
+    @cached_property
+    def breadth_step(self) -> float:
+        """근접 입력 구간: 브레드스 비율 (0이면 반올림 안 함)"""
+        return float(config.get("LLM_BUCKET_BREADTH", "0.05"))
+    
+    @property
+    def stats_path(self) -> Path:
+        return self.directory / "stats.json"
+    
+    @property
+    def lock_path(self) -> Path:
+        return self.directory / ".lock"
+    
+    def key(self, model: str, system: str, prompt: str, temperature: float) -> str:
+        """요청 내용 해시"""
+        payload = json.dumps([model, system, prompt, temperature], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+    
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+    
+    def get(self, key: str, slot: str = "") -> Optional[str]:
+        """캐시된 응답 (없거나 TTL이 지났으면 None) - 적중/미스와 절약 지연을 슬롯별로 기록"""
+        if not self.enabled:
+            return None
+        
+        path = self._path(key)
+        entry = read_json(path)
+        if entry and time.time() - entry.get("stored_at", 0) <= self.ttl:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            self._record(slot, hit=True, saved_ms=entry.get("latency_ms", 0.0))
+            return entry["response"]
+        
+        if entry:
+            path.unlink(missing_ok=True)
+        self._record(slot, hit=False)
+        return None
+    
+    def put(self, key: str, response: str, latency_ms: float, model: str = ""):
+        """응답 저장 후 전체 크기가 상한을 넘으면 오래 안 쓴 항목부터 삭제"""
+        if not self.enabled:
+            return
+        try:
+            atomic_write_json(self._path(key), {"response": response, "model": model,
+                                                "latency_ms": round(latency_ms, 1), "stored_at": time.time()})
+            self._evict()
+        except OSError as e:
+            print(f"⚠️ LLM 캐시 저장 실패: {e}")
+    
+    def _evict(self):
+        """만료 항목 삭제 + 크기 상한 LRU 삭제 (프로세스 간 잠금)"""
+        with file_lock(self.lock_path):
+            now = time.time()
+            entries = []
+            for path in self.directory.glob("*.json"):
+                if path == self.stats_path:
+                    continue
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                # mtime(마지막 사용) ≥ 저장 시각이므로 mtime이 TTL을 넘었으면 만료
+                if now - stat.st_mtime > self.ttl:
+                    path.unlink(missing_ok=True)
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+    
+    def _record(self, slot: str, hit: bool, saved_ms: float = 0.0):
+        """슬롯별 적중/미스/절약 시간(ms) 누적"""
+        self._add(slot, {"hits": int(hit), "misses": int(not hit), "saved_ms": saved_ms})
+    
+    def record_outcome(self, slot: str, outcome: str):
+        """슬롯별 합성 결과 누적 - OUTCOMES 중 하나 (LLM 응답 사용/캐시/규칙 기반 대체/예산 초과)"""
+        self._add(slot, {outcome: 1})
+    
+    def _add(self, slot: str, delta: Dict[str, float]):
+        """슬롯별 카운터 누적 - 프로세스 내 + 통계 파일"""
+        slot = slot or "-"
+        with self._lock:
+            counters = self._counters.setdefault(slot, {"hits": 0, "misses": 0, "saved_ms": 0.0})
+            for name, value in delta.items():
+                counters[name] = counters.get(name, 0) + value
+        try:
+            with file_lock(self.lock_path):
+                stats = read_json(self.stats_path)
+                entry = stats.setdefault(slot, {"hits": 0, "misses": 0, "saved_ms": 0.0})
+                for name, value in delta.items():
+                    entry[name] = round(entry.get(name, 0) + value, 1)
+                atomic_write_json(self.stats_path, stats)
+        except OSError as e:
+            print(f"⚠️ LLM 캐시 통계 저장 실패: {e}")
+    
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """이 프로세스의 슬롯별 {"hits", "misses", "hit_rate", "saved_ms", 합성 결과별 횟수}"""
+        with self._lock:
+            return {slot: dict(c, hit_rate=round(c["hits"] / max(1, c["hits"] + c["misses"]), 3))
+                    for slot, c in self._counters.items()}
+
+# 전역 LLM 캐시
+llm_cache = LLMCache()
+
+def main():
+    """메인 함수"""
+    stats = read_json(llm_cache.stats_path)
+    entries = [path for path in llm_cache.directory.glob("*.json") if path != llm_cache.stats_path]
+    size = sum(path.stat().st_size for path in entries)
+    print(f"🧠 LLM 캐시: {llm_cache.directory} ({len(entries)}건, {size / 1024:.1f}KB / 상한 {llm_cache.max_bytes // 1024}KB)")
+    if not stats:
+        print("기록 없음")
+        return
+    print(f"{'슬롯':<14}{'적중':>8}{'미스':>8}{'적중률':>9}{'절약(초)':>10}" + "".join(f"{name:>10}" for name in OUTCOMES))
+    for slot, entry in sorted(stats.items()):
+        total = entry["hits"] + entry["misses"]
+        rate = entry["hits"] / total if total else 0.0
+        print(f"{slot:<14}{entry['hits']:>8.0f}{entry['misses']:>8.0f}{rate:>9.1%}{entry['saved_ms'] / 1000:>10.1f}"
+              + "".join(f"{entry.get(name, 0):>10.0f}" for name in OUTCOMES))
+
+if __name__ == "__main__":
+    main()
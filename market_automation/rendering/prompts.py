@@ -15,3 +15,13 @@ MOVERS_BLOCK = """역할: 속보 요약. 입력 리스트에서 3~5개 종목을
 출력 형식: "티커 — 요인 (등락률%)" 각 줄바꿈.
 제약: 입력 외 정보 금지, 120자 이내.
 입력: {movers_json}"""
+
+
+BATCH_SECTIONS = """아래 과제를 모두 수행하고 JSON 객체 하나로만 답하세요.
+키: {keys} (키마다 해당 과제의 출력 문자열, 여러 줄은 \\n으로 구분)
+각 과제는 자기 입력만 근거로 하고 출력 형식/길이 제약을 지킬 것.
+
+{sections}"""
+
+BATCH_SECTION = """[{name}]
+{prompt}"""
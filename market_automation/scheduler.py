@@ -0,0 +1,91 @@
+"""
+슬롯 작업 등록 모듈
+각 슬롯 스크립트의 main()을 KST 스케줄 작업으로 등록 (크론/데몬 공용)
+"""
+
+import contextvars
+import importlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .config import config
+from .trading_calendar import KST, get_calendar
+
+@dataclass(frozen=True)
+class SlotJob:
+    """KST 기준으로 실행되는 슬롯 작업"""
+    name: str
+    time: str                 # "HH:MM" (KST)
+    weekdays: Tuple[int, ...]  # 0=월 ... 6=일
+    module: str               # main()을 가진 슬롯 모듈
+    market: str = ""          # 거래일을 확인할 시장 (KRX/NYSE, 빈 값이면 확인 안 함)
+    session_offset: int = 0   # 실행일 기준 확인할 세션 날짜 (-1: 전날 세션)
+    
+    @property
+    def hour(self) -> int:
+        return int(self.time.split(":")[0])
+    
+    @property
+    def minute(self) -> int:
+        return int(self.time.split(":")[1])
+    
+    def session_day(self, day: date) -> date:
+        """실행일에 대응하는 세션 날짜"""
+        return day + timedelta(days=self.session_offset)
+    
+    def is_session_day(self, day: date) -> bool:
+        """실행일에 대응하는 세션이 열리는지 (휴장일이면 실행하지 않음)"""
+        if not self.market:
+            return True
+        return get_calendar(self.market).is_session(self.session_day(day))
+    
+    def load(self) -> Callable[[], None]:
+        """슬롯 모듈의 main() 반환 (한 번 import 후 재사용)"""
+        return importlib.import_module(self.module).main
+
+MON_TO_FRI = (0, 1, 2, 3, 4)
+MON_TO_SAT = (0, 1, 2, 3, 4, 5)
+
+# CRON_SETUP.md의 크론 스케줄과 동일
+# 07:00 미국 마감은 전날(미국 현지) 세션, 나머지는 당일 세션 기준
+SLOT_JOBS: List[SlotJob] = [
+    SlotJob("us_close", "07:00", MON_TO_SAT, "market_automation.slots.run_0700_us_close", "NYSE", -1),
+    SlotJob("kr_preopen", "08:30", MON_TO_FRI, "market_automation.slots.run_0830_kr_preopen", "KRX"),
+    SlotJob("kr_midday", "12:00", MON_TO_FRI, "market_automation.slots.run_1200_kr_midday", "KRX"),
+    SlotJob("kr_close", "16:00", MON_TO_FRI, "market_automation.slots.run_1600_kr_close", "KRX"),
+    SlotJob("us_preview", "20:00", MON_TO_FRI, "market_automation.slots.run_2000_us_preview", "NYSE"),
+    SlotJob("us_premkt", "23:00", MON_TO_FRI, "market_automation.slots.run_2300_us_premkt", "NYSE"),
+]
+
+def get_jobs() -> Dict[str, SlotJob]:
+    """이름별 슬롯 작업"""
+    return {job.name: job for job in SLOT_JOBS}
+
+# 데몬이 실행 중인 슬롯의 예정 실행일 (자정을 넘긴 캐치업도 예정일 기준으로 세션 확인)
+_run_day: contextvars.ContextVar = contextvars.ContextVar("run_day", default=None)
+
+@contextmanager
+def run_day(day: date):
+    """블록 안의 session_gate가 오늘 대신 day를 실행일로 사용"""
+    token = _run_day.set(day)
+    try:
+        yield
+    finally:
+        _run_day.reset(token)
+
+def session_gate(name: str, now: Optional[datetime] = None, day: Optional[date] = None) -> bool:
+    """슬롯 실행 여부 - 대응 세션이 휴장이면 False (SLOT_SESSION_GATE=false로 해제)
+
+    실행일: day → now의 날짜 → 데몬이 지정한 예정 실행일(run_day) → 오늘(KST) 순
+    """
+    job = get_jobs().get(name)
+    if not job or config.get("SLOT_SESSION_GATE", "true").lower() != "true":
+        return True
+    
+    day = day or (now.date() if now else None) or _run_day.get() or datetime.now(KST).date()
+    if job.is_session_day(day):
+        return True
+    print(f"🏖️ {job.market} 휴장일({job.session_day(day)}) - {name} 슬롯 건너뜀")
+    return False
@@ -13,17 +13,20 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from market_automation.posting.poster import MarketPoster
+from market_automation.posting.poster import get_poster
 from market_automation.config import config
+from market_automation.scheduler import session_gate
 
 def main():
     """메인 실행 함수"""
     print(f"🕐 {__file__} 실행 시작")
+    if not session_gate("us_close"):
+        return
     print(f"🔧 DRY_RUN 모드: {config.is_dry_run()}")
     
     try:
         # 포스터 초기화
-        poster = MarketPoster()
+        poster = get_poster()
         
         # 샘플 데이터 로드 (실제 운영 시에는 API에서 데이터 수집)
         sample_file = project_root / "samples" / "sample_us_close.json"
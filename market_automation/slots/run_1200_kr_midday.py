@@ -13,18 +13,21 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from market_automation.posting.poster import MarketPoster
+from market_automation.posting.poster import get_poster
 from market_automation.config import config
+from market_automation.scheduler import session_gate
 from market_automation.datasource.naver_adapter import NaverDataAdapter
 
 def main():
     """메인 실행 함수"""
     print(f"🕐 {__file__} 실행 시작")
+    if not session_gate("kr_midday"):
+        return
     print(f"🔧 DRY_RUN 모드: {config.is_dry_run()}")
     
     try:
         # 포스터 초기화
-        poster = MarketPoster()
+        poster = get_poster()
         
         # 네이버 데이터 어댑터 초기화
         naver_adapter = NaverDataAdapter()
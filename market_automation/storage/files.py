@@ -0,0 +1,67 @@
+"""
+파일 저장 유틸리티
+프로세스 간 파일 잠금과 원자적 JSON 저장
+"""
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows 등 fcntl 미지원 환경
+    fcntl = None
+
+def cache_dir() -> Path:
+    """런타임 캐시 디렉토리 (~/.cache/market_automation)"""
+    path = Path.home() / ".cache" / "market_automation"
+    path.mkdir(parents=True, exist_ok=True, mode=0o700)
+    return path
+
+@contextmanager
+def file_lock(lock_path: Path, blocking: bool = True):
+    """lock 파일 기반 프로세스 간 배타 잠금 (비차단 모드에서 실패 시 BlockingIOError)"""
+    lock_path = Path(lock_path)
+    lock_path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        if fcntl:
+            flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            fcntl.flock(fd, flags)
+        yield
+    finally:
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+def read_json(path: Path, default: Optional[Any] = None) -> Any:
+    """JSON 파일 로드 (없거나 손상 시 기본값)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {} if default is None else default
+
+def atomic_write_bytes(path: Path, data: bytes):
+    """임시 파일에 쓰고 fsync 후 교체하는 원자적 저장 (0600 권한)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    # mkstemp는 0600 권한으로 파일을 생성
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def atomic_write_json(path: Path, data: Any):
+    """JSON 원자적 저장"""
+    atomic_write_bytes(path, json.dumps(data, ensure_ascii=False).encode("utf-8"))
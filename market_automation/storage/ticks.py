@@ -0,0 +1,192 @@
+"""
+종목별 분봉 링 버퍼 저장소
+실시간 스트림의 분봉/체결을 종목당 고정 크기 NumPy 구조화 배열에 덮어쓰며 보관 (체결마다 dict를 만들지 않음)
+최신 체결가·당일 누적 거래량·전일 종가는 종목 인덱스로 접근하는 열 배열에 유지
+"""
+
+import threading
+from datetime import date, datetime, timedelta
+from functools import cached_property
+from typing import Any, Dict, List, Optional
+
+import pytz
+
+from ..config import config
+from ..trading_calendar import ET, NYSE
+
+# 기본 보관 분봉 수 (정규장 하루 390분)
+DEFAULT_CAPACITY = 390
+
+# 분봉 레코드: 시각(epoch 초), 시가/고가/저가/종가, 거래량
+BAR_FIELDS = [("t", "<i8"), ("o", "<f8"), ("h", "<f8"), ("l", "<f8"), ("c", "<f8"), ("v", "<f8")]
+
+# 종목별 열 배열 (최신 체결가/수량/시각, 당일 누적 거래량·거래일, 전일 종가와 그 기준 거래일, 스냅샷 기준 시각)
+COLUMNS = ("last_price", "last_size", "last_t", "day_volume", "day", "prev_close", "prev_day", "base_t")
+
+class TickStore:
+    """종목 × 분봉 링 버퍼 - 스트림 스레드가 쓰고 슬롯 스레드가 읽음
+
+    배열은 첫 기록 때 할당하고 종목 수가 늘면 두 배로 키움. 같은 시각 분봉(갱신 분봉)은 덮어씀.
+    """
+    
+    def __init__(self, capacity: Optional[int] = None, initial_symbols: int = 64):
+        # 보관 분봉 수는 첫 기록 때 결정 (import 시 .env 로드 방지)
+        self._capacity = capacity
+        self.index: Dict[str, int] = {}
+        self._rows = initial_symbols
+        self._bars = None
+        self._lock = threading.Lock()
+        self._day_range = (0.0, 0.0, 0)
+    
+    @cached_property
+    def capacity(self) -> int:
+        return self._capacity or int(config.get("ALPACA_STREAM_BARS", DEFAULT_CAPACITY))
+    
+    def _allocate(self, rows: int):
+        """배열 할당/확장 (기존 값 복사)"""
+        import numpy as np
+        
+        bars = np.zeros((rows, self.capacity), dtype=np.dtype(BAR_FIELDS))
+        columns = {name: np.zeros(rows, dtype=np.float64) for name in COLUMNS}
+        head = np.zeros(rows, dtype=np.int64)
+        count = np.zeros(rows, dtype=np.int64)
+        if self._bars is not None:
+            used = len(self._bars)
+            bars[:used] = self._bars
+            for name in COLUMNS:
+                columns[name][:used] = getattr(self, name)
+            head[:used], count[:used] = self.head, self.count
+        
+        self._bars, self.head, self.count = bars, head, count
+        for name, values in columns.items():
+            setattr(self, name, values)
+        self._rows = rows
+    
+    def _row(self, symbol: str) -> int:
+        """종목 행 번호 (처음 보는 종목은 새 행 배정, 잠금 안에서 호출)"""
+        row = self.index.get(symbol)
+        if row is None:
+            row = len(self.index)
+            if self._bars is None:
+                self._allocate(max(self._rows, row + 1))
+            elif row >= self._rows:
+                self._allocate(self._rows * 2)
+            self.index[symbol] = row
+        return row
+    
+    def _et_day(self, t: float) -> int:
+        """epoch 초의 미국 동부 기준 날짜 (일 단위 정수, 같은 날 범위는 캐시)"""
+        start, end, day = self._day_range
+        if start <= t < end:
+            return day
+        local = datetime.fromtimestamp(t, ET)
+        midnight = ET.localize(datetime(local.year, local.month, local.day))
+        next_midnight = ET.localize(datetime(local.year, local.month, local.day) + timedelta(days=1))
+        day = local.date().toordinal()
+        self._day_range = (midnight.timestamp(), next_midnight.timestamp(), day)
+        return day
+    
+    def track(self, symbols: List[str]):
+        """종목 행 미리 배정 (REST 스냅샷 시드 대상 표시)"""
+        with self._lock:
+            for symbol in symbols:
+                self._row(symbol)
+    
+    def add_bar(self, symbol: str, t: int, o: float, h: float, l: float, c: float, v: float):
+        """분봉 기록 (직전 분봉과 시각이 같으면 덮어씀) + 당일 누적 거래량 갱신"""
+        with self._lock:
+            row = self._row(symbol)
+            day = self._et_day(t)
+            if self.day[row] != day:
+                self.day[row], self.day_volume[row] = day, 0.0
+            
+            head, count = int(self.head[row]), int(self.count[row])
+            last = (head - 1) % self.capacity
+            ring = self._bars[row]
+            if count and ring["t"][last] == t:
+                # 갱신 분봉: 이전 거래량을 빼고 덮어씀
+                if t > self.base_t[row]:
+                    self.day_volume[row] -= ring["v"][last]
+                ring[last] = (t, o, h, l, c, v)
+            else:
+                ring[head] = (t, o, h, l, c, v)
+                self.head[row] = (head + 1) % self.capacity
+                self.count[row] = min(count + 1, self.capacity)
+            
+            # 스냅샷 거래량에 이미 포함된 분봉은 누적하지 않음
+            if t > self.base_t[row]:
+                self.day_volume[row] += v
+            if t + 60 > self.last_t[row]:
+                self.last_price[row], self.last_t[row] = c, t + 60
+    
+    def add_trade(self, symbol: str, t: float, price: float, size: float):
+        """체결 기록 (최신 체결가만 유지, 거래량은 분봉으로 누적)"""
+        with self._lock:
+            row = self._row(symbol)
+            if t >= self.last_t[row]:
+                self.last_price[row], self.last_size[row], self.last_t[row] = price, size, t
+    
+    def seed(self, symbol: str, prev_close: float, prev_day: int, volume: float = 0.0, t: float = 0.0):
+        """REST 스냅샷으로 전일 종가와 당일 누적 거래량 기준 설정
+
+        prev_day: 전일 종가의 거래일 (date.toordinal), t: 스냅샷 거래량 기준 시각 (이후 분봉만 누적)
+        """
+        with self._lock:
+            row = self._row(symbol)
+            self.prev_close[row], self.prev_day[row] = prev_close, prev_day
+            if t:
+                day = self._et_day(t)
+                if day >= self.day[row]:
+                    self.day[row], self.day_volume[row], self.base_t[row] = day, volume, t
+    
+    def bars(self, symbol: str):
+        """종목 분봉 복사본 (오래된 순 구조화 배열, 없으면 None)"""
+        with self._lock:
+            row = self.index.get(symbol)
+            if row is None or not self.count[row]:
+                return None
+            head, count = int(self.head[row]), int(self.count[row])
+            order = [(head - count + i) % self.capacity for i in range(count)]
+            return self._bars[row][order].copy()
+    
+    def latest(self, symbol: str, max_age: Optional[float] = None, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """최신 시세 (get_snapshots 항목 형식) - 없거나, max_age초보다 오래됐거나, 전일 종가가 그날 기준이 아니면 None"""
+        with self._lock:
+            row = self.index.get(symbol)
+            if row is None or not self.last_price[row]:
+                return None
+            last_t = float(self.last_t[row])
+            price, prev_close, prev_day = float(self.last_price[row]), float(self.prev_close[row]), int(self.prev_day[row])
+            volume, day = float(self.day_volume[row]), int(self.day[row])
+        
+        now = now or datetime.now().timestamp()
+        if max_age is not None and now - last_t > max_age:
+            return None
+        
+        # 전일 종가는 시드한 거래일의 다음 세션에만 유효 (날짜가 넘어갔는데 재시드 전이면 REST로)
+        last_day = self._et_day(last_t)
+        if not prev_close or NYSE.next_session(date.fromordinal(prev_day)) != date.fromordinal(last_day):
+            return None
+        return {
+            "price": price,
+            "prev_close": prev_close,
+            "volume": volume if day == last_day else 0.0,
+            "timestamp": datetime.fromtimestamp(last_t, pytz.utc).isoformat().replace("+00:00", "Z"),
+            "source": "stream",
+        }
+    
+    def symbols(self) -> List[str]:
+        """기록된 종목"""
+        with self._lock:
+            return list(self.index)
+    
+    @property
+    def nbytes(self) -> int:
+        """배열 메모리 사용량 (바이트)"""
+        if self._bars is None:
+            return 0
+        return int(self._bars.nbytes + self.head.nbytes + self.count.nbytes +
+                   sum(getattr(self, name).nbytes for name in COLUMNS))
+
+# 전역 틱 저장소 (Alpaca 스트림이 기록, AlpacaClient가 조회)
+tick_store = TickStore()
@@ -0,0 +1,382 @@
+"""
+시계열 스냅샷 저장소
+네이버/KIS/Alpaca에서 수집한 지수·섹터·특징주 스냅샷을 SQLite에 추가 전용으로 기록
+(WAL + 배치 트랜잭션, 심볼별 최신값 테이블, as-of/구간 조회 결과는 NumPy 구조체 배열)
+"""
+
+import math
+import sqlite3
+import threading
+import time
+from datetime import datetime, date
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..config import config
+from ..trading_calendar import us_session_closed
+from .files import cache_dir
+
+COLUMNS = ("ts", "source", "kind", "symbol", "name", "price", "change", "change_rate", "volume")
+NUMERIC_COLUMNS = {"ts", "price", "change", "change_rate", "volume"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    ts REAL NOT NULL,
+    source TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    name TEXT,
+    price REAL,
+    change REAL,
+    change_rate REAL,
+    volume REAL,
+    UNIQUE (kind, symbol, ts, source)
+);
+CREATE TABLE IF NOT EXISTS latest (
+    kind TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    ts REAL NOT NULL,
+    source TEXT NOT NULL,
+    name TEXT,
+    price REAL,
+    change REAL,
+    change_rate REAL,
+    volume REAL,
+    PRIMARY KEY (kind, symbol)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS daily_close (
+    symbol TEXT NOT NULL,
+    trading_date TEXT NOT NULL,
+    close REAL NOT NULL,
+    prev_close REAL,
+    change_rate REAL,
+    volume REAL,
+    source TEXT NOT NULL,
+    revision INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (symbol, trading_date)
+) WITHOUT ROWID;
+"""
+
+# 종가가 이 비율 이상 달라지면 정정으로 간주
+CLOSE_TOLERANCE = 1e-6
+
+INSERT_SQL = f"INSERT OR IGNORE INTO snapshots ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+# 더 최신 스냅샷일 때만 최신값 테이블 갱신
+UPSERT_LATEST_SQL = f"""
+INSERT INTO latest ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})
+ON CONFLICT (kind, symbol) DO UPDATE SET
+    ts = excluded.ts, source = excluded.source, name = excluded.name, price = excluded.price,
+    change = excluded.change, change_rate = excluded.change_rate, volume = excluded.volume
+WHERE excluded.ts >= latest.ts
+"""
+
+def _to_epoch(value: Any) -> float:
+    """ISO 문자열/datetime/숫자를 epoch 초로 변환 (없으면 현재 시각)"""
+    if value is None:
+        return time.time()
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return time.time()
+
+def _row(ts: Any, source: str, kind: str, symbol: str, name: Optional[str] = None, price: Any = None,
+         change: Any = None, change_rate: Any = None, volume: Any = None) -> tuple:
+    """저장용 행 튜플 생성"""
+    def num(v):
+        return None if v is None else float(v)
+    return (_to_epoch(ts), source, kind, str(symbol), name, num(price), num(change), num(change_rate), num(volume))
+
+def _to_array(rows: List[tuple]):
+    """조회 행을 NumPy 구조체 배열로 변환 (숫자 NULL은 NaN, pandas.DataFrame(array)로 바로 변환 가능)"""
+    # 기록만 하는 슬롯의 import 비용을 줄이기 위해 조회 시점에 import
+    import numpy as np
+    
+    dtype = np.dtype([(column, "f8" if column in NUMERIC_COLUMNS else "O") for column in COLUMNS])
+    array = np.empty(len(rows), dtype=dtype)
+    for i, row in enumerate(rows):
+        array[i] = tuple(math.nan if value is None and column in NUMERIC_COLUMNS else value
+                         for column, value in zip(COLUMNS, row))
+    return array
+
+class TimeSeriesStore:
+    """SQLite 기반 추가 전용 스냅샷 저장소"""
+    
+    def __init__(self, path: Optional[str] = None):
+        # DB 경로는 첫 연결 때 결정 (import 시 .env 로드 방지)
+        self._path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+    
+    @cached_property
+    def path(self) -> Path:
+        return Path(self._path or config.get("TIMESERIES_DB", "") or cache_dir() / "timeseries.sqlite3")
+    
+    def _connect(self) -> sqlite3.Connection:
+        """연결 생성 (첫 사용 시, 스키마 준비 포함)"""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+            conn = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False, isolation_level=None)
+            # WAL: 읽기와 쓰기가 서로 막지 않음, FULL: 커밋 후 전원 차단에도 유지
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=FULL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+    
+    def append(self, rows: Iterable[tuple]) -> int:
+        """스냅샷 행을 한 트랜잭션으로 기록 (같은 kind/symbol/ts/source 중복은 무시)"""
+        rows = list(rows)
+        if not rows:
+            return 0
+        
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                before = conn.total_changes
+                conn.executemany(INSERT_SQL, rows)
+                inserted = conn.total_changes - before
+                conn.executemany(UPSERT_LATEST_SQL, rows)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return inserted
+    
+    def _query(self, sql: str, params: Iterable[Any]):
+        with self._lock:
+            rows = self._connect().execute(sql, list(params)).fetchall()
+        return _to_array(rows)
+    
+    def latest(self, kind: str, symbols: Optional[List[str]] = None):
+        """심볼별 최신 스냅샷 (최신값 테이블 조회 - 이력 길이와 무관)"""
+        columns = ", ".join(COLUMNS)
+        if symbols is None:
+            return self._query(f"SELECT {columns} FROM latest WHERE kind = ? ORDER BY symbol", [kind])
+        placeholders = ", ".join("?" * len(symbols))
+        return self._query(f"SELECT {columns} FROM latest WHERE kind = ? AND symbol IN ({placeholders}) ORDER BY symbol",
+                           [kind, *symbols])
+    
+    def as_of(self, kind: str, symbols: List[str], ts: Any):
+        """각 심볼의 ts 시점(포함) 직전 스냅샷 - 심볼당 인덱스 탐색 1회"""
+        columns = ", ".join(COLUMNS)
+        epoch = _to_epoch(ts)
+        rows = []
+        with self._lock:
+            conn = self._connect()
+            for symbol in symbols:
+                row = conn.execute(
+                    f"SELECT {columns} FROM snapshots WHERE kind = ? AND symbol = ? AND ts <= ? ORDER BY ts DESC LIMIT 1",
+                    (kind, symbol, epoch)
+                ).fetchone()
+                if row:
+                    rows.append(row)
+        return _to_array(rows)
+    
+    def range(self, kind: str, symbol: str, start: Any, end: Any = None):
+        """심볼의 [start, end] 구간 스냅샷 (시간순)"""
+        columns = ", ".join(COLUMNS)
+        return self._query(
+            f"SELECT {columns} FROM snapshots WHERE kind = ? AND symbol = ? AND ts BETWEEN ? AND ? ORDER BY ts",
+            [kind, symbol, _to_epoch(start), _to_epoch(end)]
+        )
+    
+    def returns(self, kind: str, symbols: List[str], since: Any) -> Dict[str, float]:
+        """since 시점 대비 최신 가격 수익률(%) - 기간 수익률 계산용"""
+        base = {row["symbol"]: row["price"] for row in self.as_of(kind, symbols, since)}
+        result = {}
+        for row in self.latest(kind, symbols):
+            start = base.get(row["symbol"])
+            if start and not math.isnan(start) and not math.isnan(row["price"]):
+                result[row["symbol"]] = float((row["price"] / start - 1) * 100)
+        return result
+    
+    def put_daily_closes(self, rows: List[Dict[str, Any]]) -> Dict[str, int]:
+        """세션 종가 기록 (심볼+거래일 키) - 나중에 들어온 정정 종가는 덮어쓰고 revision 증가
+
+        rows: {"symbol", "trading_date"(YYYY-MM-DD), "close", "source", 선택: "prev_close", "change_rate", "volume"}
+        등락률이 없으면 전일 종가(prev_close 또는 저장된 직전 거래일 종가)로 계산
+        """
+        counts = {"inserted": 0, "corrected": 0, "unchanged": 0}
+        if not rows:
+            return counts
+        
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for row in rows:
+                    symbol, trading_date, close = row["symbol"], str(row["trading_date"]), float(row["close"])
+                    prev_close = row.get("prev_close")
+                    if prev_close is None:
+                        found = conn.execute(
+                            "SELECT close FROM daily_close WHERE symbol = ? AND trading_date < ? ORDER BY trading_date DESC LIMIT 1",
+                            (symbol, trading_date)
+                        ).fetchone()
+                        prev_close = found[0] if found else None
+                    change_rate = row.get("change_rate")
+                    if change_rate is None and prev_close:
+                        change_rate = (close / prev_close - 1) * 100
+                    
+                    existing = conn.execute(
+                        "SELECT close, prev_close, change_rate, volume, revision FROM daily_close WHERE symbol = ? AND trading_date = ?",
+                        (symbol, trading_date)
+                    ).fetchone()
+                    
+                    if existing is None:
+                        status, revision = "inserted", 0
+                    elif abs(existing[0] - close) > CLOSE_TOLERANCE * max(abs(existing[0]), 1.0):
+                        status, revision = "corrected", existing[4] + 1
+                        print(f"🛠️ {symbol} {trading_date} 종가 정정: {existing[0]:,.2f} → {close:,.2f} (rev {revision})")
+                    else:
+                        # 종가가 같으면 비어 있던 필드만 채움
+                        counts["unchanged"] += 1
+                        conn.execute(
+                            "UPDATE daily_close SET prev_close = COALESCE(prev_close, ?), change_rate = COALESCE(change_rate, ?), "
+                            "volume = COALESCE(volume, ?) WHERE symbol = ? AND trading_date = ?",
+                            (prev_close, change_rate, row.get("volume"), symbol, trading_date)
+                        )
+                        continue
+                    
+                    counts[status] += 1
+                    conn.execute(
+                        "INSERT OR REPLACE INTO daily_close (symbol, trading_date, close, prev_close, change_rate, volume, "
+                        "source, revision, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (symbol, trading_date, close, prev_close, change_rate, row.get("volume"), row["source"],
+                         revision, time.time())
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return counts
+    
+    def daily_closes(self, symbols: List[str], trading_date: Any) -> Dict[str, Dict[str, Any]]:
+        """거래일의 심볼별 세션 종가 (없는 심볼은 결과에서 빠짐, 네트워크 호출 없음)"""
+        if not symbols:
+            return {}
+        placeholders = ", ".join("?" * len(symbols))
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT symbol, trading_date, close, prev_close, change_rate, volume, source, revision "
+                f"FROM daily_close WHERE trading_date = ? AND symbol IN ({placeholders})",
+                [str(trading_date), *symbols]
+            ).fetchall()
+        keys = ("symbol", "trading_date", "close", "prev_close", "change_rate", "volume", "source", "revision")
+        return {row[0]: dict(zip(keys, row)) for row in rows}
+    
+    def invalidate_daily_close(self, symbol: str, trading_date: Any):
+        """세션 종가 삭제 (다음 조회 시 다시 채움)"""
+        with self._lock:
+            self._connect().execute("DELETE FROM daily_close WHERE symbol = ? AND trading_date = ?",
+                                    (symbol, str(trading_date)))
+    
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+# 네이버 세계지수 키 → 심볼
+NAVER_WORLD_SYMBOLS = {"sp500": "SPX", "nasdaq": "IXIC", "dow": "DJI"}
+
+def naver_rows(data: Dict[str, Any]) -> List[tuple]:
+    """네이버 수집 결과를 스냅샷 행으로 변환"""
+    ts = data.get("timestamp")
+    rows = []
+    for key in ("kospi", "kosdaq"):
+        item = data.get(key)
+        if item:
+            rows.append(_row(item.get("timestamp", ts), "naver", "index", key.upper(),
+                             price=item.get("price"), change=item.get("change"), change_rate=item.get("change_rate")))
+    for key, symbol in NAVER_WORLD_SYMBOLS.items():
+        item = (data.get("world") or {}).get(key)
+        if item:
+            rows.append(_row(item.get("timestamp", ts), "naver", "index", symbol,
+                             price=item.get("price"), change=item.get("change"), change_rate=item.get("change_rate")))
+    sectors = data.get("sectors") or {}
+    seen = set()
+    for item in sectors.get("top", []) + sectors.get("bottom", []):
+        if item.get("name") not in seen:
+            seen.add(item.get("name"))
+            rows.append(_row(ts, "naver", "sector", item["name"], name=item["name"], change_rate=item.get("change_rate")))
+    for item in data.get("movers") or []:
+        rows.append(_row(ts, "naver", "mover", item.get("code") or item.get("name"), name=item.get("name"),
+                         change_rate=item.get("change_rate")))
+    return rows
+
+def kis_rows(data: Dict[str, Any]) -> List[tuple]:
+    """KIS 국내 지수 조회 결과를 스냅샷 행으로 변환"""
+    rows = []
+    for key in ("kospi", "kosdaq"):
+        item = data.get(key)
+        if item and "error" not in item:
+            rows.append(_row(item.get("timestamp"), "kis", "index", key.upper(), price=item.get("price"),
+                             change=item.get("change"), change_rate=item.get("change_rate"), volume=item.get("volume")))
+    return rows
+
+def alpaca_rows(snapshots: Dict[str, Dict[str, Any]]) -> List[tuple]:
+    """Alpaca 스냅샷(심볼별 가격/전일 종가/거래량)을 스냅샷 행으로 변환"""
+    rows = []
+    for symbol, item in snapshots.items():
+        price = item.get("price")
+        prev_close = item.get("prev_close")
+        change = change_rate = None
+        if price and prev_close:
+            change = price - prev_close
+            change_rate = change / prev_close * 100
+        rows.append(_row(item.get("timestamp"), "alpaca", "quote", symbol, price=price,
+                         change=change, change_rate=change_rate, volume=item.get("volume")))
+    return rows
+
+def naver_daily_rows(world: Dict[str, Any], trading_date: Any) -> List[Dict[str, Any]]:
+    """네이버 세계지수(장 마감 후 수집)를 세션 종가 행으로 변환"""
+    rows = []
+    for key, symbol in NAVER_WORLD_SYMBOLS.items():
+        item = world.get(key)
+        if item and item.get("price"):
+            rows.append({"symbol": symbol, "trading_date": str(trading_date), "close": item["price"],
+                         "change_rate": item.get("change_rate"), "source": "naver"})
+    return rows
+
+def alpaca_daily_rows(snapshots: Dict[str, Dict[str, Any]], now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """Alpaca 스냅샷의 일봉을 세션 종가 행으로 변환 (전일 일봉은 항상, 당일 일봉은 장 마감 후만)"""
+    rows = []
+    for symbol, item in snapshots.items():
+        prev_date, prev_close = item.get("prev_session_date"), item.get("prev_daily_close")
+        if prev_date and prev_close:
+            rows.append({"symbol": symbol, "trading_date": prev_date, "close": prev_close, "source": "alpaca"})
+        
+        session_date, close = item.get("session_date"), item.get("daily_close")
+        if session_date and close and us_session_closed(date.fromisoformat(session_date), now):
+            rows.append({"symbol": symbol, "trading_date": session_date, "close": close, "prev_close": prev_close,
+                         "volume": item.get("volume"), "source": "alpaca"})
+    return rows
+
+def record_daily_closes(rows: List[Dict[str, Any]], source: str = ""):
+    """세션 종가 기록 (실패해도 수집 흐름은 계속)"""
+    try:
+        counts = timeseries.put_daily_closes(rows)
+        if counts["inserted"] or counts["corrected"]:
+            print(f"🗃️ {source} 세션 종가 신규 {counts['inserted']}건, 정정 {counts['corrected']}건")
+    except Exception as e:
+        print(f"⚠️ {source} 세션 종가 기록 실패: {e}")
+
+def record(rows: List[tuple], source: str = ""):
+    """스냅샷 기록 (실패해도 수집 흐름은 계속)"""
+    try:
+        inserted = timeseries.append(rows)
+        if inserted:
+            print(f"🗃️ {source} 스냅샷 {inserted}건 기록")
+    except Exception as e:
+        print(f"⚠️ {source} 스냅샷 기록 실패: {e}")
+
+# 전역 시계열 저장소 인스턴스 (첫 사용 시 연결)
+timeseries = TimeSeriesStore()
@@ -0,0 +1,227 @@
+"""
+거래일 계산 모듈
+KRX/NYSE 휴장일·단축/지연 개장 테이블을 로컬 데이터로 보관하고 시장별 세션표를 미리 계산
+(이전/다음 세션, KST 기준 개장·마감 시각, 단축 거래일을 네트워크 없이 O(1) 조회)
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, date, time, timedelta
+from typing import Dict, Optional, Tuple
+
+import pytz
+
+KST = pytz.timezone("Asia/Seoul")
+ET = pytz.timezone("America/New_York")
+
+US_CLOSE = time(16, 0)
+
+# 휴장일/특수 거래일 테이블 수록 연도 (범위 밖은 주말만 휴장으로 계산)
+FIRST_YEAR = 2024
+LAST_YEAR = 2027
+
+# KRX 휴장일 (설날·추석·대체공휴일·선거일·근로자의 날·연말 휴장일 포함)
+KRX_HOLIDAYS = {
+    # 2024
+    "2024-01-01", "2024-02-09", "2024-02-12", "2024-03-01", "2024-04-10", "2024-05-01",
+    "2024-05-06", "2024-05-15", "2024-06-06", "2024-08-15", "2024-09-16", "2024-09-17",
+    "2024-09-18", "2024-10-01", "2024-10-03", "2024-10-09", "2024-12-25", "2024-12-31",
+    # 2025
+    "2025-01-01", "2025-01-27", "2025-01-28", "2025-01-29", "2025-01-30", "2025-03-03",
+    "2025-05-01", "2025-05-05", "2025-05-06", "2025-06-03", "2025-06-06", "2025-08-15",
+    "2025-10-03", "2025-10-06", "2025-10-07", "2025-10-08", "2025-10-09", "2025-12-25",
+    "2025-12-31",
+    # 2026
+    "2026-01-01", "2026-02-16", "2026-02-17", "2026-02-18", "2026-03-02", "2026-05-01",
+    "2026-05-05", "2026-05-25", "2026-06-03", "2026-08-17", "2026-09-24", "2026-09-25",
+    "2026-10-05", "2026-10-09", "2026-12-25", "2026-12-31",
+    # 2027
+    "2027-01-01", "2027-02-08", "2027-02-09", "2027-03-01", "2027-05-05", "2027-05-13",
+    "2027-08-16", "2027-09-14", "2027-09-15", "2027-09-16", "2027-10-04", "2027-10-11",
+    "2027-12-27", "2027-12-31",
+}
+
+# KRX 개장/마감 시각 변경일 (연초 첫 거래일 10시 개장, 수능일 1시간 지연)
+KRX_SPECIAL_HOURS = {
+    "2024-01-02": (time(10, 0), time(15, 30)),
+    "2024-11-14": (time(10, 0), time(16, 30)),
+    "2025-01-02": (time(10, 0), time(15, 30)),
+    "2025-11-13": (time(10, 0), time(16, 30)),
+    "2026-01-02": (time(10, 0), time(15, 30)),
+    "2026-11-19": (time(10, 0), time(16, 30)),
+    "2027-01-04": (time(10, 0), time(15, 30)),
+}
+
+# NYSE 휴장일
+NYSE_HOLIDAYS = {
+    # 2024
+    "2024-01-01", "2024-01-15", "2024-02-19", "2024-03-29", "2024-05-27", "2024-06-19",
+    "2024-07-04", "2024-09-02", "2024-11-28", "2024-12-25",
+    # 2025 (1/9 카터 전 대통령 국가 애도일)
+    "2025-01-01", "2025-01-09", "2025-01-20", "2025-02-17", "2025-04-18", "2025-05-26",
+    "2025-06-19", "2025-07-04", "2025-09-01", "2025-11-27", "2025-12-25",
+    # 2026
+    "2026-01-01", "2026-01-19", "2026-02-16", "2026-04-03", "2026-05-25", "2026-06-19",
+    "2026-07-03", "2026-09-07", "2026-11-26", "2026-12-25",
+    # 2027
+    "2027-01-01", "2027-01-18", "2027-02-15", "2027-03-26", "2027-05-31", "2027-06-18",
+    "2027-07-05", "2027-09-06", "2027-11-25", "2027-12-24",
+}
+
+# NYSE 13:00 조기 마감일 (독립기념일 전날, 추수감사절 다음 날, 크리스마스 이브)
+NYSE_SPECIAL_HOURS = {
+    day: (time(9, 30), time(13, 0))
+    for day in ("2024-07-03", "2024-11-29", "2024-12-24", "2025-07-03", "2025-11-28",
+                "2025-12-24", "2026-11-27", "2026-12-24", "2027-11-26")
+}
+
+@dataclass(frozen=True)
+class Session:
+    """거래 세션 (open/close는 KST 기준 시각)"""
+    market: str
+    day: date
+    open: datetime
+    close: datetime
+    special: bool  # 단축/지연 개장 여부
+
+def _localize(now: Optional[datetime] = None) -> datetime:
+    """현재 시각 (naive 시각은 KST로 간주)"""
+    if now is None:
+        return datetime.now(KST)
+    if now.tzinfo is None:
+        return KST.localize(now)
+    return now
+
+class TradingCalendar:
+    """시장별 세션표 - 수록 연도의 모든 날짜에 대해 세션/직전·다음 세션을 미리 계산"""
+    
+    def __init__(self, market: str, tz, regular_hours: Tuple[time, time], holidays,
+                 special_hours: Dict[str, Tuple[time, time]], first_year: int = FIRST_YEAR, last_year: int = LAST_YEAR):
+        self.market = market
+        self.tz = tz
+        self.regular_hours = regular_hours
+        self.holidays = {date.fromisoformat(d) for d in holidays}
+        self.special_hours = {date.fromisoformat(d): hours for d, hours in special_hours.items()}
+        self.first_day = date(first_year, 1, 1)
+        self.last_day = date(last_year, 12, 31)
+        
+        # 거래일 집합, 날짜 → 직전/다음 세션일 (해당일 제외), 세션 시각은 처음 조회할 때 계산
+        self._session_days = set()
+        self._sessions: Dict[date, Session] = {}
+        self._prev: Dict[date, Optional[date]] = {}
+        self._next: Dict[date, Optional[date]] = {}
+        
+        days = [self.first_day + timedelta(days=i) for i in range((self.last_day - self.first_day).days + 1)]
+        previous = None
+        for day in days:
+            self._prev[day] = previous
+            if self._is_session_rule(day):
+                self._session_days.add(day)
+                previous = day
+        
+        following = None
+        for day in reversed(days):
+            self._next[day] = following
+            if day in self._session_days:
+                following = day
+    
+    def _is_session_rule(self, day: date) -> bool:
+        return day.weekday() < 5 and day not in self.holidays
+    
+    def _build_session(self, day: date) -> Session:
+        open_at, close_at = self.special_hours.get(day, self.regular_hours)
+        return Session(self.market, day,
+                       self.tz.localize(datetime.combine(day, open_at)).astimezone(KST),
+                       self.tz.localize(datetime.combine(day, close_at)).astimezone(KST),
+                       day in self.special_hours)
+    
+    def _covered(self, day: date) -> bool:
+        return self.first_day <= day <= self.last_day
+    
+    def is_session(self, day: date) -> bool:
+        """거래일 여부"""
+        if self._covered(day):
+            return day in self._session_days
+        return self._is_session_rule(day)
+    
+    def session(self, day: date) -> Optional[Session]:
+        """해당 날짜 세션 (휴장일이면 None)"""
+        if not self.is_session(day):
+            return None
+        if day not in self._sessions:
+            self._sessions[day] = self._build_session(day)
+        return self._sessions[day]
+    
+    def prev_session(self, day: date) -> date:
+        """해당 날짜 직전 거래일 (해당일 제외)"""
+        if self._covered(day) and self._prev[day] is not None:
+            return self._prev[day]
+        day -= timedelta(days=1)
+        while not self.is_session(day):
+            day -= timedelta(days=1)
+        return day
+    
+    def next_session(self, day: date) -> date:
+        """해당 날짜 다음 거래일 (해당일 제외)"""
+        if self._covered(day) and self._next[day] is not None:
+            return self._next[day]
+        day += timedelta(days=1)
+        while not self.is_session(day):
+            day += timedelta(days=1)
+        return day
+    
+    def local_date(self, now: Optional[datetime] = None) -> date:
+        """시장 현지 날짜"""
+        return _localize(now).astimezone(self.tz).date()
+    
+    def is_closed(self, day: date, now: Optional[datetime] = None) -> bool:
+        """해당 날짜 세션이 마감되었는지 (휴장일이면 False)"""
+        session = self.session(day)
+        return session is not None and _localize(now) >= session.close
+    
+    def is_open(self, now: Optional[datetime] = None) -> bool:
+        """현재 장중인지"""
+        session = self.session(self.local_date(now))
+        return session is not None and session.open <= _localize(now) < session.close
+    
+    def last_closed_session(self, now: Optional[datetime] = None) -> date:
+        """마감된 가장 최근 거래일"""
+        day = self.local_date(now)
+        return day if self.is_closed(day, now) else self.prev_session(day)
+    
+    def current_or_prev_session(self, now: Optional[datetime] = None) -> date:
+        """오늘이 거래일이면 오늘, 아니면 직전 거래일 (시장 현지 날짜 기준)"""
+        day = self.local_date(now)
+        return day if self.is_session(day) else self.prev_session(day)
+
+KRX = TradingCalendar("KRX", KST, (time(9, 0), time(15, 30)), KRX_HOLIDAYS, KRX_SPECIAL_HOURS)
+NYSE = TradingCalendar("NYSE", ET, (time(9, 30), US_CLOSE), NYSE_HOLIDAYS, NYSE_SPECIAL_HOURS)
+
+CALENDARS = {"KRX": KRX, "NYSE": NYSE}
+
+def get_calendar(market: str) -> TradingCalendar:
+    """시장 이름(KRX/NYSE)으로 세션표 조회"""
+    return CALENDARS[market.upper()]
+
+def et_date(timestamp: str) -> Optional[str]:
+    """RFC3339 타임스탬프(Alpaca 일봉 t)를 미국 동부 기준 날짜(YYYY-MM-DD)로 변환"""
+    if not timestamp:
+        return None
+    try:
+        parsed = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = pytz.utc.localize(parsed)
+    return parsed.astimezone(ET).date().isoformat()
+
+def is_us_session(day: date) -> bool:
+    """미국 정규장 개장일 여부"""
+    return NYSE.is_session(day)
+
+def us_session_closed(day: date, now: Optional[datetime] = None) -> bool:
+    """해당 날짜 미국 정규장이 마감되었는지 (조기 마감일 반영)"""
+    return NYSE.is_closed(day, now)
+
+def last_us_session(now: Optional[datetime] = None) -> date:
+    """마감된 가장 최근 미국 정규장 날짜 (KST 08:30/20:00/23:00 슬롯의 '전일 미국장')"""
+    return NYSE.last_closed_session(now)
@@ -4,13 +4,17 @@
 KOSPI, KOSDAQ, 미국 주요 지수 실시간 정보를 웹 스크래핑으로 수집
 """
 
-import requests
 from bs4 import BeautifulSoup
 import re
 from datetime import datetime
 import time
 import json
 
+from market_automation.net.fanout import fanout, FetchSpec
+from market_automation.net.httpcache import http_cache
+from market_automation.datasource.html_fast import FastDocument, available as fast_html_available
+from market_automation.storage.timeseries import record, naver_rows
+
 class NaverFinanceScraper:
     def __init__(self):
         self.base_url = "https://finance.naver.com/sise/"
@@ -25,52 +29,90 @@ class NaverFinanceScraper:
             print("🔍 네이버 금융에서 시장 데이터 수집 중...")
             print("=" * 60)
             
-            # 메인 페이지 요청
-            response = requests.get(self.base_url, headers=self.headers)
-            response.raise_for_status()
-            
-            # 한글 인코딩 처리
-            response.encoding = 'euc-kr'
-            
-            # BeautifulSoup으로 파싱
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # 메인/세계지수/섹터/특징주 페이지를 동시에 수집
+            results = fanout.gather([
+                FetchSpec("main", self._get_main_market_data, host=self.base_url),
+                FetchSpec("world", self.get_world_market_data, host=self.world_url),
+                FetchSpec("sectors", self.get_sector_data, host=self.base_url),
+                FetchSpec("movers", self.get_movers_data)
+            ])
             
-            # 지수 정보 추출
-            market_data = self._extract_market_data(soup)
+            market_data = results["main"]
+            if 'error' in market_data:
+                raise RuntimeError(market_data['error'])
             
-            # 세계지수 데이터 수집
-            print("\n🌍 세계지수 데이터 수집 중...")
-            world_data = self.get_world_market_data()
+            # 세계지수 데이터
+            world_data = results["world"]
             if world_data and 'error' not in world_data:
                 market_data['world'] = world_data
                 print("✅ 세계지수 데이터 수집 완료")
             else:
                 print("⚠️ 세계지수 데이터 수집 실패")
             
-            # 섹터 데이터 수집
-            print("\n🏭 섹터 데이터 수집 중...")
-            sector_data = self.get_sector_data()
-            if sector_data:
+            # 섹터 데이터
+            sector_data = results["sectors"]
+            if sector_data and 'error' not in sector_data:
                 market_data['sectors'] = sector_data
                 print("✅ 섹터 데이터 수집 완료")
             else:
                 print("⚠️ 섹터 데이터 수집 실패")
             
-            # 특징주 데이터 수집
-            print("\n🚀 특징주 데이터 수집 중...")
-            movers_data = self.get_movers_data()
-            if movers_data:
+            # 특징주 데이터
+            movers_data = results["movers"]
+            if movers_data and 'error' not in movers_data:
                 market_data['movers'] = movers_data
                 print("✅ 특징주 데이터 수집 완료")
             else:
                 print("⚠️ 특징주 데이터 수집 실패")
             
+            # 지수/섹터/특징주 스냅샷 이력 기록
+            record(naver_rows(market_data), "네이버")
+            
+            stats = http_cache.stats()
+            print(f"🗄️ HTTP 캐시: 적중 {stats['hits']} (304 {stats['revalidated']}) / 미스 {stats['miss']}, "
+                  f"절약 {stats['bytes_saved']:,}B, 파싱 생략 {stats['parse_skipped']}")
+            
             return market_data
             
         except Exception as e:
             print(f"❌ 데이터 수집 실패: {e}")
             return {"error": str(e)}
     
+    def _get_main_market_data(self):
+        """메인 시세 페이지에서 KOSPI/KOSDAQ 데이터 수집"""
+        return self._fetch_and_extract(self.base_url, "main")
+    
+    def _fetch_and_extract(self, url, page_type):
+        """페이지 요청(조건부 캐시) 후 추출 - 본문이 지난번과 같으면 파싱 생략"""
+        page = http_cache.fetch(url, page_type, headers=self.headers)
+        
+        # 한글 인코딩 처리 후 추출
+        return http_cache.parse(page, lambda p: self._extract(page_type, p.text('euc-kr')))
+    
+    def _extractors(self, page_type):
+        """페이지 종류별 (BeautifulSoup 추출기, lxml 빠른 추출기)"""
+        return {
+            "main": (self._extract_market_data, self._fast_extract_market_data),
+            "world": (self._extract_world_market_data, self._fast_extract_world_market_data),
+            "sectors": (self._extract_sector_data, self._fast_extract_sector_data),
+            "movers": (self._extract_movers_data, self._fast_extract_movers_data),
+        }[page_type]
+    
+    def _extract(self, page_type, html, fast=True):
+        """lxml로 필요한 요소만 빠르게 추출, 실패 시 BeautifulSoup 전체 파싱으로 폴백"""
+        extractor, fast_extractor = self._extractors(page_type)
+        
+        if fast and fast_html_available():
+            try:
+                result = fast_extractor(FastDocument(html))
+                if result:
+                    return result
+                print(f"⚠️ {page_type} 빠른 추출 실패, BeautifulSoup으로 재시도")
+            except Exception as e:
+                print(f"⚠️ {page_type} 빠른 추출 오류, BeautifulSoup으로 재시도: {e}")
+        
+        return extractor(BeautifulSoup(html, 'html.parser'))
+    
     def get_sector_data(self):
         """업종별 시세 데이터 수집"""
         try:
@@ -78,12 +120,7 @@ class NaverFinanceScraper:
             
             # 업종별 시세 페이지
             sector_url = "https://finance.naver.com/sise/sise_group.naver"
-            response = requests.get(sector_url, headers=self.headers)
-            response.raise_for_status()
-            response.encoding = 'euc-kr'
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            sector_data = self._extract_sector_data(soup)
+            sector_data = self._fetch_and_extract(sector_url, "sectors")
             
             if sector_data:
                 print("✅ 업종별 시세 데이터 수집 완료")
@@ -101,22 +138,19 @@ class NaverFinanceScraper:
         try:
             print("🚀 특징주 데이터 수집 중...")
             
-            # 여러 특징주 페이지에서 시도
-            movers_data = None
-            
-            # 1. 거래량 급증 페이지 시도
-            volume_url = "https://finance.naver.com/sise/sise_quant.naver"
-            movers_data = self._try_get_movers_from_url(volume_url, "거래량 급증")
-            
-            # 2. 급등주 페이지 시도
-            if not movers_data:
-                rise_url = "https://finance.naver.com/sise/sise_rise.naver"
-                movers_data = self._try_get_movers_from_url(rise_url, "급등주")
-            
-            # 3. 시가총액 상위 페이지 시도
-            if not movers_data:
-                market_url = "https://finance.naver.com/sise/sise_market_sum.naver"
-                movers_data = self._try_get_movers_from_url(market_url, "시가총액 상위")
+            # 우선순위: 1. 거래량 급증 2. 급등주 3. 시가총액 상위
+            # 첫 페이지가 헤지 지연(FANOUT_HEDGE_DELAY_MS) 안에 응답하지 않거나 실패할 때만 다음 페이지를 추가로 요청하고
+            # 가장 우선순위가 높은 성공 결과 사용
+            pages = [
+                ("거래량 급증", "https://finance.naver.com/sise/sise_quant.naver"),
+                ("급등주", "https://finance.naver.com/sise/sise_rise.naver"),
+                ("시가총액 상위", "https://finance.naver.com/sise/sise_market_sum.naver"),
+            ]
+            hedged = fanout.hedge(
+                [FetchSpec(name, self._try_get_movers_from_url, (url, name), host=url) for name, url in pages],
+                label="movers"
+            )
+            movers_data = hedged.get("result")
             
             if movers_data:
                 print("✅ 특징주 데이터 수집 완료")
@@ -133,12 +167,7 @@ class NaverFinanceScraper:
         """특정 URL에서 특징주 데이터 수집 시도"""
         try:
             print(f"   🔍 {page_name} 페이지 시도 중...")
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            response.encoding = 'euc-kr'
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            movers_data = self._extract_movers_data(soup)
+            movers_data = self._fetch_and_extract(url, "movers")
             
             if movers_data:
                 print(f"   ✅ {page_name} 페이지에서 데이터 수집 성공")
@@ -153,17 +182,27 @@ class NaverFinanceScraper:
     
     def _extract_market_data(self, soup):
         """HTML에서 시장 데이터 추출"""
+        return self._build_market_data(self._extract_kospi_data(soup), self._extract_kosdaq_data(soup))
+    
+    def _fast_extract_market_data(self, doc):
+        """lxml 문서에서 시장 데이터 추출 (KOSPI/KOSDAQ 모두 찾은 경우만)"""
+        kospi_data = self._fast_extract_kospi_data(doc)
+        kosdaq_data = self._fast_extract_kosdaq_data(doc)
+        if not (kospi_data and kosdaq_data):
+            return None
+        return self._build_market_data(kospi_data, kosdaq_data)
+    
+    def _build_market_data(self, kospi_data, kosdaq_data):
+        """추출한 지수 데이터로 시장 데이터 구성"""
         try:
             market_data = {}
             
-            # KOSPI 정보 추출
-            kospi_data = self._extract_kospi_data(soup)
+            # KOSPI 정보
             if kospi_data:
                 market_data['kospi'] = kospi_data
                 print(f"📊 KOSPI: {kospi_data['price']:,.2f} ({kospi_data['change']:+,.2f}, {kospi_data['change_rate']:+.2f}%)")
             
-            # KOSDAQ 정보 추출
-            kosdaq_data = self._extract_kosdaq_data(soup)
+            # KOSDAQ 정보
             if kosdaq_data:
                 market_data['kosdaq'] = kosdaq_data
                 print(f"📈 KOSDAQ: {kosdaq_data['price']:,.2f} ({kosdaq_data['change']:+,.2f}, {kosdaq_data['change_rate']:+.2f}%)")
@@ -183,18 +222,8 @@ class NaverFinanceScraper:
     def get_world_market_data(self):
         """네이버 금융 세계지수 페이지에서 미국 주요 지수 데이터 수집"""
         try:
-            # 세계지수 페이지 요청
-            response = requests.get(self.world_url, headers=self.headers)
-            response.raise_for_status()
-            
-            # 한글 인코딩 처리
-            response.encoding = 'euc-kr'
-            
-            # BeautifulSoup으로 파싱
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 미국 주요 지수 데이터 추출
-            world_data = self._extract_world_market_data(soup)
+            # 세계지수 페이지 요청 후 미국 주요 지수 데이터 추출
+            world_data = self._fetch_and_extract(self.world_url, "world")
             
             return world_data
             
@@ -204,15 +233,19 @@ class NaverFinanceScraper:
     
     def _extract_world_market_data(self, soup):
         """HTML에서 세계지수 데이터 추출"""
+        return self._world_from_scripts(script.get_text() for script in soup.find_all('script'))
+    
+    def _fast_extract_world_market_data(self, doc):
+        """lxml 문서에서 세계지수 데이터 추출"""
+        return self._world_from_scripts(doc.script_texts())
+    
+    def _world_from_scripts(self, script_texts):
+        """script 본문의 americaData 변수에서 미국 주요 지수 추출"""
         try:
             world_data = {}
             
             # JavaScript 변수에서 데이터 파싱
-            script_tags = soup.find_all('script')
-            
-            for script in script_tags:
-                script_text = script.get_text()
-                
+            for script_text in script_texts:
                 # americaData 변수 찾기
                 if 'americaData' in script_text:
                     print("🔍 americaData 변수 발견, 데이터 파싱 중...")
@@ -277,7 +310,15 @@ class NaverFinanceScraper:
             return {"error": str(e)}
     
     def _extract_kospi_data(self, soup):
-        """KOSPI 데이터 추출 - HTML 요소 ID/클래스 기반"""
+        """KOSPI 데이터 추출 - ID/클래스 기반 우선, 실패 시 폴백 방식"""
+        hedged = fanout.hedge([
+            FetchSpec("ID/클래스", self._extract_kospi_data_by_id, (soup,)),
+            FetchSpec("폴백", self._extract_kospi_data_fallback, (soup,))
+        ], label="kospi", sequential=True)
+        return hedged.get("result")
+    
+    def _extract_kospi_data_by_id(self, soup):
+        """KOSPI 데이터 추출 - HTML 요소 ID/클래스 기반 (ID가 없으면 None)"""
         try:
             # KOSPI 가격을 ID로 직접 찾기
             kospi_price_elem = soup.find('span', id='KOSPI_now')
@@ -469,8 +510,8 @@ class NaverFinanceScraper:
                     'timestamp': datetime.now().isoformat()
                 }
             
-            # ID로 찾지 못한 경우 기존 방식 시도
-            return self._extract_kospi_data_fallback(soup)
+            # ID로 찾지 못한 경우 폴백 방식으로 넘김
+            return None
             
         except Exception as e:
             print(f"❌ KOSPI 데이터 추출 실패: {e}")
@@ -505,7 +546,15 @@ class NaverFinanceScraper:
             return None
     
     def _extract_kosdaq_data(self, soup):
-        """KOSDAQ 데이터 추출 - HTML 요소 ID/클래스 기반"""
+        """KOSDAQ 데이터 추출 - ID/클래스 기반 우선, 실패 시 폴백 방식"""
+        hedged = fanout.hedge([
+            FetchSpec("ID/클래스", self._extract_kosdaq_data_by_id, (soup,)),
+            FetchSpec("폴백", self._extract_kosdaq_data_fallback, (soup,))
+        ], label="kosdaq", sequential=True)
+        return hedged.get("result")
+    
+    def _extract_kosdaq_data_by_id(self, soup):
+        """KOSDAQ 데이터 추출 - HTML 요소 ID/클래스 기반 (ID가 없으면 None)"""
         try:
             # KOSDAQ 가격을 ID로 직접 찾기
             kosdaq_price_elem = soup.find('span', id='KOSDAQ_now')
@@ -612,8 +661,8 @@ class NaverFinanceScraper:
                     'timestamp': datetime.now().isoformat()
                 }
             
-            # ID로 찾지 못한 경우 기존 방식 시도
-            return self._extract_kosdaq_data_fallback(soup)
+            # ID로 찾지 못한 경우 폴백 방식으로 넘김
+            return None
             
         except Exception as e:
             print(f"❌ KOSDAQ 데이터 추출 실패: {e}")
@@ -647,26 +696,98 @@ class NaverFinanceScraper:
             print(f"❌ KOSDAQ 폴백 추출 실패: {e}")
             return None
     
+    def _fast_extract_kospi_data(self, doc):
+        """KOSPI 데이터 추출 - lxml로 #KOSPI_now와 div.type_1만 조회 (못 찾으면 None)"""
+        price_text = doc.text_by_id('KOSPI_now')
+        kospi_section = doc.first_by_class('div', 'type_1')
+        if not price_text or kospi_section is None:
+            return None
+        
+        price = float(price_text.replace(',', ''))
+        change_match = re.search(r'([+-]\d+\.\d+)\s+([+-]\d+\.\d+)%', doc.text(kospi_section))
+        if not change_match:
+            return None
+        
+        change = float(change_match.group(1))
+        change_rate = float(change_match.group(2))
+        print(f"🎯 KOSPI 등락 정보 발견 (빠른 추출): {price:,.2f} {change:+,.2f}, {change_rate:+.2f}%")
+        
+        return {
+            'symbol': 'KOSPI',
+            'price': price,
+            'change': change,
+            'change_rate': change_rate,
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    def _fast_extract_kosdaq_data(self, doc):
+        """KOSDAQ 데이터 추출 - lxml로 #KOSDAQ_now와 div.type_2만 조회 (못 찾으면 None)"""
+        price_text = doc.text_by_id('KOSDAQ_now')
+        kosdaq_section = doc.first_by_class('div', 'type_2')
+        if not price_text or kosdaq_section is None:
+            return None
+        
+        price = float(price_text.replace(',', ''))
+        
+        # '코스닥' 요소의 부모에서 3번째 span이 등락 정보 ("0.68 +0.08%상승" 형식)
+        for elem in kosdaq_section.iter('span'):
+            if '코스닥' not in doc.text(elem).strip():
+                continue
+            parent = elem.getparent()
+            siblings = list(parent.iter('span')) if parent is not None else []
+            if len(siblings) < 3:
+                continue
+            
+            change_match = re.search(r'([+-]?\d+\.\d+)\s+([+-]\d+\.\d+)%', doc.text(siblings[2]).strip())
+            if change_match:
+                change_rate = float(change_match.group(2))
+                change = self._signed_change(change_match.group(1), change_rate)
+                print(f"🎯 KOSDAQ 등락 정보 발견 (빠른 추출): {price:,.2f} {change:+,.2f}, {change_rate:+.2f}%")
+                
+                return {
+                    'symbol': 'KOSDAQ',
+                    'price': price,
+                    'change': change,
+                    'change_rate': change_rate,
+                    'timestamp': datetime.now().isoformat()
+                }
+        
+        return None
+    
+    @staticmethod
+    def _signed_change(change_str, change_rate):
+        """등락 값의 부호를 등락률과 일치시키기"""
+        change_str = change_str.lstrip('+-')
+        return -float(change_str) if change_rate < 0 else float(change_str)
+    
     def _extract_sector_data(self, soup):
         """HTML에서 업종별 시세 데이터 추출"""
+        sector_table = soup.find('table', class_='type_1')
+        if not sector_table:
+            print("⚠️ 업종별 시세 테이블을 찾을 수 없음")
+            return None
+        
+        # 헤더 제외 상위 10개 업종
+        rows = [[td.get_text(strip=True) for td in tr.find_all('td')] for tr in sector_table.find_all('tr')[1:11]]
+        return self._sectors_from_rows(rows)
+    
+    def _fast_extract_sector_data(self, doc):
+        """lxml 문서에서 업종별 시세 데이터 추출"""
+        rows = doc.table_rows('type_1')
+        if rows is None:
+            return None
+        return self._sectors_from_rows(rows[1:11])
+    
+    def _sectors_from_rows(self, rows):
+        """업종 행(td 텍스트 목록)에서 상위/하위 업종 분류"""
         try:
             sectors = {"top": [], "bottom": []}
             
-            # 업종별 시세 테이블 찾기
-            sector_table = soup.find('table', class_='type_1')
-            if not sector_table:
-                print("⚠️ 업종별 시세 테이블을 찾을 수 없음")
-                return None
-            
-            # 업종 행들 찾기
-            sector_rows = sector_table.find_all('tr')[1:]  # 헤더 제외
-            
             sector_list = []
-            for row in sector_rows[:10]:  # 상위 10개 업종
-                cells = row.find_all('td')
+            for cells in rows:
                 if len(cells) >= 4:
-                    sector_name = cells[0].get_text(strip=True)
-                    change_rate = cells[3].get_text(strip=True)
+                    sector_name = cells[0]
+                    change_rate = cells[3]
                     
                     # 등락률 파싱
                     try:
@@ -696,24 +817,32 @@ class NaverFinanceScraper:
     
     def _extract_movers_data(self, soup):
         """HTML에서 특징주 데이터 추출"""
+        movers_table = soup.find('table', class_='type_1')
+        if not movers_table:
+            print("⚠️ 거래량 급증 테이블을 찾을 수 없음")
+            return None
+        
+        # 헤더 제외 상위 5개 종목
+        rows = [[td.get_text(strip=True) for td in tr.find_all('td')] for tr in movers_table.find_all('tr')[1:6]]
+        return self._movers_from_rows(rows)
+    
+    def _fast_extract_movers_data(self, doc):
+        """lxml 문서에서 특징주 데이터 추출"""
+        rows = doc.table_rows('type_1')
+        if rows is None:
+            return None
+        return self._movers_from_rows(rows[1:6])
+    
+    def _movers_from_rows(self, rows):
+        """특징주 행(td 텍스트 목록)에서 종목 정보 추출"""
         try:
             movers = []
             
-            # 거래량 급증 테이블 찾기
-            movers_table = soup.find('table', class_='type_1')
-            if not movers_table:
-                print("⚠️ 거래량 급증 테이블을 찾을 수 없음")
-                return None
-            
-            # 특징주 행들 찾기
-            mover_rows = movers_table.find_all('tr')[1:]  # 헤더 제외
-            
-            for row in mover_rows[:5]:  # 상위 5개 종목
-                cells = row.find_all('td')
+            for cells in rows:
                 if len(cells) >= 4:
-                    stock_name = cells[0].get_text(strip=True)
-                    stock_code = cells[1].get_text(strip=True)
-                    change_rate = cells[3].get_text(strip=True)
+                    stock_name = cells[0]
+                    stock_code = cells[1]
+                    change_rate = cells[3]
                     
                     # 등락률 파싱
                     try:
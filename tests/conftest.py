@@ -0,0 +1,45 @@
+"""
+pytest 공통 설정
+프로젝트 루트를 Python 경로에 추가 (설치 없이 `pytest` 실행), 런타임 캐시/토큰 상태를 임시 디렉토리로 격리
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# .env에서 캐시/상태 파일 위치를 바꾸는 설정 - 비워서 임시 HOME 아래 기본 경로를 쓰게 함
+STATE_PATH_KEYS = ("KIS_TOKEN_CACHE", "RATE_LIMIT_STATE", "BREAKER_STATE", "LLM_CACHE_DIR", "HTTP_CACHE_DIR",
+                   "TIMESERIES_DB", "DAEMON_STATE_FILE", "KIS_STREAM_RECORD", "ALPACA_STREAM_RECORD")
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_home(tmp_path_factory):
+    """HOME을 임시 디렉토리로 - 테스트가 실제 ~/.cache/market_automation(토큰, 호출 장부, mst 테이블, LLM 통계)을 건드리지 않도록
+
+    전역 싱글턴은 캐시 경로를 첫 사용 때 정해서 유지하므로 세션 전체가 같은 임시 HOME을 씀 (자식 프로세스도 상속)
+    """
+    from market_automation.config import config
+    
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("HOME", str(tmp_path_factory.mktemp("home")))
+        for key in STATE_PATH_KEYS:
+            mp.setitem(config.env, key, "")
+        mp.setitem(config.env, "HTTP_CASSETTE", "off")
+        yield
+
+@pytest.fixture
+def breakers(tmp_path, monkeypatch):
+    """임시 상태 파일을 쓰는 서킷 브레이커 레지스트리 (공용 ~/.cache 상태를 건드리지 않도록)"""
+    from market_automation.net import resilience
+    registry = resilience.BreakerRegistry(state_path=str(tmp_path / "breakers.json"))
+    monkeypatch.setattr(resilience, "breakers", registry)
+    return registry
+
+@pytest.fixture
+def no_rate_limit(monkeypatch):
+    """호출 제한 대기/공유 상태 기록 끔"""
+    from market_automation.net.ratelimit import limiter
+    monkeypatch.setattr(limiter, "enabled", False)
@@ -0,0 +1,91 @@
+"""
+Alpaca 일괄 스냅샷 테스트 - 심볼 N개가 ceil(N/200)회 요청으로 조회되는지, 실패한 청크만 빠지는지
+(세션에 대역 어댑터를 마운트해서 네트워크 없이 실행)
+"""
+
+import json
+import math
+import threading
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from market_automation.datasource import alpaca
+from market_automation.datasource.alpaca import AlpacaClient
+from market_automation.net.session import SessionRegistry
+
+class FakeSnapshotServer(HTTPAdapter):
+    """/v2/stocks/snapshots 대역 - 요청 수를 세고, failing 심볼이 든 청크는 HTTP 403"""
+    
+    def __init__(self, failing=()):
+        super().__init__()
+        self.failing = set(failing)
+        self.requests = []
+        self._lock = threading.Lock()
+    
+    def send(self, request, **kwargs):
+        symbols = parse_qs(urlparse(request.url).query)["symbols"][0].split(",")
+        with self._lock:
+            self.requests.append(symbols)
+        
+        response = requests.Response()
+        response.url, response.request = request.url, request
+        if self.failing & set(symbols):
+            response.status_code = 403
+            response._content = b'{"message": "forbidden"}'
+            return response
+        
+        response.status_code = 200
+        response._content = json.dumps({
+            symbol: {
+                "latestTrade": {"p": 100.0 + i, "s": 10, "t": "2026-10-16T19:59:59Z"},
+                "dailyBar": {"o": 99.0, "c": 100.0 + i, "v": 1000, "t": "2026-10-16T04:00:00Z"},
+                "prevDailyBar": {"c": 98.0, "v": 900, "t": "2026-10-15T04:00:00Z"}
+            } for i, symbol in enumerate(symbols)
+        }).encode("utf-8")
+        return response
+
+@pytest.fixture
+def client(monkeypatch, breakers, no_rate_limit):
+    """공용 세션/스냅샷 기록을 테스트 전용으로 바꾼 클라이언트"""
+    monkeypatch.setattr(alpaca, "sessions", SessionRegistry())
+    monkeypatch.setattr(alpaca, "record", lambda rows, source="": None)
+    monkeypatch.setattr(alpaca, "record_daily_closes", lambda rows, source="": None)
+    return AlpacaClient()
+
+def mount(client: AlpacaClient, server: FakeSnapshotServer):
+    alpaca.sessions.get(client.data_url).mount(client.data_url, server)
+
+def universe(n: int):
+    return [f"S{i:04d}" for i in range(n)]
+
+@pytest.mark.parametrize("n", [1, 200, 201, 450, 1000])
+def test_round_trips_per_chunk(client, n):
+    server = FakeSnapshotServer()
+    mount(client, server)
+    
+    snapshots = client.get_snapshots(universe(n) + ["S0000"])  # 중복 심볼은 한 번만 조회
+    
+    assert len(server.requests) == math.ceil(n / AlpacaClient.SNAPSHOT_CHUNK_SIZE)
+    assert all(len(chunk) <= AlpacaClient.SNAPSHOT_CHUNK_SIZE for chunk in server.requests)
+    assert set(snapshots) == set(universe(n))
+    assert snapshots["S0000"]["prev_close"] == 98.0
+
+def test_failed_chunk_keeps_other_chunks(client):
+    server = FakeSnapshotServer(failing={"S0250"})
+    mount(client, server)
+    
+    snapshots = client.get_snapshots(universe(450))
+    
+    assert "error" not in snapshots
+    assert set(snapshots) == set(universe(200)) | set(universe(450)[400:])
+
+def test_all_chunks_failed_returns_error(client):
+    server = FakeSnapshotServer(failing={"S0000", "S0200"})
+    mount(client, server)
+    
+    result = client.get_snapshots(universe(300))
+    
+    assert "error" in result and "403" in result["error"]
@@ -0,0 +1,52 @@
+"""
+HTTP 카세트 테스트 - 재생 누락이 서킷 브레이커 상태를 건드리지 않는지
+"""
+
+import pytest
+
+from market_automation.net import resilience
+from market_automation.net.cassette import Cassette, CassetteAdapter, CassetteMiss, cassette
+from market_automation.net.session import TimeoutSession
+
+URL = "https://finance.example.test/sise/"
+
+@pytest.fixture
+def registry(breakers):
+    breakers.failure_threshold = 1
+    return breakers
+
+def replay_session(tmp_path) -> TimeoutSession:
+    """빈 카세트를 재생하는 세션"""
+    session = TimeoutSession((1, 1))
+    session.mount("https://", CassetteAdapter(Cassette(mode="replay", name="empty", directory=str(tmp_path), latency="0")))
+    return session
+
+def test_replay_miss_is_not_a_host_failure(tmp_path, registry):
+    session = replay_session(tmp_path)
+    for _ in range(3):
+        with pytest.raises(CassetteMiss):
+            session.get(URL)
+    
+    breaker = registry.get("finance.example.test")
+    assert breaker.state == "closed" and breaker.failures == 0
+    assert not (tmp_path / "breakers.json").exists()
+
+def test_replay_miss_is_not_retried(tmp_path, registry):
+    attempts = []
+    
+    def miss(timeout):
+        attempts.append(timeout)
+        raise CassetteMiss("카세트에 없는 요청")
+    
+    with pytest.raises(CassetteMiss):
+        resilience.send("GET", URL, miss, timeout=1)
+    assert len(attempts) == 1
+
+def test_replay_uses_separate_breaker_state(tmp_path, registry, monkeypatch):
+    live_path = registry.state_path
+    monkeypatch.setattr(cassette, "mode", "replay")
+    assert registry.state_path != live_path
+    
+    registry.record("finance.example.test", False, "HTTP 503")
+    assert registry.state_path.exists()
+    assert not live_path.exists()
@@ -0,0 +1,73 @@
+"""
+병렬 수집 테스트 - 특징주 헤지 요청이 바깥 gather와 같은 호스트 슬롯 안에서 직렬화되지 않는지, 헤지 지연 동작
+"""
+
+import threading
+import time
+
+from market_automation.net.fanout import FanoutExecutor, FetchSpec
+
+HOST = "https://finance.naver.com/sise/"
+
+class Tracker:
+    """호출 기록 + 동시 실행 수 측정"""
+    
+    def __init__(self):
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+    
+    def page(self, name: str, delay: float, ok: bool = True):
+        with self._lock:
+            self.calls.append(name)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(delay)
+        with self._lock:
+            self.active -= 1
+        return {"page": name} if ok else None
+
+def test_fast_primary_skips_backup_pages():
+    tracker = Tracker()
+    executor = FanoutExecutor()
+    result = executor.hedge([
+        FetchSpec(name, tracker.page, (name, 0.01), host=HOST) for name in ("quant", "rise", "market_sum")
+    ], hedge_delay=0.2)
+    
+    assert result["winner"] == "quant"
+    assert tracker.calls == ["quant"]
+
+def test_failed_primary_launches_backup_immediately():
+    tracker = Tracker()
+    executor = FanoutExecutor()
+    started = time.monotonic()
+    result = executor.hedge([
+        FetchSpec("quant", tracker.page, ("quant", 0.01, False), host=HOST),
+        FetchSpec("rise", tracker.page, ("rise", 0.01), host=HOST),
+    ], hedge_delay=5)
+    
+    assert result["winner"] == "rise"
+    assert time.monotonic() - started < 1
+
+def test_movers_hedge_not_serialized_by_outer_pages():
+    """바깥 gather의 네이버 페이지 3개가 슬롯을 잡고 있어도 헤지 후보 3개가 동시에 실행됨"""
+    tracker = Tracker()
+    executor = FanoutExecutor()
+    
+    def movers():
+        return executor.hedge([
+            FetchSpec(name, tracker.page, (name, 0.3), host=HOST) for name in ("quant", "rise", "market_sum")
+        ], hedge_delay=0)
+    
+    started = time.monotonic()
+    results = executor.gather([
+        FetchSpec("main", tracker.page, ("main", 0.5), host=HOST),
+        FetchSpec("world", tracker.page, ("world", 0.5), host=HOST),
+        FetchSpec("sectors", tracker.page, ("sectors", 0.5), host=HOST),
+        FetchSpec("movers", movers),
+    ])
+    
+    assert results["movers"]["winner"] == "quant"
+    assert tracker.peak == 6
+    assert time.monotonic() - started < 0.9
@@ -0,0 +1,32 @@
+"""
+import 예산 테스트 - 슬롯/CLI 진입점의 import 시간, 금지 모듈 (bench/importtime.py와 같은 측정), 지연 설정 로드
+IMPORT_BUDGET_MS 환경 변수로 느린 CI 러너의 예산 조정 가능
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from market_automation.bench.importtime import DEFAULT_BUDGET_MS, DEFAULT_MODULES, forbidden, measure, project_root
+
+BUDGET_MS = float(os.environ.get("IMPORT_BUDGET_MS", DEFAULT_BUDGET_MS))
+
+@pytest.mark.parametrize("module", DEFAULT_MODULES)
+def test_entry_point_import(module):
+    total_ms, heaviest, packages = measure(module)
+    
+    assert not forbidden(packages), f"{module}이(가) 무거운 모듈을 import 시점에 로드: {forbidden(packages)}"
+    assert total_ms <= BUDGET_MS, f"{module} import {total_ms:.1f}ms > 예산 {BUDGET_MS:.0f}ms (상위: {heaviest})"
+
+@pytest.mark.parametrize("module", DEFAULT_MODULES)
+def test_entry_point_import_leaves_config_unloaded(module):
+    """import만으로 .env를 읽지 않음 - 전역 싱글턴(세션, 병렬 실행기, 호출 제한기 등)은 첫 사용 때 설정을 읽어야 함"""
+    proc = subprocess.run(
+        [sys.executable, "-c", f"import {module}\nfrom market_automation.config import config\nprint(config._env is None)"],
+        cwd=str(project_root), capture_output=True, text=True
+    )
+    
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip().splitlines() == ["True"], f"{module} import 시 설정 로드: {proc.stdout.strip()}"
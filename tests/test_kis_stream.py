@@ -0,0 +1,93 @@
+"""
+KIS 실시간 프레임 해석 테스트 - H0STCNT0(주식)/H0UPCNT0(지수) 체결, 다건 프레임, PINGPONG
+"""
+
+import json
+
+import pytest
+
+from market_automation.datasource.kis_stream import INDEX_TR, STOCK_TR, KISStream, decode_frame
+
+def stock_record(code: str, price: str, sign: str, change: str, rate: str, volume: str, time: str = "093015"):
+    """H0STCNT0 체결 1건 (46필드)"""
+    record = [code, time, price, sign, change, rate] + ["0"] * 40
+    record[13] = volume
+    return record
+
+def index_record(code: str, price: str, sign: str, change: str, rate: str, volume: str, time: str = "093015"):
+    """H0UPCNT0 체결 1건 (30필드)"""
+    record = [code, time, price, sign, change, volume] + ["0"] * 24
+    record[9] = rate
+    return record
+
+def frame(tr_id: str, *records, encrypted: str = "0") -> str:
+    return f"{encrypted}|{tr_id}|{len(records):03d}|" + "^".join(field for record in records for field in record)
+
+def test_stock_tick():
+    ticks = decode_frame(frame(STOCK_TR, stock_record("005930", "71200", "2", "800", "1.14", "1234567")), received_at=1.0)
+    
+    assert ticks == [{"tr_id": STOCK_TR, "symbol": "005930", "time": "093015", "price": 71200.0, "change": 800.0,
+                      "change_rate": 1.14, "volume": 1234567, "received_at": 1.0}]
+
+def test_falling_sign_makes_change_negative():
+    tick, = decode_frame(frame(STOCK_TR, stock_record("000660", "120500", "5", "1500", "1.23", "10")))
+    
+    assert tick["change"] == -1500.0 and tick["change_rate"] == -1.23
+
+def test_index_tick_field_layout():
+    tick, = decode_frame(frame(INDEX_TR, index_record("0001", "2650.12", "5", "10.50", "0.39", "345678")))
+    
+    assert (tick["symbol"], tick["price"], tick["change"], tick["change_rate"], tick["volume"]) == \
+        ("0001", 2650.12, -10.5, -0.39, 345678)
+
+def test_multi_record_frame():
+    ticks = decode_frame(frame(
+        STOCK_TR,
+        stock_record("005930", "71200", "2", "800", "1.14", "100", "093015"),
+        stock_record("000660", "120500", "5", "1500", "1.23", "200", "093016"),
+        stock_record("005930", "71300", "2", "900", "1.28", "150", "093017"),
+    ))
+    
+    assert [(t["symbol"], t["time"], t["price"], t["volume"]) for t in ticks] == [
+        ("005930", "093015", 71200.0, 100),
+        ("000660", "093016", 120500.0, 200),
+        ("005930", "093017", 71300.0, 150),
+    ]
+
+@pytest.mark.parametrize("raw", [
+    frame(STOCK_TR, stock_record("005930", "71200", "2", "800", "1.14", "100"), encrypted="1"),
+    frame("H0STASP0", stock_record("005930", "71200", "2", "800", "1.14", "100")),
+])
+def test_encrypted_or_unknown_tr_is_skipped(raw):
+    assert decode_frame(raw) == []
+
+@pytest.fixture
+def stream():
+    return KISStream(url="ws://127.0.0.1:1", approval_key="test-approval-key")
+
+def test_pingpong_is_echoed(stream):
+    ping = json.dumps({"header": {"tr_id": "PINGPONG", "datetime": "20261016093000"}})
+    
+    assert stream.handle(ping) == ping
+    assert len(stream.table) == 0
+
+def test_data_frame_updates_latest_tick(stream):
+    assert stream.handle(frame(
+        STOCK_TR,
+        stock_record("005930", "71200", "2", "800", "1.14", "100", "093015"),
+        stock_record("005930", "71300", "2", "900", "1.28", "150", "093017"),
+    )) is None
+    stream.handle(frame(INDEX_TR, index_record("0001", "2650.12", "2", "10.50", "0.39", "345678")))
+    
+    assert stream.latest("005930", STOCK_TR)["price"] == 71300.0
+    assert stream.latest("0001", INDEX_TR)["price"] == 2650.12
+    assert stream.stats()["ticks"] == 3
+
+def test_subscribe_ack_and_malformed_frame(stream):
+    ack = json.dumps({"header": {"tr_id": STOCK_TR, "tr_key": "005930"},
+                      "body": {"rt_cd": "0", "msg1": "SUBSCRIBE SUCCESS"}})
+    
+    assert stream.handle(ack) is None
+    assert stream.handle("0|H0STCNT0|001|005930^093015^not-a-price^2^800^1.14") is None
+    assert stream.stats()["errors"] == 1
+    assert len(stream.table) == 0
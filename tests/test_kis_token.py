@@ -0,0 +1,118 @@
+"""
+KIS 토큰 공유 테스트 - 여러 KISClient 인스턴스/프로세스가 같은 캐시 디렉터리로 토큰을 한 번만 발급받는지
+(/oauth2/tokenP 대역 로컬 서버로 발급 횟수를 셈)
+"""
+
+import json
+import multiprocessing
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from market_automation.config import config
+from market_automation.datasource.kis import KISClient
+from market_automation.datasource.kis_token import KISTokenStore
+from market_automation.net.session import sessions
+
+class TokenServer(ThreadingHTTPServer):
+    """토큰 발급 대역 - 발급마다 새 토큰, 경합이 드러나도록 응답을 늦춤"""
+    daemon_threads = True
+    
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), TokenHandler)
+        self.issued = 0
+        self.lock = threading.Lock()
+    
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+class TokenHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path != "/oauth2/tokenP":
+            self.send_error(404)
+            return
+        with self.server.lock:
+            self.server.issued += 1
+            token = f"token-{self.server.issued}"
+        time.sleep(0.2)
+        body = json.dumps({"access_token": token, "token_type": "Bearer", "expires_in": 86400}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def server():
+    server = TokenServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def token_cache(tmp_path, monkeypatch, breakers, no_rate_limit):
+    """공유 토큰 캐시 파일 (모든 클라이언트/자식 프로세스가 같은 경로 사용)"""
+    path = tmp_path / "kis_token.json"
+    monkeypatch.setitem(config.env, "KIS_TOKEN_CACHE", str(path))
+    monkeypatch.setitem(config.env, "KIS_APP_KEY", "test-app-key")
+    monkeypatch.setitem(config.env, "KIS_APP_SECRET", "test-app-secret")
+    return path
+
+def make_client(url: str) -> KISClient:
+    """발급 요청을 대역 서버로 보내는 클라이언트"""
+    client = KISClient()
+    client.base_url = url
+    client.session = sessions.get(url)
+    return client
+
+def issue_in_child(url: str, results):
+    results.put(make_client(url)._get_access_token())
+
+def test_instances_share_one_issuance(server, token_cache):
+    tokens = []
+    threads = [threading.Thread(target=lambda: tokens.append(make_client(server.url)._get_access_token()))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert server.issued == 1
+    assert tokens == ["token-1"] * 4
+
+def test_processes_share_one_issuance(server, token_cache):
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    processes = [context.Process(target=issue_in_child, args=(server.url, results)) for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=30)
+    
+    assert [process.exitcode for process in processes] == [0] * 4
+    assert server.issued == 1
+    assert sorted(results.get(timeout=5) for _ in processes) == ["token-1"] * 4
+
+def test_expiring_token_is_refreshed_once(server, token_cache):
+    # 다른 프로세스가 남긴 토큰이 곧 만료 (재발급 여유 시간 안쪽)
+    store = KISTokenStore(path=str(token_cache))
+    client = make_client(server.url)
+    store.save(client.app_key, client.base_url, "stale-token", time.time() + store.refresh_margin - 1)
+    
+    assert client._get_access_token() == "token-1"
+    assert make_client(server.url)._get_access_token() == "token-1"
+    assert server.issued == 1
+    
+    # 메모리 토큰이 만료된 인스턴스는 다른 인스턴스가 갱신한 디스크 토큰을 다시 읽음 (재발급 없음)
+    client.token_expires = None
+    store.save(client.app_key, client.base_url, "refreshed-elsewhere", time.time() + 86400)
+    assert client._get_access_token() == "refreshed-elsewhere"
+    assert server.issued == 1
@@ -0,0 +1,181 @@
+"""
+요청 복원력 테스트 - half_open 서킷 브레이커의 시험 요청 기회가 새지 않는지,
+호출 한도 응답(429, KIS EGW00201)이 브레이커를 열지 않고 Retry-After/호출 제한기로 처리되는지
+"""
+
+import json
+import time
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from market_automation.config import config
+from market_automation.datasource import kis
+from market_automation.net.resilience import BreakerRegistry, DeadlineExceeded, deadline, send
+from market_automation.net.session import SessionRegistry
+
+URL = "https://example.test/data"
+
+def ok_response() -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    return response
+
+@pytest.fixture
+def registry(breakers):
+    """연속 1회 실패로 열리고 0.05초 냉각하는 브레이커"""
+    breakers.failure_threshold, breakers.cooldown = 1, 0.05
+    return breakers
+
+def open_breaker(registry: BreakerRegistry):
+    """브레이커를 열고 냉각 시간을 넘겨 다음 요청이 half_open 시험 요청이 되도록"""
+    registry.record("example.test", False, "HTTP 503")
+    assert registry.get("example.test").state == "open"
+    time.sleep(0.06)
+
+def test_deadline_expiry_keeps_half_open_trial(registry):
+    open_breaker(registry)
+    with deadline(0.05):
+        time.sleep(0.06)
+        with pytest.raises(DeadlineExceeded):
+            send("GET", URL, lambda timeout: ok_response(), timeout=5)
+    
+    # 마감 초과는 시험 요청 기회를 쓰지 않음 - 다음 요청이 시험 요청으로 나가서 브레이커를 닫음
+    assert send("GET", URL, lambda timeout: ok_response(), timeout=5).status_code == 200
+    assert registry.get("example.test").state == "closed"
+
+def test_deadline_raised_inside_attempt_releases_trial(registry):
+    open_breaker(registry)
+    
+    def expire(timeout):
+        raise DeadlineExceeded("상위 호출 마감 초과")
+    
+    with pytest.raises(DeadlineExceeded):
+        send("GET", URL, expire, timeout=5)
+    assert registry.get("example.test").state == "half_open"
+    assert send("GET", URL, lambda timeout: ok_response(), timeout=5).status_code == 200
+    assert registry.get("example.test").state == "closed"
+
+def test_unexpected_error_releases_trial(registry):
+    open_breaker(registry)
+    
+    def broken(timeout):
+        raise ValueError("응답 처리 오류")
+    
+    with pytest.raises(ValueError):
+        send("GET", URL, broken, timeout=5)
+    assert send("GET", URL, lambda timeout: ok_response(), timeout=5).status_code == 200
+    assert registry.get("example.test").state == "closed"
+
+def test_connection_error_reopens_half_open_breaker(registry):
+    open_breaker(registry)
+    
+    def refuse(timeout):
+        raise requests.ConnectionError("연결 거부")
+    
+    with pytest.raises(requests.ConnectionError):
+        send("POST", URL, refuse, timeout=5)
+    assert registry.get("example.test").state == "open"
+
+# KIS 초당 호출 한도 초과 응답 (HTTP 500)
+EGW00201 = json.dumps({"rt_cd": "1", "msg_cd": "EGW00201", "msg1": "초당 거래건수를 초과하였습니다."}, ensure_ascii=False).encode("utf-8")
+
+class ScriptedServer(HTTPAdapter):
+    """정해진 (상태 코드, 본문, 헤더) 순서로 응답하는 대역 (마지막 응답 반복), 요청 시각 기록"""
+    
+    def __init__(self, *responses):
+        super().__init__()
+        self.responses = list(responses)
+        self.sent = []
+    
+    def send(self, request, **kwargs):
+        status, body, headers = self.responses[min(len(self.sent), len(self.responses) - 1)]
+        self.sent.append(time.monotonic())
+        response = requests.Response()
+        response.url, response.request = request.url, request
+        response.status_code, response._content = status, body
+        response.headers.update(headers)
+        return response
+
+def mounted_session(server: ScriptedServer, throttled=None) -> requests.Session:
+    session = SessionRegistry().get(URL)
+    if throttled:
+        session.throttled = throttled
+    session.mount("https://", server)
+    return session
+
+def test_kis_throttle_leaves_breaker_closed(registry):
+    """EGW00201은 호스트 장애가 아님 - 연속으로 받아도 브레이커가 열리지 않고, 지터 백오프로 재전송하지 않음"""
+    server = ScriptedServer((500, EGW00201, {}))
+    session = mounted_session(server, kis.is_throttled)
+    
+    for _ in range(5):
+        assert session.get(URL).status_code == 500
+    
+    assert len(server.sent) == 5
+    assert registry.get("example.test").state == "closed"
+    assert registry.get("example.test").failures == 0
+
+def test_plain_server_error_still_opens_breaker(registry):
+    server = ScriptedServer((500, b'{"msg_cd": "EGW00123"}', {}))
+    session = mounted_session(server, kis.is_throttled)
+    
+    # 재시도 없는 POST 1회 (실패 1회로 열리는 브레이커)
+    assert session.post(URL).status_code == 500
+    assert registry.get("example.test").state == "open"
+
+def test_429_honors_retry_after(registry):
+    server = ScriptedServer((429, b"", {"Retry-After": "0.1"}), (200, b"{}", {}))
+    session = mounted_session(server)
+    
+    assert session.get(URL).status_code == 200
+    assert len(server.sent) == 2
+    assert server.sent[1] - server.sent[0] >= 0.1
+    assert registry.get("example.test").failures == 0
+
+def test_429_without_usable_retry_after_is_returned(registry):
+    """Retry-After가 없거나 재시도 상한보다 길면 바로 호출 측으로 (호출 제한기로 대기)"""
+    for headers in ({}, {"Retry-After": "3600"}):
+        server = ScriptedServer((429, b"", headers), (200, b"{}", {}))
+        session = mounted_session(server)
+        
+        assert session.get(URL).status_code == 429
+        assert len(server.sent) == 1
+    assert registry.get("example.test").state == "closed"
+
+class RecordingLimiter:
+    """호출 제한기 대역 - 대기 없이 호출만 기록"""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def acquire(self, provider, endpoint="", cost=1.0):
+        self.calls.append(("acquire", provider))
+        return 0.0
+    
+    def penalize(self, provider, endpoint="", seconds=1.0):
+        self.calls.append(("penalize", provider))
+
+def test_kis_throttle_recovers_through_limiter(registry, monkeypatch, tmp_path):
+    """연속 EGW00201 후에도 브레이커가 닫혀 있어서 호출 제한기 대기 후 재요청이 성공"""
+    registry.failure_threshold = 3
+    monkeypatch.setitem(config.env, "KIS_APP_KEY", "test-app-key")
+    monkeypatch.setitem(config.env, "KIS_APP_SECRET", "test-app-secret")
+    monkeypatch.setitem(config.env, "KIS_VTS", "REAL")
+    monkeypatch.setattr(kis, "sessions", SessionRegistry())
+    limiter = RecordingLimiter()
+    monkeypatch.setattr(kis, "limiter", limiter)
+    
+    client = kis.KISClient()
+    server = ScriptedServer(*[(500, EGW00201, {})] * 3, (200, b'{"rt_cd": "0", "output": {}}', {}))
+    client.session.mount("https://", server)
+    
+    # 같은 초에 겹친 요청 3건이 모두 한도에 걸림
+    for _ in range(2):
+        client._make_authenticated_request("GET", "/uapi/domestic-stock/v1/quotations/inquire-index-price", "token")
+    result = client._make_authenticated_request("GET", "/uapi/domestic-stock/v1/quotations/inquire-index-price", "token")
+    
+    assert result == {"rt_cd": "0", "output": {}}
+    assert ("penalize", "kis") in limiter.calls
+    assert registry.get("openapi.koreainvestment.com").state == "closed"
@@ -0,0 +1,50 @@
+"""
+슬롯 세션 게이트 테스트 - 자정을 넘긴 데몬 캐치업도 예정 실행일 기준으로 휴장일 확인
+"""
+
+from datetime import date, datetime
+
+from market_automation import scheduler
+from market_automation.config import config
+from market_automation.daemon import SlotDaemon
+from market_automation.scheduler import KST, SlotJob, get_jobs, run_day, session_gate
+
+FRIDAY = date(2026, 10, 16)
+SATURDAY = date(2026, 10, 17)
+
+def test_explicit_day_and_now(monkeypatch):
+    monkeypatch.setitem(config.env, "SLOT_SESSION_GATE", "true")
+    
+    assert session_gate("us_premkt", day=FRIDAY)
+    assert not session_gate("us_premkt", day=SATURDAY)
+    assert session_gate("us_premkt", now=KST.localize(datetime(2026, 10, 16, 23, 0)))
+    # 토요일 07:00 미국 마감은 금요일 세션
+    assert session_gate("us_close", day=SATURDAY)
+
+def test_run_day_overrides_wall_clock(monkeypatch):
+    monkeypatch.setitem(config.env, "SLOT_SESSION_GATE", "true")
+    
+    with run_day(FRIDAY):
+        assert session_gate("us_premkt")
+    with run_day(SATURDAY):
+        assert not session_gate("us_premkt")
+
+def test_daemon_catchup_after_midnight_gates_on_scheduled_day(monkeypatch, tmp_path):
+    """금요일 23:00 슬롯을 토요일 00:10에 캐치업해도 금요일 세션 기준으로 실행"""
+    monkeypatch.setitem(config.env, "SLOT_SESSION_GATE", "true")
+    ran = []
+    
+    def main():
+        ran.append(session_gate("us_premkt"))
+    
+    monkeypatch.setattr(SlotJob, "load", lambda self: main)
+    # 벽시계는 이미 토요일
+    saturday_night = KST.localize(datetime(2026, 10, 17, 0, 10))
+    monkeypatch.setattr(scheduler, "datetime", type("FrozenDatetime", (datetime,), {
+        "now": classmethod(lambda cls, tz=None: saturday_night),
+    }))
+    assert not session_gate("us_premkt")
+    
+    daemon = SlotDaemon(state_path=str(tmp_path / "daemon.json"))
+    assert daemon.run_job(get_jobs()["us_premkt"], FRIDAY) == "done"
+    assert ran == [True]
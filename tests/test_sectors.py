@@ -0,0 +1,35 @@
+"""
+섹터 상위/하위 분리 테스트 - 개수 기본값(sectors.yml rules)과 명시적 0
+"""
+
+import pytest
+
+from market_automation.analytics.sectors import split_top_bottom
+from market_automation.config import config
+
+SECTORS = [{"name": name, "ret1d": ret} for name, ret in
+           [("반도체", 2.1), ("2차전지", 1.4), ("은행", 0.3), ("조선", 0.8), ("건설", -0.5), ("화학", -1.2), ("철강", 0.0)]]
+
+@pytest.fixture(autouse=True)
+def rules(monkeypatch):
+    monkeypatch.setattr(config, "_sectors", {"rules": {"top_n": 3, "bottom_n": 2}})
+
+def names(rows):
+    return [row["name"] for row in rows]
+
+def test_defaults_from_rules():
+    result = split_top_bottom(SECTORS)
+    
+    assert names(result["top"]) == ["반도체", "2차전지", "조선"]
+    assert names(result["bottom"]) == ["화학", "건설"]
+
+def test_explicit_zero_returns_no_rows():
+    result = split_top_bottom(SECTORS, top_n=0, bottom_n=0)
+    
+    assert result == {"top": [], "bottom": []}
+
+def test_explicit_counts_override_rules():
+    result = split_top_bottom(SECTORS, top_n=1, bottom_n=3)
+    
+    assert names(result["top"]) == ["반도체"]
+    assert names(result["bottom"]) == ["화학", "건설", "철강"]
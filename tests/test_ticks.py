@@ -0,0 +1,71 @@
+"""
+분봉 링 버퍼 테스트 - 용량 초과 시 덮어쓰기, 오래된 순 정렬, 갱신 분봉, 종목 수 확장
+"""
+
+from datetime import date, datetime
+
+from market_automation.storage.ticks import TickStore
+from market_automation.trading_calendar import ET
+
+# 2026-10-15(목) 09:30 ET 정규장 시작
+OPEN = int(ET.localize(datetime(2026, 10, 15, 9, 30)).timestamp())
+
+def add_minutes(store: TickStore, symbol: str, minutes: range, volume: float = 10.0):
+    for i in minutes:
+        price = 100.0 + i
+        store.add_bar(symbol, OPEN + 60 * i, price, price + 0.5, price - 0.5, price, volume)
+
+def test_bars_before_wraparound_are_oldest_first():
+    store = TickStore(capacity=5)
+    add_minutes(store, "AAPL", range(3))
+    
+    assert list(store.bars("AAPL")["t"]) == [OPEN, OPEN + 60, OPEN + 120]
+
+def test_wraparound_keeps_latest_capacity_bars_in_order():
+    store = TickStore(capacity=5)
+    add_minutes(store, "AAPL", range(12))
+    
+    bars = store.bars("AAPL")
+    assert list(bars["t"]) == [OPEN + 60 * i for i in range(7, 12)]
+    assert list(bars["c"]) == [107.0, 108.0, 109.0, 110.0, 111.0]
+    # 덮어쓴 분봉도 당일 누적 거래량에는 남음
+    assert store.day_volume[store.index["AAPL"]] == 120.0
+
+def test_wraparound_exactly_at_capacity_boundary():
+    store = TickStore(capacity=4)
+    add_minutes(store, "AAPL", range(8))
+    
+    assert list(store.bars("AAPL")["t"]) == [OPEN + 60 * i for i in range(4, 8)]
+
+def test_updated_bar_overwrites_after_wraparound():
+    store = TickStore(capacity=3)
+    add_minutes(store, "AAPL", range(5))
+    # 마지막 분봉(4분) 갱신 - 새 칸을 쓰지 않고 거래량은 차이만 반영
+    store.add_bar("AAPL", OPEN + 240, 104.0, 105.0, 103.0, 104.8, 25.0)
+    
+    bars = store.bars("AAPL")
+    assert list(bars["t"]) == [OPEN + 120, OPEN + 180, OPEN + 240]
+    assert bars["c"][-1] == 104.8 and bars["v"][-1] == 25.0
+    assert store.day_volume[store.index["AAPL"]] == 65.0
+
+def test_rows_grow_without_mixing_symbols():
+    store = TickStore(capacity=4, initial_symbols=2)
+    symbols = ["AAPL", "MSFT", "NVDA", "TSLA", "AMZN"]
+    for n, symbol in enumerate(symbols):
+        add_minutes(store, symbol, range(n + 3), volume=n + 1)
+    
+    assert store.symbols() == symbols
+    for n, symbol in enumerate(symbols):
+        bars = store.bars(symbol)
+        assert list(bars["t"]) == [OPEN + 60 * i for i in range(n + 3)][-4:]
+        assert set(bars["v"]) == {n + 1}
+
+def test_latest_uses_last_bar_and_seeded_prev_close():
+    store = TickStore(capacity=5)
+    store.seed("AAPL", prev_close=100.0, prev_day=date(2026, 10, 14).toordinal())
+    add_minutes(store, "AAPL", range(8))
+    
+    latest = store.latest("AAPL", max_age=120, now=OPEN + 60 * 8)
+    assert latest["price"] == 107.0 and latest["prev_close"] == 100.0
+    assert latest["volume"] == 80.0
+    assert store.latest("AAPL", max_age=30, now=OPEN + 60 * 20) is None